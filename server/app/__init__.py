@@ -1,6 +1,11 @@
 """Flask application factory and extensions initialization."""
 from __future__ import annotations
 
+import time
+
+_IMPORT_STARTED = time.perf_counter()
+
+import logging
 import os
 from flask import Flask
 from flask_cors import CORS
@@ -9,6 +14,8 @@ from flasgger import Swagger
 from .core.config import get_settings
 from .core.logging import configure_logging
 from .routes import register_blueprints
+from .services.analyzer_service import get_analyzer_registry
+from .services.db import storage_stats
 
 
 def create_app() -> Flask:
@@ -40,6 +47,15 @@ def create_app() -> Flask:
 
     @app.get("/health")
     def health():  # pragma: no cover
-        return {"status": "ok"}
+        return {
+            "status": "ok",
+            "startup_seconds": app.config["STARTUP_SECONDS"],
+            "analyzer_load_seconds": get_analyzer_registry().load_times(),
+            "storage": storage_stats(),
+        }
+
+    # Time from package import to a ready app; NLTK data is loaded lazily
+    app.config["STARTUP_SECONDS"] = round(time.perf_counter() - _IMPORT_STARTED, 4)
+    logging.getLogger(__name__).info("create_app ready in %.3fs", app.config["STARTUP_SECONDS"])
 
     return app
@@ -20,21 +20,83 @@ class Settings(BaseSettings):
     # News API
     api_key: str | None = Field(default=os.getenv("API_KEY"))
     url: str | None = Field(default=os.getenv("URL"))
+    fetch_max_workers: int = Field(default=int(os.getenv("FETCH_MAX_WORKERS", "8")))
+    fetch_page_size: int = Field(default=int(os.getenv("FETCH_PAGE_SIZE", "100")))
+    fetch_max_pages: int = Field(default=int(os.getenv("FETCH_MAX_PAGES", "5")))
+    fetch_timeout: float = Field(default=float(os.getenv("FETCH_TIMEOUT", "30")))
+    http_cache_enabled: bool = Field(default=os.getenv("HTTP_CACHE_ENABLED", "true").lower() == "true")
+    http_cache_dir: str = Field(default=os.getenv("HTTP_CACHE_DIR", "assets/http_cache"))
+    http_cache_ttl: float = Field(default=float(os.getenv("HTTP_CACHE_TTL", "600")))
+    http_cache_max_bytes: int = Field(default=int(os.getenv("HTTP_CACHE_MAX_BYTES", str(50 * 1024 * 1024))))
+
+    # Text normalization
+    normalize_workers: int = Field(default=int(os.getenv("NORMALIZE_WORKERS", "0")))
+    normalize_parallel_min_rows: int = Field(default=int(os.getenv("NORMALIZE_PARALLEL_MIN_ROWS", "2000")))
+    extract_chunk_size: int = Field(default=int(os.getenv("EXTRACT_CHUNK_SIZE", "200")))
+    normalize_chunk_size: int = Field(default=int(os.getenv("NORMALIZE_CHUNK_SIZE", "500")))
 
     # MongoDB
     mongo_username: str | None = Field(default=os.getenv("MONGO_USERNAME"))
     mongo_password: str | None = Field(default=os.getenv("MONGO_PASSWORD"))
     db_name: str | None = Field(default=os.getenv("DB_NAME"))
+    storage_backend: str = Field(default=os.getenv("STORAGE_BACKEND", "mongo"))
+    sqlite_db_path: str = Field(default=os.getenv("SQLITE_DB_PATH", "assets/news.sqlite3"))
+    mongo_uri: str | None = Field(default=os.getenv("MONGO_URI"))
+    mongo_max_pool_size: int = Field(default=int(os.getenv("MONGO_MAX_POOL_SIZE", "50")))
+    mongo_min_pool_size: int = Field(default=int(os.getenv("MONGO_MIN_POOL_SIZE", "0")))
+    mongo_max_idle_ms: int = Field(default=int(os.getenv("MONGO_MAX_IDLE_MS", "300000")))
+    mongo_server_selection_timeout_ms: int = Field(default=int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "10000")))
+    mongo_read_batch_size: int = Field(default=int(os.getenv("MONGO_READ_BATCH_SIZE", "1000")))
+    mongo_write_batch_size: int = Field(default=int(os.getenv("MONGO_WRITE_BATCH_SIZE", "1000")))
+    mongo_write_batch_bytes: int = Field(default=int(os.getenv("MONGO_WRITE_BATCH_BYTES", str(8 * 1024 * 1024))))
+    mongo_write_retries: int = Field(default=int(os.getenv("MONGO_WRITE_RETRIES", "3")))
+    mongo_retry_backoff: float = Field(default=float(os.getenv("MONGO_RETRY_BACKOFF", "0.5")))
+    fingerprint_memory_size: int = Field(default=int(os.getenv("FINGERPRINT_MEMORY_SIZE", "200000")))
 
     # Email
     email_user: str | None = Field(default=os.getenv("EMAIL_USER"))
     email_pass: str | None = Field(default=os.getenv("EMAIL_PASS"))
 
+    # NLTK data (resolved offline, never downloaded at runtime)
+    nltk_data_dir: str | None = Field(default=os.getenv("NLTK_DATA_DIR"))
+    prewarm_resources: bool = Field(default=os.getenv("PREWARM_RESOURCES", "false").lower() == "true")
+
     # Analyzer
     analyzer_model: str = Field(default=os.getenv("ANALYZER_MODEL", "vader"))
+    sentiment_cache_enabled: bool = Field(default=os.getenv("SENTIMENT_CACHE_ENABLED", "true").lower() == "true")
+    sentiment_cache_size: int = Field(default=int(os.getenv("SENTIMENT_CACHE_SIZE", "50000")))
+    sentiment_cache_path: str = Field(default=os.getenv("SENTIMENT_CACHE_PATH", "assets/sentiment_cache.sqlite3"))
+
+    # Background jobs
+    analyze_job_min_items: int = Field(default=int(os.getenv("ANALYZE_JOB_MIN_ITEMS", "1000")))
+    analyze_job_chunk_size: int = Field(default=int(os.getenv("ANALYZE_JOB_CHUNK_SIZE", "200")))
+    job_workers: int = Field(default=int(os.getenv("JOB_WORKERS", "2")))
+    job_result_ttl: float = Field(default=float(os.getenv("JOB_RESULT_TTL", "3600")))
+    job_shared_state: bool = Field(default=os.getenv("JOB_SHARED_STATE", "true").lower() == "true")
+
+    # Incremental DailyNews scoring (analyzer.py)
+    score_batch_size: int = Field(default=int(os.getenv("SCORE_BATCH_SIZE", "500")))
+    score_lookback_seconds: int = Field(default=int(os.getenv("SCORE_LOOKBACK_SECONDS", "300")))
+
+    # Near-duplicate detection
+    dedup_enabled: bool = Field(default=os.getenv("DEDUP_ENABLED", "true").lower() == "true")
+    dedup_threshold: float = Field(default=float(os.getenv("DEDUP_THRESHOLD", "0.8")))
+    dedup_num_perm: int = Field(default=int(os.getenv("DEDUP_NUM_PERM", "128")))
 
     # Cache/Artifacts
-    cache_csv_path: str = Field(default=os.getenv("CACHE_CSV_PATH", "assets/mean_polarity.csv"))
+    store_path: str = Field(default=os.getenv("STORE_PATH", "assets/store"))
+    articles_page_size: int = Field(default=int(os.getenv("ARTICLES_PAGE_SIZE", "100")))
+    articles_max_page_size: int = Field(default=int(os.getenv("ARTICLES_MAX_PAGE_SIZE", "1000")))
+    visualize_cache_enabled: bool = Field(default=os.getenv("VISUALIZE_CACHE_ENABLED", "true").lower() == "true")
+    visualize_cache_size: int = Field(default=int(os.getenv("VISUALIZE_CACHE_SIZE", "256")))
+    data_version_ttl: float = Field(default=float(os.getenv("DATA_VERSION_TTL", "1.0")))
+    visualize_max_points: int = Field(default=int(os.getenv("VISUALIZE_MAX_POINTS", "500")))
+    visualize_source: str = Field(default=os.getenv("VISUALIZE_SOURCE", "rollup"))
+    lemma_table_path: str = Field(default=os.getenv("LEMMA_TABLE_PATH", "assets/lemma_table.pickle"))
+    lemma_memo_size: int = Field(default=int(os.getenv("LEMMA_MEMO_SIZE", "65536")))
+    keyword_top_k: int = Field(default=int(os.getenv("KEYWORD_TOP_K", "20")))
+    keyword_sketch_capacity: int = Field(default=int(os.getenv("KEYWORD_SKETCH_CAPACITY", "2000")))
+    keyword_series_top_k: int = Field(default=int(os.getenv("KEYWORD_SERIES_TOP_K", "5")))
 
     # Defaults
     default_domains: str = Field(default=os.getenv("DEFAULT_DOMAINS", 
@@ -7,6 +7,8 @@ from .extract_routes import bp as extract_bp
 from .analyze_routes import bp as analyze_bp
 from .visualize_routes import bp as visualize_bp
 from .report_routes import bp as report_bp
+from .job_routes import bp as jobs_bp
+from .article_routes import bp as articles_bp
 
 
 def register_blueprints(app: Flask) -> None:
@@ -14,3 +16,5 @@ def register_blueprints(app: Flask) -> None:
     app.register_blueprint(analyze_bp)
     app.register_blueprint(visualize_bp)
     app.register_blueprint(report_bp)
+    app.register_blueprint(jobs_bp)
+    app.register_blueprint(articles_bp)
@@ -1,23 +1,208 @@
 from __future__ import annotations
 
 import logging
-from flask import Blueprint, request, jsonify
+from typing import Any, Dict, Iterator, List
+
+import pandas as pd
+from flask import Blueprint, request, jsonify, url_for
 from flasgger import swag_from
 
-from ..schemas.models import AnalyzeRequest
-from ..services.analyzer_service import get_analyzer
-from ..services.cache_service import append_mean_polarity_csv
-from ..services.db import insert_many
+from ..core.config import get_settings
+from ..schemas.models import AnalyzeRequest, Article
+from ..services.analyzer_service import VaderAnalyzer, get_analyzer, get_analyzer_registry
+from ..services.article_store import get_article_store
+from ..services.cache_service import append_mean_polarity
+from ..services.db import find_values
+from ..services.dedup_service import NearDuplicateIndex
+from ..services.fingerprint_service import get_fingerprint_index
+from ..services.job_service import get_job_manager
+from ..services.keyword_service import record_keywords, text_terms
+from ..services.payload_cache import bump_data_version
+from ..services.rollup_service import POLARITY_COLLECTION, write_polarity
+from ..services.text_normalizer import normalize_text
 
 bp = Blueprint("analyze", __name__, url_prefix="")
 logger = logging.getLogger(__name__)
 
 
+class _ArticleScorer:
+    """Scores one representative per near-duplicate cluster.
+
+    Duplicates reuse their representative's scores and carry a
+    `duplicate_of` index into the request's articles. The index is kept
+    across `score` calls, so chunked jobs link duplicates to
+    representatives from earlier chunks; a representative's `duplicates`
+    count then grows in the job results after it was persisted.
+    """
+
+    def __init__(self, analyzer: VaderAnalyzer) -> None:
+        settings = get_settings()
+        self.analyzer = analyzer
+        self.index = (
+            NearDuplicateIndex(threshold=settings.dedup_threshold, num_perm=settings.dedup_num_perm)
+            if settings.dedup_enabled else None
+        )
+        self.representatives: Dict[int, Dict[str, Any]] = {}
+        self.offset = 0
+
+    def score(self, texts: List[str]) -> List[Dict[str, Any]]:
+        offset = self.offset
+        self.offset += len(texts)
+        if self.index is None:
+            return self.analyzer.analyze_texts(texts)
+
+        links = [self.index.add(offset + i, normalize_text(t).split()) for i, t in enumerate(texts)]
+        unique = [i for i, rep in enumerate(links) if rep is None]
+        for i, res in zip(unique, self.analyzer.analyze_texts([texts[i] for i in unique])):
+            self.representatives[offset + i] = res
+
+        results: List[Dict[str, Any]] = []
+        for i, rep in enumerate(links):
+            if rep is None:
+                results.append(self.representatives[offset + i])
+                continue
+            representative = self.representatives[rep]
+            representative["duplicates"] = representative.get("duplicates", 0) + 1
+            duplicate = dict(representative, text=texts[i], word_count=len(texts[i].split()), duplicate_of=rep)
+            duplicate.pop("duplicates")
+            results.append(duplicate)
+        return results
+
+
+def _article_texts(articles: List[Article]) -> List[str]:
+    return [a.combined_text or (a.title or "") + " " + (a.content or "") for a in articles]
+
+
+def _unseen_records(articles: List[Article], records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Records of articles that were neither extracted nor analyzed before."""
+    fresh, _ = get_fingerprint_index().partition(
+        {"url": art.url, "title": art.title, "content": art.content, "record": record}
+        for art, record in zip(articles, records)
+    )
+    known = find_values(POLARITY_COLLECTION, "url", [r["url"] for r in records if r.get("url")])
+    return [f["record"] for f in fresh if f["record"].get("url") not in known]
+
+
+def _count_keywords(records: List[Dict[str, Any]]) -> None:
+    """Add analyzed articles to the shared keyword counts behind /visualize."""
+    record_keywords(
+        (text_terms(record.get("headline") or ""), record.get("pub_date"), record.get("source"))
+        for record in records
+    )
+
+
+def _persist_polarity(articles: List[Article], results: List[Dict[str, Any]]) -> None:
+    """Persist one PolarityData record per near-duplicate cluster.
+
+    Articles seen for the first time are also added to the keyword counts.
+    """
+    records_for_db = []
+    persisted: List[Article] = []
+    for art, res in zip(articles, results):
+        if res.get("duplicate_of") is not None:
+            continue
+        persisted.append(art)
+        scores = res.get("scores", {})
+        records_for_db.append({
+            "headline": res.get("text"),
+            "compound": scores.get("compound"),
+            "neg": scores.get("neg"),
+            "neu": scores.get("neu"),
+            "pos": scores.get("pos"),
+            "label": res.get("label"),
+            "title": art.title,
+            "author": art.author,
+            "source": art.source,
+            "description": art.description,
+            "pub_date": art.pub_date,
+            "url": art.url,
+            "duplicates": res.get("duplicates", 0),
+        })
+    try:
+        unseen = _unseen_records(persisted, records_for_db)
+    except Exception:
+        logger.exception("Failed to check for already indexed articles")
+        unseen = []
+    try:
+        written = write_polarity(records_for_db, key="url")
+        logger.debug("PolarityData write: %s", written.as_dict())
+    except Exception:
+        logger.exception("Failed to persist PolarityData")
+        unseen = []
+    try:
+        _count_keywords(unseen)
+    except Exception:
+        logger.exception("Failed to update the keyword index")
+    try:
+        get_article_store().write("polarity", pd.DataFrame(records_for_db))
+    except Exception:
+        logger.exception("Failed to write polarity history to the columnar store")
+    try:
+        # write_polarity bumped the version before the store had these rows;
+        # payloads cached from the store in between must not outlive this write
+        bump_data_version(POLARITY_COLLECTION)
+    except Exception:
+        logger.exception("Failed to bump the %s data version", POLARITY_COLLECTION)
+
+
+def _summarize(analyzer: VaderAnalyzer, results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Keywords for the results; also records their mean polarity."""
+    # Optional keywords
+    keywords = analyzer.extract_keywords([r["text"] for r in results])
+    # Cache mean polarity
+    try:
+        append_mean_polarity(results)
+    except Exception:  # cache errors should not break API
+        logger.exception("Failed to append mean polarity cache")
+    return {"count": len(results), "keywords": keywords}
+
+
+def _analyze_job(analyzer: VaderAnalyzer, req: AnalyzeRequest, chunk_size: int) -> Iterator[List[Dict[str, Any]]]:
+    """Job body: score and persist the request chunk by chunk."""
+    results: List[Dict[str, Any]] = []
+    if not req.texts:
+        scorer = _ArticleScorer(analyzer)
+        for start in range(0, len(req.articles), chunk_size):
+            chunk = req.articles[start:start + chunk_size]
+            chunk_results = scorer.score(_article_texts(chunk))
+            _persist_polarity(chunk, chunk_results)
+            results.extend(chunk_results)
+            yield chunk_results
+    else:
+        for start in range(0, len(req.texts), chunk_size):
+            chunk_results = analyzer.analyze_texts(req.texts[start:start + chunk_size])
+            results.extend(chunk_results)
+            yield chunk_results
+    return _summarize(analyzer, results)
+
+
+def _wants_job(req: AnalyzeRequest, size: int) -> bool:
+    if req.job is not None:
+        return req.job
+    flag = request.args.get("job")
+    if flag is not None:
+        return flag.lower() in ("1", "true", "yes")
+    return size >= get_settings().analyze_job_min_items
+
+
 @bp.post("/analyze")
 @swag_from({
     "tags": ["analyze"],
     "summary": "Analyze sentiment for raw text or articles",
-    "description": "Accepts raw text(s) or preprocessed articles and returns VADER-based sentiment with labels and optional keywords.",
+    "description": (
+        "Accepts raw text(s) or preprocessed articles and returns VADER-based sentiment with labels and optional keywords. "
+        "Requests with at least `ANALYZE_JOB_MIN_ITEMS` texts/articles (or `job=true`) run as a background job: "
+        "the response is `202` with a job id, and progress and partial results are served from `/jobs/<id>`."
+    ),
+    "parameters": [
+        {
+            "name": "job",
+            "in": "query",
+            "required": False,
+            "schema": {"type": "boolean"},
+            "description": "Force (true) or disable (false) background job mode"
+        }
+    ],
     "requestBody": {
         "required": True,
         "content": {
@@ -28,6 +213,7 @@ logger = logging.getLogger(__name__)
     },
     "responses": {
         200: {"description": "Sentiment results"},
+        202: {"description": "Job accepted; poll the returned status URL"},
         400: {"description": "Validation error"},
         500: {"description": "Server error"}
     }
@@ -37,50 +223,54 @@ def analyze_handler():
         """Analyze sentiment for provided input and return results.
 
         Supports `text`, `texts`, or `articles` in the request body.
-        Also appends mean polarity to CSV cache for daily tracking.
+        Also records mean polarity in the columnar store for daily tracking.
         """
         payload = request.get_json(force=True)
         req = AnalyzeRequest(**payload)
         analyzer = get_analyzer()
         if req.text:
             results = analyzer.analyze_texts([req.text])
-        elif req.texts:
-            results = analyzer.analyze_texts(req.texts)
-        elif req.articles:
-            texts = [a.combined_text or (a.title or "") + " " + (a.content or "") for a in req.articles]
-            results = analyzer.analyze_texts(texts)
-            # Persist to PolarityData with article metadata
-            records_for_db = []
-            for art, res in zip(req.articles, results):
-                scores = res.get("scores", {})
-                records_for_db.append({
-                    "headline": res.get("text"),
-                    "compound": scores.get("compound"),
-                    "neg": scores.get("neg"),
-                    "neu": scores.get("neu"),
-                    "pos": scores.get("pos"),
-                    "label": res.get("label"),
-                    "title": art.title,
-                    "author": art.author,
-                    "source": art.source,
-                    "description": art.description,
-                    "pub_date": art.pub_date,
-                })
-            try:
-                insert_many("PolarityData", records_for_db)
-            except Exception:
-                logger.exception("Failed to persist PolarityData")
+        elif req.texts or req.articles:
+            size = len(req.texts or req.articles)
+            if _wants_job(req, size):
+                chunk_size = get_settings().analyze_job_chunk_size
+                job = get_job_manager().submit("analyze", size, lambda: _analyze_job(analyzer, req, chunk_size))
+                status_url = url_for("jobs.job_handler", job_id=job.id)
+                return jsonify({"job_id": job.id, "status": job.status, "total": size, "status_url": status_url}), 202, {"Location": status_url}
+            if req.texts:
+                results = analyzer.analyze_texts(req.texts)
+            else:
+                results = _ArticleScorer(analyzer).score(_article_texts(req.articles))
+                _persist_polarity(req.articles, results)
         else:
             return jsonify({"error": "Provide one of: text, texts, or articles"}), 400
 
-        # Optional keywords
-        keywords = analyzer.extract_keywords([r["text"] for r in results])
-        # Cache mean polarity
-        try:
-            append_mean_polarity_csv(results)
-        except Exception:  # cache errors should not break API
-            logger.exception("Failed to append mean polarity cache")
-        return jsonify({"count": len(results), "items": results, "keywords": keywords}), 200
+        summary = _summarize(analyzer, results)
+        return jsonify({"count": summary["count"], "items": results, "keywords": summary["keywords"]}), 200
     except Exception as exc:  # noqa: BLE001
         logger.exception("/analyze failed")
         return jsonify({"error": str(exc)}), 500
+
+
+@bp.get("/analyze/stats")
+@swag_from({
+    "tags": ["analyze"],
+    "summary": "Sentiment cache statistics",
+    "description": "Returns the active analyzer model/version, its load time and the sentiment cache hit ratio.",
+    "responses": {
+        200: {"description": "Analyzer and cache statistics"},
+        500: {"description": "Server error"}
+    }
+})
+def analyze_stats_handler():
+    try:
+        analyzer = get_analyzer()
+        return jsonify({
+            "model": analyzer.model,
+            "version": analyzer.version,
+            "load_seconds": get_analyzer_registry().load_times().get(analyzer.model),
+            "cache": analyzer.cache_stats(),
+        }), 200
+    except Exception as exc:  # noqa: BLE001
+        logger.exception("/analyze/stats failed")
+        return jsonify({"error": str(exc)}), 500
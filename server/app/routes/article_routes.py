@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import logging
+from flask import Blueprint, request, jsonify
+from flasgger import swag_from
+
+from ..services.article_service import list_articles, listing_params
+
+bp = Blueprint("articles", __name__, url_prefix="")
+logger = logging.getLogger(__name__)
+
+
+@bp.get("/articles")
+@swag_from({
+    "tags": ["articles"],
+    "summary": "List scored articles",
+    "description": (
+        "Returns one page of scored articles, newest first. Pass the returned `next_cursor` "
+        "as `cursor` to get the following page; it is null on the last page."
+    ),
+    "parameters": [
+        {"name": "limit", "in": "query", "required": False, "schema": {"type": "integer"}, "description": "Page size"},
+        {"name": "cursor", "in": "query", "required": False, "schema": {"type": "string"}, "description": "Opaque cursor of the next page"},
+        {"name": "fields", "in": "query", "required": False, "schema": {"type": "string"}, "description": "Comma-separated fields to return"},
+        {"name": "source", "in": "query", "required": False, "schema": {"type": "string"}, "description": "Source filter; repeat for several"},
+        {"name": "from", "in": "query", "required": False, "schema": {"type": "string", "format": "date"}, "description": "First day, inclusive"},
+        {"name": "to", "in": "query", "required": False, "schema": {"type": "string", "format": "date"}, "description": "Last day, inclusive"},
+        {"name": "label", "in": "query", "required": False, "schema": {"type": "string"}, "description": "Sentiment labels (-1, 0, 1); repeat or comma-separate"}
+    ],
+    "responses": {
+        200: {"description": "A page of articles"},
+        400: {"description": "Invalid parameters"},
+        500: {"description": "Server error"}
+    }
+})
+def articles_handler():
+    try:
+        try:
+            page = list_articles(**listing_params(request.args))
+        except ValueError as exc:
+            return jsonify({"error": str(exc)}), 400
+        return jsonify(page), 200
+    except Exception as exc:  # noqa: BLE001
+        logger.exception("/articles failed")
+        return jsonify({"error": str(exc)}), 500
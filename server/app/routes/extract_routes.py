@@ -1,21 +1,56 @@
 from __future__ import annotations
 
 import logging
-from flask import Blueprint, request, jsonify
+from typing import Iterator
+
+from flask import Blueprint, Response, current_app, request, jsonify, stream_with_context
 from flasgger import swag_from
 
 from ..schemas.models import ExtractRequest
-from ..services.extractor_service import extract_articles
+from ..services.extractor_service import ExtractChunk, extract_articles, iter_extract_chunks
 
 bp = Blueprint("extract", __name__, url_prefix="")
 logger = logging.getLogger(__name__)
 
 
+def _ndjson_lines(chunks: Iterator[ExtractChunk]) -> Iterator[str]:
+    """Serialize records one per line as chunks complete, then a summary line."""
+    fetched = new = skipped = dropped = 0
+    try:
+        for chunk in chunks:
+            fetched += chunk.fetched
+            new += chunk.new
+            skipped += chunk.skipped
+            dropped += chunk.dropped
+            for record in chunk.records:
+                yield current_app.json.dumps(record) + "\n"
+    except Exception as exc:  # noqa: BLE001
+        logger.exception("/extract stream failed")
+        yield current_app.json.dumps({"error": str(exc)}) + "\n"
+        return
+    yield current_app.json.dumps({
+        "done": True, "fetched": fetched, "new": new, "skipped": skipped, "dropped": dropped,
+    }) + "\n"
+
+
 @bp.post("/extract")
 @swag_from({
     "tags": ["extract"],
     "summary": "Fetch and preprocess news articles",
-    "description": "Fetches articles from configured news API and preprocesses text (clean, tokenize, lemmatize).",
+    "description": (
+        "Fetches articles from configured news API and preprocesses text (clean, tokenize, lemmatize). "
+        "With `stream=true` (body or query string) articles are returned as `application/x-ndjson`, "
+        "one per line as each domain completes, followed by a summary line."
+    ),
+    "parameters": [
+        {
+            "name": "stream",
+            "in": "query",
+            "required": False,
+            "schema": {"type": "boolean"},
+            "description": "Stream results as NDJSON"
+        }
+    ],
     "requestBody": {
         "required": False,
         "content": {
@@ -26,7 +61,7 @@ logger = logging.getLogger(__name__)
     },
     "responses": {
         200: {
-            "description": "List of processed articles",
+            "description": "Newly processed articles with fetched/new/skipped/dropped counts",
         },
         400: {"description": "Validation error"},
         500: {"description": "Server error"}
@@ -36,8 +71,18 @@ def extract_handler():
     try:
         payload = request.get_json(silent=True) or {}
         req = ExtractRequest(**payload)
-        articles = extract_articles(domains=req.domains, from_date=req.from_date)
-        return jsonify({"count": len(articles), "items": articles}), 200
+        if req.stream or request.args.get("stream", "").lower() in ("1", "true", "yes"):
+            chunks = iter_extract_chunks(domains=req.domains, from_date=req.from_date)
+            return Response(stream_with_context(_ndjson_lines(chunks)), mimetype="application/x-ndjson")
+        result = extract_articles(domains=req.domains, from_date=req.from_date)
+        return jsonify({
+            "count": len(result.records),
+            "fetched": result.fetched,
+            "new": result.new,
+            "skipped": result.skipped,
+            "dropped": result.dropped,
+            "items": result.records,
+        }), 200
     except Exception as exc:  # noqa: BLE001
         logger.exception("/extract failed")
         return jsonify({"error": str(exc)}), 500
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import logging
+from flask import Blueprint, request, jsonify
+from flasgger import swag_from
+
+from ..services.job_service import get_job_manager
+
+bp = Blueprint("jobs", __name__, url_prefix="")
+logger = logging.getLogger(__name__)
+
+
+@bp.get("/jobs/<job_id>")
+@swag_from({
+    "tags": ["jobs"],
+    "summary": "Get background job status",
+    "description": "Returns status, progress and a window of partial results of a background job. The final summary is included once the job is done.",
+    "parameters": [
+        {"name": "job_id", "in": "path", "required": True, "schema": {"type": "string"}},
+        {
+            "name": "offset",
+            "in": "query",
+            "required": False,
+            "schema": {"type": "integer", "default": 0},
+            "description": "First result to return"
+        },
+        {
+            "name": "limit",
+            "in": "query",
+            "required": False,
+            "schema": {"type": "integer"},
+            "description": "Maximum results to return (all by default)"
+        }
+    ],
+    "responses": {
+        200: {"description": "Job status and results"},
+        404: {"description": "Unknown or expired job"},
+        500: {"description": "Server error"}
+    }
+})
+def job_handler(job_id: str):
+    try:
+        offset = max(request.args.get("offset", 0, type=int), 0)
+        limit = request.args.get("limit", type=int)
+        view = get_job_manager().view(job_id, offset=offset, limit=limit)
+        if view is None:
+            return jsonify({"error": "Job not found or expired"}), 404
+        return jsonify(view), 200
+    except Exception as exc:  # noqa: BLE001
+        logger.exception("/jobs failed")
+        return jsonify({"error": str(exc)}), 500
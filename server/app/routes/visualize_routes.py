@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 import logging
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, current_app, request, jsonify
 from flasgger import swag_from
 
-from ..services.visualizer_service import get_visualization_payload
+from ..core.config import get_settings
+from ..services.payload_cache import get_visualize_cache
+from ..services.visualizer_service import get_visualization_payload, visualization_version, visualize_params
 
 bp = Blueprint("visualize", __name__, url_prefix="")
 logger = logging.getLogger(__name__)
@@ -14,26 +16,85 @@ logger = logging.getLogger(__name__)
 @swag_from({
     "tags": ["visualize"],
     "summary": "Get polarity and keyword trends",
-    "description": "Returns aggregated polarity over time and top keywords for visualization.",
+    "description": (
+        "Returns aggregated polarity over time, top keywords and the top keywords of each period "
+        "(`keyword_trends`) for visualization. "
+        "Responses carry a strong `ETag`; send it back in `If-None-Match` to get `304 Not Modified` "
+        "until new polarity data is written."
+    ),
     "parameters": [
         {
             "name": "source",
             "in": "query",
             "required": False,
-            "schema": {"type": "string"},
-            "description": "Optional source filter"
+            "schema": {"type": "array", "items": {"type": "string"}},
+            "style": "form",
+            "explode": True,
+            "description": "Optional source filter; repeat for several sources"
+        },
+        {
+            "name": "from",
+            "in": "query",
+            "required": False,
+            "schema": {"type": "string", "format": "date"},
+            "description": "First day, inclusive (YYYY-MM-DD)"
+        },
+        {
+            "name": "to",
+            "in": "query",
+            "required": False,
+            "schema": {"type": "string", "format": "date"},
+            "description": "Last day, inclusive (YYYY-MM-DD)"
+        },
+        {
+            "name": "granularity",
+            "in": "query",
+            "required": False,
+            "schema": {"type": "string", "enum": ["day", "week", "month"], "default": "day"},
+            "description": "Trend bucket size"
+        },
+        {
+            "name": "group_by",
+            "in": "query",
+            "required": False,
+            "schema": {"type": "string", "enum": ["source"]},
+            "description": "Add one trend series per source"
+        },
+        {
+            "name": "max_points",
+            "in": "query",
+            "required": False,
+            "schema": {"type": "integer", "minimum": 1},
+            "description": "Most points per series; longer series are downsampled (capped by VISUALIZE_MAX_POINTS)"
         }
     ],
     "responses": {
         200: {"description": "Visualization data"},
+        400: {"description": "Invalid parameters"},
+        304: {"description": "Unchanged since the ETag in If-None-Match"},
         500: {"description": "Server error"}
     }
 })
 def visualize_handler():
     try:
-        source = request.args.get("source")
-        payload = get_visualization_payload(source=source)
-        return jsonify(payload), 200
+        params = visualize_params(request.args)
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+    try:
+        if not get_settings().visualize_cache_enabled:
+            return jsonify(get_visualization_payload(**params)), 200
+
+        key = tuple(sorted(request.args.items(multi=True)))
+        entry = get_visualize_cache().get_or_compute(
+            key,
+            visualization_version(),
+            lambda: current_app.json.dumps(get_visualization_payload(**params)).encode("utf-8"),
+        )
+        response = current_app.response_class(entry.body, mimetype="application/json")
+        response.set_etag(entry.etag)
+        # Clients may keep the body but must revalidate it on every poll
+        response.headers["Cache-Control"] = "no-cache"
+        return response.make_conditional(request)
     except Exception as exc:  # noqa: BLE001
         logger.exception("/visualize failed")
         return jsonify({"error": str(exc)}), 500
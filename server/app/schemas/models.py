@@ -21,6 +21,7 @@ class Article(BaseModel):
 class ExtractRequest(BaseModel):
     domains: List[str] | None = None
     from_date: Optional[str] = Field(default=None, description="YYYY-MM-DD")
+    stream: bool = Field(default=False, description="Stream results as NDJSON while domains complete")
 
     @validator("domains", pre=True, always=True)
     def default_domains(cls, v):  # noqa: N805
@@ -33,10 +34,17 @@ class AnalyzeRequest(BaseModel):
     text: Optional[str] = None
     texts: Optional[List[str]] = None
     articles: Optional[List[Article]] = None
+    job: Optional[bool] = Field(
+        default=None,
+        description="Run as a background job (true) or synchronously (false); by default large requests become jobs",
+    )
 
 
 class SendReportRequest(BaseModel):
     to: List[str]
     subject: Optional[str] = Field(default="News Analyzer Report")
     body: Optional[str] = Field(default="Please find the attached report.")
-    attachments: Optional[List[str]] = Field(default=None)
+    attachments: Optional[List[str]] = Field(
+        default=None,
+        description="File paths, or `store:<dataset>[:<from>[:<to>]]` to attach a CSV export of the columnar store",
+    )
@@ -1,15 +1,18 @@
 from __future__ import annotations
 
-from typing import List, Dict, Any
-
-import nltk
-from nltk.sentiment.vader import SentimentIntensityAnalyzer as SIA
+import logging
+import os
+import threading
+import time
+from typing import Callable, List, Dict, Any, Optional
 
 from ..core.config import get_settings
 from .db import insert_many, fetch_collection
+from .keyword_service import get_keyword_index
+from .sentiment_cache import SentimentCache, build_sentiment_cache
+from .vader_batch import get_vader_scorer
 
-# Ensure NLTK resources are available
-nltk.download('vader_lexicon')
+logger = logging.getLogger(__name__)
 
 
 class VaderAnalyzer:
@@ -19,11 +22,38 @@ class VaderAnalyzer:
     keyword extraction to support API endpoints.
     """
 
-    def __init__(self) -> None:
-        self._sia = SIA()
+    model = "vader"
+
+    def __init__(self, cache: Optional[SentimentCache] = None) -> None:
+        self._scorer = get_vader_scorer()
+        self.version = self._scorer.version
+        self._cache = cache if cache is not None else build_sentiment_cache(f"{self.model}:{self.version}")
+
+    def _score(self, texts: List[str]) -> List[Dict[str, float]]:
+        """Scores for `texts`, computing only those not already cached."""
+        if self._cache is None:
+            return self._scorer.score_texts(texts)
+        keys = [self._cache.key(text) for text in texts]
+        found = self._cache.get_many(keys)
+        pending: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in found:
+                pending.setdefault(key, text)
+        if pending:
+            fresh = dict(zip(pending, self._scorer.score_texts(list(pending.values()))))
+            self._cache.put_many(fresh)
+            found.update(fresh)
+        return [dict(found[key]) for key in keys]
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters of the sentiment cache (empty when disabled)."""
+        return self._cache.stats() if self._cache is not None else {}
 
     def analyze_texts(self, texts: List[str]) -> List[Dict[str, Any]]:
-        """Score multiple texts using VADER.
+        """Score multiple texts using VADER in a single batch.
+
+        Texts seen before (by content hash) are served from the sentiment
+        cache without being re-scored.
 
         Args:
             texts: List of input strings to analyze.
@@ -31,9 +61,10 @@ class VaderAnalyzer:
         Returns:
             List of dicts with text, scores, label, and word count.
         """
+        texts = list(texts)
+        scores = self._score([text or "" for text in texts])
         results: List[Dict[str, Any]] = []
-        for text in texts:
-            pol_score = self._sia.polarity_scores(text or "")
+        for text, pol_score in zip(texts, scores):
             label = 0
             if pol_score['compound'] > 0.2:
                 label = 1
@@ -48,21 +79,71 @@ class VaderAnalyzer:
         return results
 
     def extract_keywords(self, texts: List[str], top_k: int = 20) -> List[str]:
-        """Naive keyword extraction from input texts.
+        """Top TF-IDF keywords of the input texts.
 
-        Uses simple frequency of alpha tokens length>=3. This is fast
-        and dependency-light; swap with RAKE/KeyBERT if needed later.
+        Texts are reduced to stopword-free lemmas like extracted articles
+        and ranked against the corpus document frequencies.
         """
-        import re
-        from collections import Counter
+        return [term for term, _ in get_keyword_index().rank_texts(texts, top_k)]
+
+
+class AnalyzerRegistry:
+    """Builds each analyzer backend at most once per process.
+
+    Construction is serialized by a lock so concurrent first requests share
+    one instance. Instances built before a fork (e.g. under
+    `gunicorn --preload`) are inherited by the workers; the lock is
+    re-created in the child so a fork taken mid-build cannot deadlock it.
+    """
+
+    def __init__(self, backends: Dict[str, Callable[[], VaderAnalyzer]]) -> None:
+        self._backends = dict(backends)
+        self._instances: Dict[str, VaderAnalyzer] = {}
+        self._load_seconds: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def models(self) -> List[str]:
+        return sorted(self._backends)
+
+    def get(self, model: str) -> VaderAnalyzer:
+        """Return the shared instance of `model`, building it on first use."""
+        instance = self._instances.get(model)
+        if instance is not None:
+            return instance
+        if model not in self._backends:
+            raise ValueError(f"Unknown analyzer model '{model}'; expected one of {self.models}")
+        with self._lock:
+            instance = self._instances.get(model)
+            if instance is None:
+                started = time.perf_counter()
+                instance = self._backends[model]()
+                self._load_seconds[model] = time.perf_counter() - started
+                self._instances[model] = instance
+                logger.info("Loaded analyzer '%s' in %.3fs (pid %s)", model, self._load_seconds[model], os.getpid())
+        return instance
+
+    def load_times(self) -> Dict[str, float]:
+        """Seconds spent building each loaded backend."""
+        return {name: round(seconds, 4) for name, seconds in self._load_seconds.items()}
+
+    def _after_fork(self) -> None:
+        self._lock = threading.Lock()
+
+
+ANALYZER_BACKENDS: Dict[str, Callable[[], VaderAnalyzer]] = {
+    "vader": VaderAnalyzer,
+}
+
+_registry = AnalyzerRegistry(ANALYZER_BACKENDS)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_registry._after_fork)
+
 
-        tokens: List[str] = []
-        for text in texts:
-            for tok in re.findall(r"[a-zA-Z]{3,}", text.lower()):
-                tokens.append(tok)
-        return [w for w, _ in Counter(tokens).most_common(top_k)]
+def get_analyzer_registry() -> AnalyzerRegistry:
+    return _registry
 
 
 def get_analyzer() -> VaderAnalyzer:
-    # For future: branch on settings.analyzer_model
-    return VaderAnalyzer()
+    """Return the process-wide analyzer for `settings.analyzer_model`."""
+    return _registry.get(get_settings().analyzer_model.lower())
@@ -0,0 +1,135 @@
+"""Paged listing of scored articles.
+
+Articles are served newest first in keyset-paginated pages (see
+`db.find_page`), so `/articles` never loads the whole `PolarityData`
+collection, whatever its size.
+"""
+from __future__ import annotations
+
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence
+
+from bson import ObjectId
+
+from ..core.config import get_settings
+from .db import ensure_index, find_page
+
+ARTICLE_COLLECTION = "PolarityData"
+
+_indexes_ready = False
+_indexes_lock = threading.Lock()
+
+
+def ensure_article_indexes() -> None:
+    """Create the indexes behind the listing's filters and sort, once per process."""
+    global _indexes_ready
+    if _indexes_ready:
+        return
+    with _indexes_lock:
+        if not _indexes_ready:
+            ensure_index(ARTICLE_COLLECTION, [("pub_date", -1), ("_id", -1)])
+            ensure_index(ARTICLE_COLLECTION, [("source", 1), ("pub_date", -1), ("_id", -1)])
+            ensure_index(ARTICLE_COLLECTION, [("label", 1), ("pub_date", -1), ("_id", -1)])
+            _indexes_ready = True
+
+
+def pub_date_filter(start: Optional[str], end: Optional[str]) -> Dict[str, Any]:
+    """Filter for an inclusive `YYYY-MM-DD` day range on `pub_date`.
+
+    `pub_date` is a BSON date when written by the extractor and an ISO
+    string when posted to /analyze, so the range is matched for both types.
+    """
+    if not start and not end:
+        return {}
+    as_date: Dict[str, Any] = {}
+    as_text: Dict[str, Any] = {}
+    if start:
+        as_date["$gte"] = datetime.fromisoformat(start)
+        as_text["$gte"] = start
+    if end:
+        day_after = datetime.fromisoformat(end) + timedelta(days=1)
+        as_date["$lt"] = day_after
+        as_text["$lt"] = day_after.date().isoformat()
+    return {"$or": [{"pub_date": as_date}, {"pub_date": as_text}]}
+
+
+def _jsonable(doc: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: str(v) if isinstance(v, ObjectId) else v for k, v in doc.items()}
+
+
+def list_articles(
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    fields: Optional[Sequence[str]] = None,
+    sources: Optional[Sequence[str]] = None,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    labels: Optional[Sequence[int]] = None,
+) -> Dict[str, Any]:
+    """Return one page of articles, newest first.
+
+    Args:
+        limit: Page size; defaults to `settings.articles_page_size` and is
+            capped at `settings.articles_max_page_size`.
+        cursor: `next_cursor` from the previous page.
+        fields: Fields to return (all but `_id` when omitted).
+        sources: Only these sources.
+        start: Inclusive first day (YYYY-MM-DD).
+        end: Inclusive last day (YYYY-MM-DD).
+        labels: Only these sentiment labels (-1, 0, 1).
+
+    Returns:
+        Dict with `items`, `next_cursor` (None on the last page) and `limit`.
+
+    Raises:
+        ValueError: On a non-positive limit, a malformed cursor or date.
+    """
+    settings = get_settings()
+    limit = settings.articles_page_size if limit is None else limit
+    if limit < 1:
+        raise ValueError("limit must be a positive integer")
+    limit = min(limit, settings.articles_max_page_size)
+
+    query: Dict[str, Any] = {}
+    if sources:
+        query["source"] = sources[0] if len(sources) == 1 else {"$in": list(sources)}
+    if labels:
+        query["label"] = labels[0] if len(labels) == 1 else {"$in": list(labels)}
+    query.update(pub_date_filter(start, end))
+
+    ensure_article_indexes()
+    projection = {field: 1 for field in fields} if fields else None
+    if projection is not None and "_id" not in projection:
+        projection["_id"] = 0
+    docs, next_cursor = find_page(
+        ARTICLE_COLLECTION, query, projection, sort_field="pub_date", limit=limit, cursor=cursor
+    )
+    items: List[Dict[str, Any]] = [
+        _jsonable(doc if projection else {k: v for k, v in doc.items() if k != "_id"}) for doc in docs
+    ]
+    return {"items": items, "next_cursor": next_cursor, "limit": limit}
+
+
+def listing_params(args: Any) -> Dict[str, Any]:
+    """`list_articles` keyword arguments from request query args (a MultiDict).
+
+    `fields` and `label` accept repeated or comma-separated values; `source`
+    is repeated, since source names may contain commas.
+    """
+    def many(name: str) -> List[str]:
+        return [v.strip() for raw in args.getlist(name) for v in raw.split(",") if v.strip()]
+
+    limit = args.get("limit")
+    try:
+        return {
+            "limit": int(limit) if limit else None,
+            "cursor": args.get("cursor") or None,
+            "fields": many("fields") or None,
+            "sources": [v for v in args.getlist("source") if v] or None,
+            "start": args.get("from") or None,
+            "end": args.get("to") or None,
+            "labels": [int(v) for v in many("label")] or None,
+        }
+    except ValueError as exc:
+        raise ValueError(f"Invalid query parameter: {exc}") from exc
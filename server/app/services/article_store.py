@@ -0,0 +1,301 @@
+"""Partitioned columnar storage for article and polarity history.
+
+Datasets are Parquet files laid out as `<root>/<dataset>/date=YYYY-MM-DD/
+source=<name>/part-*.parquet`. Writes keep column types (token lists,
+dates, floats) intact, and reads are memory-mapped, project only the
+requested columns and push date/source predicates down to the partition
+directories, so scanning months of history touches only what is needed.
+
+Every write adds a part file to each partition it touches, so frequent
+small writes (one per /analyze call or extract chunk) leave many tiny
+files behind. Merge them into one file per partition with::
+
+    python -m app.services.article_store [dataset ...]
+"""
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import uuid
+from datetime import date, datetime
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+import pandas as pd
+
+from ..core.config import get_settings
+
+try:  # pragma: no cover - import guard
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.fs as pafs
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover
+    pa = None  # type: ignore[assignment]
+    ds = None  # type: ignore[assignment]
+    pafs = None  # type: ignore[assignment]
+    pq = None  # type: ignore[assignment]
+
+
+def _require_pyarrow() -> None:
+    if pa is None:
+        raise ImportError("pyarrow is required for the columnar store; install it with `pip install pyarrow`")
+
+
+def _schemas() -> Dict[str, "pa.Schema"]:
+    _require_pyarrow()
+    return {
+        "articles": pa.schema([
+            ("title", pa.string()),
+            ("author", pa.string()),
+            ("description", pa.string()),
+            ("content", pa.string()),
+            ("pub_date", pa.date32()),
+            ("url", pa.string()),
+            ("photo_url", pa.string()),
+            ("combined_text", pa.string()),
+            ("tokens", pa.list_(pa.string())),
+            ("lems", pa.string()),
+            ("fingerprint", pa.string()),
+            ("duplicate_of", pa.string()),
+        ]),
+        "polarity": pa.schema([
+            ("headline", pa.string()),
+            ("compound", pa.float64()),
+            ("neg", pa.float64()),
+            ("neu", pa.float64()),
+            ("pos", pa.float64()),
+            ("label", pa.int8()),
+            ("title", pa.string()),
+            ("author", pa.string()),
+            ("description", pa.string()),
+            ("url", pa.string()),
+            ("pub_date", pa.date32()),
+            ("duplicates", pa.int32()),
+        ]),
+        "mean_polarity": pa.schema([
+            ("mean_compound", pa.float64()),
+            ("count", pa.int64()),
+            ("pos", pa.int64()),
+            ("neg", pa.int64()),
+            ("neu", pa.int64()),
+        ]),
+    }
+
+
+DATASETS = ("articles", "polarity", "mean_polarity")
+
+
+def _partitioning() -> "ds.Partitioning":
+    return ds.partitioning(pa.schema([("date", pa.string()), ("source", pa.string())]), flavor="hive")
+
+
+def _to_date(value: Any) -> Optional[date]:
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    parsed = pd.to_datetime(value, errors="coerce", utc=True)
+    return None if pd.isna(parsed) else parsed.date()
+
+
+class ColumnarStore:
+    """Reader/writer for date/source partitioned Parquet datasets."""
+
+    def __init__(self, root: str) -> None:
+        _require_pyarrow()
+        self.root = root
+        self._fs = pafs.LocalFileSystem(use_mmap=True)
+
+    def _path(self, dataset: str) -> str:
+        return os.path.join(self.root, dataset)
+
+    def write(
+        self,
+        dataset: str,
+        df: pd.DataFrame,
+        date_column: Optional[str] = "pub_date",
+        replace_partitions: bool = False,
+    ) -> int:
+        """Append rows to a dataset, partitioned by date and source.
+
+        Rows are partitioned on `date_column` (today when missing) and the
+        `source` column. With `replace_partitions` the touched partitions
+        are overwritten instead of appended to. Returns the rows written.
+        """
+        if df.empty:
+            return 0
+        schema = _schemas()[dataset]
+        frame = df.copy()
+        if date_column and date_column in frame:
+            dates = frame[date_column].map(_to_date)
+        else:
+            dates = pd.Series([None] * len(frame), index=frame.index)
+        today = datetime.utcnow().date()
+        frame["date"] = [(d or today).isoformat() for d in dates]
+        if "pub_date" in schema.names and "pub_date" in frame:
+            frame["pub_date"] = dates
+        source = frame["source"] if "source" in frame else pd.Series([None] * len(frame), index=frame.index)
+        frame["source"] = source.map(lambda s: s if isinstance(s, str) and s else "unknown")
+
+        for name in schema.names:
+            if name not in frame:
+                frame[name] = None
+        fields = list(schema) + [pa.field("date", pa.string()), pa.field("source", pa.string())]
+        table = pa.Table.from_pandas(
+            frame[[f.name for f in fields]],
+            schema=pa.schema(fields),
+            preserve_index=False,
+        )
+        ds.write_dataset(
+            table,
+            self._path(dataset),
+            format="parquet",
+            partitioning=_partitioning(),
+            basename_template=f"part-{uuid.uuid4().hex}-{{i}}.parquet",
+            existing_data_behavior="delete_matching" if replace_partitions else "overwrite_or_ignore",
+            filesystem=self._fs,
+        )
+        return table.num_rows
+
+    def _dataset(self, dataset: str) -> Optional["ds.Dataset"]:
+        path = self._path(dataset)
+        if not os.path.isdir(path):
+            return None
+        schema = _schemas()[dataset].append(pa.field("date", pa.string())).append(pa.field("source", pa.string()))
+        return ds.dataset(path, schema=schema, format="parquet", partitioning=_partitioning(), filesystem=self._fs)
+
+    @staticmethod
+    def _filter(start: Optional[str], end: Optional[str], sources: Optional[Sequence[str]]):
+        expr = None
+
+        def _and(a, b):
+            return b if a is None else a & b
+
+        if start:
+            expr = _and(expr, ds.field("date") >= str(start))
+        if end:
+            expr = _and(expr, ds.field("date") <= str(end))
+        if sources:
+            expr = _and(expr, ds.field("source").isin(list(sources)))
+        return expr
+
+    def iter_batches(
+        self,
+        dataset: str,
+        columns: Optional[List[str]] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        sources: Optional[Sequence[str]] = None,
+        batch_size: int = 65536,
+    ) -> Iterator[pd.DataFrame]:
+        """Stream matching rows as DataFrames of at most `batch_size` rows."""
+        data = self._dataset(dataset)
+        if data is None:
+            return
+        scanner = data.scanner(columns=columns, filter=self._filter(start, end, sources), batch_size=batch_size)
+        for batch in scanner.to_batches():
+            if batch.num_rows:
+                yield batch.to_pandas()
+
+    def scan(
+        self,
+        dataset: str,
+        columns: Optional[List[str]] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        sources: Optional[Sequence[str]] = None,
+    ) -> pd.DataFrame:
+        """Load matching rows with column projection and partition pruning.
+
+        Args:
+            dataset: Dataset name, e.g. `articles` or `polarity`.
+            columns: Columns to read; `date` and `source` are available too.
+            start: Inclusive lower bound on the partition date (YYYY-MM-DD).
+            end: Inclusive upper bound on the partition date (YYYY-MM-DD).
+            sources: Only read these source partitions.
+        """
+        data = self._dataset(dataset)
+        if data is None:
+            return pd.DataFrame(columns=columns or [])
+        return data.to_table(columns=columns, filter=self._filter(start, end, sources)).to_pandas()
+
+    def compact(self, dataset: str, min_files: int = 2) -> Dict[str, int]:
+        """Merge the part files of each partition into a single file.
+
+        Only files present when a partition is visited are merged, so
+        concurrent appends are kept. The merged file is renamed into place
+        before its inputs are removed: a scan running at that moment may
+        briefly see those rows twice, but never misses them.
+
+        Args:
+            dataset: Dataset name.
+            min_files: Leave partitions with fewer part files alone.
+
+        Returns:
+            Counts of `partitions` compacted and part `files` merged.
+        """
+        stats = {"partitions": 0, "files": 0}
+        root = self._path(dataset)
+        if not os.path.isdir(root):
+            return stats
+        schema = _schemas()[dataset]
+        for directory, _dirs, names in os.walk(root):
+            parts = sorted(
+                os.path.join(directory, name) for name in names
+                if name.startswith("part-") and name.endswith(".parquet")
+            )
+            if len(parts) < min_files:
+                continue
+            table = ds.dataset(parts, schema=schema, format="parquet", filesystem=self._fs).to_table()
+            name = f"part-{uuid.uuid4().hex}-0.parquet"
+            # Hidden while written; scans skip dot files
+            tmp_path = os.path.join(directory, f".{name}.tmp")
+            pq.write_table(table, tmp_path)
+            os.replace(tmp_path, os.path.join(directory, name))
+            for path in parts:
+                os.remove(path)
+            stats["partitions"] += 1
+            stats["files"] += len(parts)
+        return stats
+
+    def export_csv(self, dataset: str, path: str, **scan_kwargs: Any) -> str:
+        """Write a filtered scan to CSV, e.g. for report attachments.
+
+        Raises:
+            ValueError: On an unknown dataset; nothing is written then.
+        """
+        if dataset not in DATASETS:
+            raise ValueError(f"Unknown dataset '{dataset}'; expected one of: {', '.join(DATASETS)}")
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        header = True
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            for frame in self.iter_batches(dataset, **scan_kwargs):
+                frame.to_csv(f, index=False, header=header)
+                header = False
+        return path
+
+
+_store: Optional[ColumnarStore] = None
+_store_lock = threading.Lock()
+
+
+def get_article_store() -> ColumnarStore:
+    """Return the process-wide store rooted at `settings.store_path`."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = ColumnarStore(get_settings().store_path)
+    return _store
+
+
+if __name__ == "__main__":  # pragma: no cover
+    store = get_article_store()
+    for name in sys.argv[1:] or list(_schemas()):
+        merged = store.compact(name)
+        print(f"{name}: merged {merged['files']} part files into {merged['partitions']} partitions")
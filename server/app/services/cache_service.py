@@ -1,26 +1,22 @@
 from __future__ import annotations
 
-import os
 from datetime import datetime
 from typing import Iterable, Dict, Any
 
 import pandas as pd
 
-from ..core.config import get_settings
+from .article_store import get_article_store
 
 
-def append_mean_polarity_csv(results: Iterable[Dict[str, Any]]) -> str:
-    """Append daily mean polarity to a CSV cache.
+def append_mean_polarity(results: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Record today's mean polarity in the `mean_polarity` store dataset.
 
-    Returns the CSV path written.
+    Today's partition is replaced, so there is at most one entry per day.
+    Returns the entry written (empty when there are no results).
     """
-    settings = get_settings()
-    csv_path = settings.cache_csv_path
-    os.makedirs(os.path.dirname(csv_path), exist_ok=True)
-
     rows = list(results)
     if not rows:
-        return csv_path
+        return {}
 
     compounds = [float(r.get("scores", {}).get("compound", 0.0)) for r in rows]
     labels = [int(r.get("label", 0)) for r in rows]
@@ -35,15 +31,5 @@ def append_mean_polarity_csv(results: Iterable[Dict[str, Any]]) -> str:
         "neu": int(sum(1 for l in labels if l == 0)),
     }
 
-    df_new = pd.DataFrame([entry])
-
-    if os.path.isfile(csv_path):
-        df_old = pd.read_csv(csv_path)
-        # Drop any existing row for today to avoid duplicates
-        df_old = df_old[df_old["date"] != entry["date"]]
-        df = pd.concat([df_old, df_new], ignore_index=True)
-    else:
-        df = df_new
-
-    df.to_csv(csv_path, index=False)
-    return csv_path
+    get_article_store().write("mean_polarity", pd.DataFrame([entry]), date_column="date", replace_partitions=True)
+    return entry
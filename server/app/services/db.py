@@ -1,13 +1,37 @@
 from __future__ import annotations
 
+import atexit
+import base64
+import logging
 import os
-from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+import random
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 from urllib.parse import quote_plus
 
-from pymongo import MongoClient, server_api
+from bson import ObjectId, encode as bson_encode, json_util
+from pymongo import InsertOne, MongoClient, UpdateOne, server_api
+from pymongo.collection import Collection
+from pymongo.database import Database
+from pymongo.monitoring import ConnectionPoolListener
+from pymongo.errors import (
+    AutoReconnect,
+    BulkWriteError,
+    ConnectionFailure,
+    ExecutionTimeout,
+    NetworkTimeout,
+    OperationFailure,
+    PyMongoError,
+    WTimeoutError,
+)
 
-from ..core.config import get_settings
+from ..core.config import Settings, get_settings
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass
@@ -33,34 +57,591 @@ def _mongo_uri(cfg: MongoConfig) -> str:
     )
 
 
-def get_mongo_client() -> MongoClient:
-    """Return a MongoClient using environment configuration."""
+class _PoolStats(ConnectionPoolListener):
+    """Counts connection-pool events for `MongoClientManager.stats`."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.counters = {
+            "connections_created": 0,
+            "connections_closed": 0,
+            "checkouts": 0,
+            "checkins": 0,
+            "checkout_failures": 0,
+            "pools_cleared": 0,
+        }
+
+    def _bump(self, name: str) -> None:
+        with self._lock:
+            self.counters[name] += 1
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            stats = dict(self.counters)
+        stats["open_connections"] = stats["connections_created"] - stats["connections_closed"]
+        stats["in_use"] = stats["checkouts"] - stats["checkins"]
+        return stats
+
+    def pool_created(self, event) -> None:
+        pass
+
+    def pool_ready(self, event) -> None:
+        pass
+
+    def pool_cleared(self, event) -> None:
+        self._bump("pools_cleared")
+
+    def pool_closed(self, event) -> None:
+        pass
+
+    def connection_created(self, event) -> None:
+        self._bump("connections_created")
+
+    def connection_ready(self, event) -> None:
+        pass
+
+    def connection_closed(self, event) -> None:
+        self._bump("connections_closed")
+
+    def connection_check_out_started(self, event) -> None:
+        pass
+
+    def connection_check_out_failed(self, event) -> None:
+        self._bump("checkout_failures")
+
+    def connection_checked_out(self, event) -> None:
+        self._bump("checkouts")
+
+    def connection_checked_in(self, event) -> None:
+        self._bump("checkins")
+
+
+class MongoClientManager:
+    """Owns the process-wide `MongoClient`.
+
+    The client is created on first use with `connect=False`, so importing
+    or forking never opens sockets. Sockets are opened by the first
+    operation. A client inherited across `fork()` is abandoned rather
+    than reused: the child builds its own on first use, as PyMongo
+    requires.
+    """
+
+    def __init__(self) -> None:
+        self._client: Optional[MongoClient] = None
+        self._pid: Optional[int] = None
+        self._stats = _PoolStats()
+        self._lock = threading.Lock()
+
+    def _create(self) -> MongoClient:
+        settings = get_settings()
+        uri = settings.mongo_uri or _mongo_uri(MongoConfig(
+            username=settings.mongo_username,
+            password=settings.mongo_password,
+            db_name=settings.db_name,
+        ))
+        options: Dict[str, Any] = {
+            "maxPoolSize": settings.mongo_max_pool_size,
+            "minPoolSize": settings.mongo_min_pool_size,
+            "maxIdleTimeMS": settings.mongo_max_idle_ms,
+            "serverSelectionTimeoutMS": settings.mongo_server_selection_timeout_ms,
+            "connect": False,
+            "event_listeners": [self._stats],
+        }
+        if uri.startswith("mongodb+srv://"):
+            options["server_api"] = server_api.ServerApi("1")
+        return MongoClient(uri, **options)
+
+    def get(self) -> MongoClient:
+        pid = os.getpid()
+        client = self._client
+        if client is not None and self._pid == pid:
+            return client
+        with self._lock:
+            if self._client is None or self._pid != pid:
+                self._client = self._create()
+                self._pid = pid
+            return self._client
+
+    def close(self) -> None:
+        """Close the client owned by this process, if any."""
+        with self._lock:
+            if self._client is not None and self._pid == os.getpid():
+                self._client.close()
+            self._client = None
+            self._pid = None
+
+    def stats(self) -> Dict[str, Any]:
+        settings = get_settings()
+        stats: Dict[str, Any] = {
+            "pid": os.getpid(),
+            "initialized": self._client is not None and self._pid == os.getpid(),
+            "max_pool_size": settings.mongo_max_pool_size,
+            "min_pool_size": settings.mongo_min_pool_size,
+        }
+        stats.update(self._stats.snapshot())
+        return stats
+
+    def _after_fork(self) -> None:
+        # Drop the parent's client and counters without touching its sockets
+        self._lock = threading.Lock()
+        self._client = None
+        self._pid = None
+        self._stats = _PoolStats()
+
+
+_manager = MongoClientManager()
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_manager._after_fork)
+atexit.register(_manager.close)
+
+
+class StorageBackend(ABC):
+    """Where the db helpers read and write.
+
+    A backend hands out a database whose collections speak the pymongo
+    `Collection` API, so every helper in this module (and every caller of
+    `get_collection`) works unchanged whichever backend is configured.
+    """
+
+    name = "base"
+    # True when values of different BSON types sort in type brackets (all
+    # strings below all dates) rather than by their stored text.
+    typed_ordering = True
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "StorageBackend":
+        """Build the backend from application settings."""
+        return cls()
+
+    @abstractmethod
+    def database(self) -> Database:
+        """Database whose collections speak the pymongo API."""
+
+    def ping(self) -> None:
+        self.database().command("ping")
+
+    def close(self) -> None:
+        pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": self.name}
+
+
+class MongoBackend(StorageBackend):
+    """MongoDB through the shared, pooled client."""
+
+    name = "mongo"
+
+    def database(self) -> Database:
+        return _manager.get()[get_settings().db_name]
+
+    def ping(self) -> None:
+        _manager.get().admin.command("ping")
+
+    def close(self) -> None:
+        _manager.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": self.name, "pool": _manager.stats()}
+
+
+class SQLiteBackend(StorageBackend):
+    """Embedded SQLite file; no server or network round trips."""
+
+    name = "sqlite"
+    typed_ordering = False
+
+    def __init__(self, path: str) -> None:
+        from .sqlite_backend import SQLiteDatabase
+
+        self.path = path
+        self._database = SQLiteDatabase(path)
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "SQLiteBackend":
+        return cls(settings.sqlite_db_path)
+
+    def database(self) -> Database:
+        return self._database  # type: ignore[return-value]
+
+    def close(self) -> None:
+        self._database.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": self.name, "path": self.path}
+
+
+STORAGE_BACKENDS = {"mongo": MongoBackend, "sqlite": SQLiteBackend}
+
+_backend: Optional[StorageBackend] = None
+_backend_lock = threading.Lock()
+
+
+def _create_backend() -> StorageBackend:
     settings = get_settings()
-    cfg = MongoConfig(
-        username=settings.mongo_username,
-        password=settings.mongo_password,
-        db_name=settings.db_name,
-    )
-    uri = _mongo_uri(cfg)
-    client = MongoClient(uri, server_api=server_api.ServerApi("1"))
-    return client
+    name = settings.storage_backend.lower()
+    if name not in STORAGE_BACKENDS:
+        raise ValueError(f"Unknown storage backend '{settings.storage_backend}'; available: {', '.join(STORAGE_BACKENDS)}")
+    return STORAGE_BACKENDS[name].from_settings(settings)
+
+
+def get_storage_backend() -> StorageBackend:
+    """Return the process-wide backend chosen by `settings.storage_backend`."""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = _create_backend()
+    return _backend
+
+
+def close_storage_backend() -> None:
+    """Close the backend; the next call re-reads the settings."""
+    global _backend
+    with _backend_lock:
+        if _backend is not None:
+            _backend.close()
+        _backend = None
+
+
+atexit.register(close_storage_backend)
+
+
+def get_mongo_client() -> MongoClient:
+    """Return the shared, pooled MongoClient of this process."""
+    return _manager.get()
+
+
+def get_database() -> Database:
+    """Return the configured database of the storage backend."""
+    return get_storage_backend().database()
+
+
+def ping_database() -> None:
+    """Check the storage backend is reachable; raises if it is not."""
+    get_storage_backend().ping()
+
+
+def storage_stats() -> Dict[str, Any]:
+    """Backend name plus its connection statistics."""
+    return get_storage_backend().stats()
+
+
+def mongo_pool_stats() -> Dict[str, Any]:
+    """Connection-pool counters of the shared client."""
+    return _manager.stats()
+
+
+def close_mongo_client() -> None:
+    _manager.close()
 
 
 def fetch_collection(collection_name: str, projection: Optional[Dict[str, int]] = None) -> List[Dict[str, Any]]:
-    """Fetch all documents from a collection as dicts."""
-    client = get_mongo_client()
-    db = client[get_settings().db_name]
-    coll = db[collection_name]
-    projection = projection or {"_id": 0}
-    return list(coll.find({}, projection))
+    """Fetch all documents from a collection as dicts.
+
+    Prefer `iter_collection` (or `find_page` for APIs) on large collections.
+    """
+    return [doc for batch in iter_collection(collection_name, projection) for doc in batch]
+
+
+def iter_collection(
+    collection_name: str,
+    projection: Optional[Dict[str, int]] = None,
+    query: Optional[Dict[str, Any]] = None,
+    batch_size: Optional[int] = None,
+) -> Iterator[List[Dict[str, Any]]]:
+    """Stream a collection in batches instead of materializing it.
+
+    Args:
+        collection_name: Collection to read.
+        projection: Fields to return; `_id` is excluded by default.
+        query: Optional filter.
+        batch_size: Documents per yielded batch (and per server round trip).
+    """
+    size = max(1, batch_size or get_settings().mongo_read_batch_size)
+    cursor = get_collection(collection_name).find(query or {}, projection or {"_id": 0}).batch_size(size)
+    batch: List[Dict[str, Any]] = []
+    for doc in cursor:
+        batch.append(doc)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def encode_cursor(value: Any, last_id: Any) -> str:
+    """Opaque page token for the keyset position `(value, _id)`."""
+    raw = json_util.dumps([value, last_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str) -> Tuple[Any, Any]:
+    """Inverse of `encode_cursor`; raises ValueError on a malformed token."""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        value, last_id = json_util.loads(raw.decode("utf-8"))
+    except Exception as exc:  # noqa: BLE001
+        raise ValueError("Invalid cursor") from exc
+    return value, last_id
+
+
+def _after(field: str, value: Any, last_id: Any, typed: bool) -> Dict[str, Any]:
+    """Documents after `(value, last_id)` in `(field, _id)` descending order."""
+    clauses: List[Dict[str, Any]] = [{field: value, "_id": {"$lt": last_id}}]
+    if value is not None:
+        clauses.insert(0, {field: {"$lt": value}})
+        # Null and missing values sort last
+        clauses.append({field: None})
+        if typed and isinstance(value, datetime):
+            # Comparisons stay within a BSON type, and strings sort below dates
+            clauses.append({field: {"$type": "string"}})
+    return {"$or": clauses}
+
+
+def find_page(
+    collection_name: str,
+    query: Optional[Dict[str, Any]] = None,
+    projection: Optional[Dict[str, int]] = None,
+    sort_field: str = "pub_date",
+    limit: int = 100,
+    cursor: Optional[str] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """One page of documents, newest `sort_field` first, by keyset pagination.
+
+    Each page resumes strictly after the `(sort_field, _id)` of the
+    previous one. The cost of a page does not depend on how deep it is,
+    and rows inserted meanwhile never shift the pages. An index on
+    `(sort_field, _id)`, optionally prefixed by equality-filtered fields,
+    serves the sort.
+
+    Args:
+        collection_name: Collection to page through.
+        query: Filter applied to every page.
+        projection: Inclusion projection; `sort_field` and `_id` are
+            fetched regardless and dropped again unless requested.
+        sort_field: Field to order by, descending, with `_id` as tiebreaker.
+        limit: Maximum documents per page.
+        cursor: `next_cursor` of the previous page.
+
+    Returns:
+        The page's documents and the cursor of the next page (None on the last).
+    """
+    filters = [query] if query else []
+    if cursor:
+        value, last_id = decode_cursor(cursor)
+        filters.append(_after(sort_field, value, last_id, get_storage_backend().typed_ordering))
+    combined = filters[0] if len(filters) == 1 else ({"$and": filters} if filters else {})
+
+    fetch = None
+    if projection:
+        fetch = {**{k: v for k, v in projection.items() if v}, sort_field: 1, "_id": 1}
+    docs = list(
+        get_collection(collection_name)
+        .find(combined, fetch)
+        .sort([(sort_field, -1), ("_id", -1)])
+        .limit(limit + 1)
+    )
+    next_cursor = None
+    if len(docs) > limit:
+        docs = docs[:limit]
+        next_cursor = encode_cursor(docs[-1].get(sort_field), docs[-1]["_id"])
+    if projection:
+        hidden = {k for k in (sort_field, "_id") if not projection.get(k)}
+        docs = [{k: v for k, v in doc.items() if k not in hidden} for doc in docs]
+    return docs, next_cursor
+
+
+def insert_many(collection_name: str, records: List[Dict[str, Any]], key: Optional[str] = None) -> int:
+    """Insert many records and return count inserted.
+
+    Goes through `bulk_upsert`, so large inputs are batched, written
+    unordered and retried; pass `key` to make repeated writes idempotent.
+    """
+    return bulk_upsert(collection_name, records, key=key).inserted
+
+
+def get_collection(collection_name: str) -> Collection:
+    """Return a handle to a collection in the configured database."""
+    return get_database()[collection_name]
 
 
-def insert_many(collection_name: str, records: List[Dict[str, Any]]) -> int:
-    """Insert many records and return count inserted."""
+def ensure_index(collection_name: str, keys: List[Tuple[str, int]], unique: bool = False, **options: Any) -> str:
+    """Create an index if it does not already exist and return its name."""
+    return get_collection(collection_name).create_index(keys, unique=unique, **options)
+
+
+def find_values(collection_name: str, field: str, values: Iterable[Any]) -> Set[Any]:
+    """Return the subset of `values` already stored under `field`."""
+    values = list(values)
+    if not values:
+        return set()
+    cursor = get_collection(collection_name).find({field: {"$in": values}}, {field: 1, "_id": 0})
+    return {doc[field] for doc in cursor if field in doc}
+
+
+def insert_unique(collection_name: str, records: List[Dict[str, Any]]) -> int:
+    """Insert records unordered, ignoring duplicate-key violations.
+
+    Returns the number of records actually inserted.
+    """
     if not records:
         return 0
-    client = get_mongo_client()
-    db = client[get_settings().db_name]
-    coll = db[collection_name]
-    result = coll.insert_many(records)
-    return len(result.inserted_ids)
+    try:
+        result = get_collection(collection_name).insert_many(records, ordered=False)
+        return len(result.inserted_ids)
+    except BulkWriteError as exc:
+        errors = exc.details.get("writeErrors", [])
+        if any(err.get("code") != 11000 for err in errors):
+            raise
+        return int(exc.details.get("nInserted", 0))
+
+
+@dataclass
+class WriteResult:
+    """Outcome of a bulk write.
+
+    `skipped` counts records that were already stored unchanged or lost a
+    duplicate-key race to a concurrent writer.
+    """
+    inserted: int = 0
+    updated: int = 0
+    skipped: int = 0
+    batches: int = 0
+    retries: int = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return asdict(self)
+
+
+_TRANSIENT_ERRORS = (AutoReconnect, ConnectionFailure, NetworkTimeout, ExecutionTimeout, WTimeoutError)
+_RETRYABLE_LABELS = ("RetryableWriteError", "TransientTransactionError")
+
+_key_indexes: Set[Tuple[str, str]] = set()
+_key_indexes_lock = threading.Lock()
+
+
+def _is_transient(exc: PyMongoError) -> bool:
+    if isinstance(exc, BulkWriteError):
+        return False
+    return isinstance(exc, _TRANSIENT_ERRORS) or any(exc.has_error_label(label) for label in _RETRYABLE_LABELS)
+
+
+def _ensure_key_index(collection_name: str, key: str) -> None:
+    """Unique index on the natural key, once per process.
+
+    Only string values are indexed so legacy documents without the key do
+    not collide. If existing data already violates uniqueness, upserts
+    still dedupe new writes and a warning is logged.
+    """
+    marker = (collection_name, key)
+    if marker in _key_indexes:
+        return
+    with _key_indexes_lock:
+        if marker in _key_indexes:
+            return
+        try:
+            ensure_index(
+                collection_name, [(key, 1)], unique=True,
+                partialFilterExpression={key: {"$type": "string"}},
+            )
+        except OperationFailure as exc:
+            logger.warning("Could not create unique index on %s.%s: %s", collection_name, key, exc)
+        _key_indexes.add(marker)
+
+
+def _operations(records: Iterable[Dict[str, Any]], key: Optional[str]) -> Iterator[Tuple[Any, int]]:
+    """Yield `(operation, encoded_size)` for each record."""
+    for record in records:
+        value = record.get(key) if key else None
+        if value is None:
+            # Without a natural key, pin the _id so a retried insert is a no-op
+            doc = dict(record)
+            doc.setdefault("_id", ObjectId())
+            yield InsertOne(doc), len(bson_encode(doc))
+        else:
+            fields = {k: v for k, v in record.items() if k != "_id"}
+            yield UpdateOne({key: value}, {"$set": fields}, upsert=True), len(bson_encode(fields))
+
+
+def _batches(operations: Iterator[Tuple[Any, int]], max_count: int, max_bytes: int) -> Iterator[List[Any]]:
+    batch: List[Any] = []
+    size = 0
+    for op, op_size in operations:
+        if batch and (len(batch) >= max_count or size + op_size > max_bytes):
+            yield batch
+            batch, size = [], 0
+        batch.append(op)
+        size += op_size
+    if batch:
+        yield batch
+
+
+def _write_batch(collection: Collection, batch: List[Any], result: WriteResult, retries: int, backoff: float) -> None:
+    for attempt in range(retries + 1):
+        try:
+            outcome = collection.bulk_write(batch, ordered=False)
+            details = outcome.bulk_api_result
+            break
+        except BulkWriteError as exc:
+            errors = exc.details.get("writeErrors", [])
+            if any(err.get("code") != 11000 for err in errors):
+                raise
+            details = exc.details
+            result.skipped += len(errors)
+            break
+        except PyMongoError as exc:
+            if attempt >= retries or not _is_transient(exc):
+                raise
+            result.retries += 1
+            delay = backoff * (2 ** attempt) * (0.5 + random.random())
+            logger.warning("Transient error writing to %s (%s); retrying in %.2fs", collection.name, exc, delay)
+            time.sleep(delay)
+    upserted = int(details.get("nUpserted", 0))
+    matched = int(details.get("nMatched", 0))
+    modified = int(details.get("nModified", 0))
+    result.inserted += int(details.get("nInserted", 0)) + upserted
+    result.updated += modified
+    result.skipped += matched - modified
+    result.batches += 1
+
+
+def bulk_upsert(
+    collection_name: str,
+    records: Iterable[Dict[str, Any]],
+    key: Optional[str] = None,
+    batch_size: Optional[int] = None,
+    batch_bytes: Optional[int] = None,
+    retries: Optional[int] = None,
+) -> WriteResult:
+    """Write records in size-bounded, unordered, retried batches.
+
+    Records carrying `key` are upserted on it (`$set`), so writing the same
+    record twice, or retrying a batch, never creates a duplicate. Records
+    without it are inserted.
+
+    Args:
+        collection_name: Target collection.
+        records: Documents to write; they are not mutated.
+        key: Natural key field, e.g. `fingerprint` or `url`.
+        batch_size: Maximum operations per batch.
+        batch_bytes: Maximum encoded bytes per batch.
+        retries: Attempts after a transient failure, with exponential backoff.
+    """
+    settings = get_settings()
+    result = WriteResult()
+    records = list(records)
+    if not records:
+        return result
+    if key:
+        _ensure_key_index(collection_name, key)
+    collection = get_collection(collection_name)
+    batches = _batches(
+        _operations(records, key),
+        max(1, batch_size or settings.mongo_write_batch_size),
+        max(1, batch_bytes or settings.mongo_write_batch_bytes),
+    )
+    retries = settings.mongo_write_retries if retries is None else retries
+    for batch in batches:
+        _write_batch(collection, batch, result, retries, settings.mongo_retry_backoff)
+    return result
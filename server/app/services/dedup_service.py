@@ -0,0 +1,111 @@
+"""Near-duplicate detection with MinHash signatures and LSH banding.
+
+Wire copy republished by several outlets differs by a few words, so exact
+fingerprints miss it. Each document is reduced to a MinHash signature over
+word shingles; signatures are split into bands and hashed into buckets so
+only documents sharing a band are compared. A candidate whose estimated
+Jaccard similarity reaches the threshold is linked to the first-seen
+representative of its cluster.
+"""
+from __future__ import annotations
+
+import zlib
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+_MERSENNE_PRIME = np.uint64((1 << 31) - 1)
+
+
+def _lsh_params(threshold: float, num_perm: int) -> Tuple[int, int]:
+    """Pick `(bands, rows)` whose S-curve midpoint is closest to `threshold`."""
+    best = (1, num_perm)
+    best_err = float("inf")
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        if bands < 1:
+            break
+        err = abs((1.0 / bands) ** (1.0 / rows) - threshold)
+        if err < best_err:
+            best, best_err = (bands, rows), err
+    return best
+
+
+class NearDuplicateIndex:
+    """Incremental MinHash/LSH index over token sequences.
+
+    Only cluster representatives are added to the LSH buckets, so every
+    duplicate links directly to the representative it matched.
+    """
+
+    def __init__(self, threshold: float = 0.8, num_perm: int = 128, shingle_size: int = 3, seed: int = 1) -> None:
+        if not 0.0 < threshold <= 1.0:
+            raise ValueError("threshold must be in (0, 1]")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, int(_MERSENNE_PRIME), size=num_perm).astype(np.uint64)
+        self._b = rng.randint(0, int(_MERSENNE_PRIME), size=num_perm).astype(np.uint64)
+        self.bands, self.rows = _lsh_params(threshold, num_perm)
+        self._buckets: List[Dict[bytes, List[Hashable]]] = [{} for _ in range(self.bands)]
+        self._signatures: Dict[Hashable, np.ndarray] = {}
+
+    def _shingles(self, tokens: Sequence[str]) -> np.ndarray:
+        k = self.shingle_size
+        if len(tokens) >= k:
+            grams = {" ".join(tokens[i:i + k]) for i in range(len(tokens) - k + 1)}
+        else:
+            grams = set(tokens)
+        hashes = [zlib.crc32(g.encode("utf-8")) for g in grams]
+        return np.array(hashes, dtype=np.uint64) % _MERSENNE_PRIME
+
+    def signature(self, tokens: Sequence[str]) -> Optional[np.ndarray]:
+        """Return the MinHash signature, or None for empty input."""
+        shingles = self._shingles(tokens)
+        if shingles.size == 0:
+            return None
+        hashed = (np.outer(self._a, shingles) + self._b[:, None]) % _MERSENNE_PRIME
+        return hashed.min(axis=1)
+
+    def _band_keys(self, sig: np.ndarray) -> List[bytes]:
+        r = self.rows
+        return [sig[i * r:(i + 1) * r].tobytes() for i in range(self.bands)]
+
+    def add(self, key: Hashable, tokens: Sequence[str]) -> Optional[Hashable]:
+        """Register a document; return its representative's key if it is a
+        near-duplicate, otherwise None (it becomes a representative)."""
+        sig = self.signature(tokens)
+        if sig is None:
+            return None
+        band_keys = self._band_keys(sig)
+
+        best_key: Optional[Hashable] = None
+        best_sim = self.threshold
+        seen = set()
+        for band, band_key in zip(self._buckets, band_keys):
+            for candidate in band.get(band_key, ()):
+                if candidate in seen:
+                    continue
+                seen.add(candidate)
+                sim = float(np.mean(self._signatures[candidate] == sig))
+                if sim >= best_sim:
+                    best_key, best_sim = candidate, sim
+        if best_key is not None:
+            return best_key
+
+        self._signatures[key] = sig
+        for band, band_key in zip(self._buckets, band_keys):
+            band.setdefault(band_key, []).append(key)
+        return None
+
+
+def cluster_duplicates(
+    token_lists: Iterable[Sequence[str]],
+    threshold: float = 0.8,
+    num_perm: int = 128,
+) -> List[Optional[int]]:
+    """For each document return the index of its representative, or None
+    if it is a representative itself."""
+    index = NearDuplicateIndex(threshold=threshold, num_perm=num_perm)
+    return [index.add(i, tokens) for i, tokens in enumerate(token_lists)]
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import os
+import tempfile
+from datetime import date
 from typing import Iterable, List, Optional
 from email.mime.text import MIMEText
 from email.mime.application import MIMEApplication
@@ -8,9 +10,48 @@ from email.mime.multipart import MIMEMultipart
 import smtplib
 
 from ..core.config import get_settings
+from .article_store import DATASETS, get_article_store
 
+STORE_PREFIX = "store:"
 
-def _build_message(subject: str, body: str, attachments: Optional[Iterable[str]] = None) -> MIMEMultipart:
+
+def _resolve_attachment(path: str, tmp_dir: str) -> str:
+    """Map `store:<dataset>[:<from>[:<to>]]` specs to an exported CSV.
+
+    Plain paths are returned unchanged. The CSV is always written inside
+    `tmp_dir`.
+
+    Raises:
+        ValueError: On an unknown dataset or a date that is not YYYY-MM-DD.
+    """
+    if not path.startswith(STORE_PREFIX):
+        return path
+    dataset, _, bounds = path[len(STORE_PREFIX):].partition(":")
+    start, _, end = bounds.partition(":")
+    if dataset not in DATASETS:
+        raise ValueError(f"Unknown dataset '{dataset}' in attachment; expected one of: {', '.join(DATASETS)}")
+    for value in (start, end):
+        if value:
+            try:
+                date.fromisoformat(value)
+            except ValueError:
+                raise ValueError(f"Invalid date '{value}' in attachment; expected YYYY-MM-DD") from None
+    # Every part is validated above; basename() keeps the file in tmp_dir regardless
+    name = os.path.basename("_".join(p for p in (dataset, start, end) if p) + ".csv")
+    return get_article_store().export_csv(
+        dataset,
+        os.path.join(tmp_dir, name),
+        start=start or None,
+        end=end or None,
+    )
+
+
+def _build_message(
+    subject: str,
+    body: str,
+    attachments: Optional[Iterable[str]] = None,
+    tmp_dir: Optional[str] = None,
+) -> MIMEMultipart:
     msg = MIMEMultipart()
     msg['Subject'] = subject
     msg.attach(MIMEText(body))
@@ -19,6 +60,8 @@ def _build_message(subject: str, body: str, attachments: Optional[Iterable[str]]
         for path in attachments:
             if not path:
                 continue
+            if path.startswith(STORE_PREFIX):
+                path = _resolve_attachment(path, tmp_dir or tempfile.gettempdir())
             norm = os.path.abspath(path)
             if not os.path.isfile(norm):
                 continue
@@ -34,11 +77,13 @@ def send_report(to_emails: List[str], subject: str, body: str, attachments: Opti
     if not settings.email_user or not settings.email_pass:
         raise ValueError("EMAIL_USER and EMAIL_PASS must be configured")
 
+    # Attachments are resolved (and validated) before connecting
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        msg = _build_message(subject, body, attachments, tmp_dir=tmp_dir)
+
     smtp = smtplib.SMTP('smtp.gmail.com', 587)
     smtp.ehlo()
     smtp.starttls()
     smtp.login(settings.email_user, settings.email_pass)
-
-    msg = _build_message(subject, body, attachments)
     smtp.sendmail(from_addr=settings.email_user, to_addrs=to_emails, msg=msg.as_string())
     smtp.quit()
@@ -1,24 +1,29 @@
 from __future__ import annotations
 
+import atexit
+import logging
 import os
-import re
-from datetime import datetime, timedelta
-from typing import List, Dict, Any
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterator, List, Tuple
 
 import pandas as pd
-import requests
-import nltk
-from nltk.corpus import stopwords
 from nltk.tokenize import RegexpTokenizer
-from nltk.stem import WordNetLemmatizer
 
 from ..core.config import get_settings
-from .db import insert_many
+from .article_store import get_article_store
+from .db import bulk_upsert
+from .dedup_service import NearDuplicateIndex
+from .fingerprint_service import get_fingerprint_index
+from .keyword_service import frame_documents, record_keywords
+from .lemma_table import get_lemma_table
+from .news_client import get_news_fetcher
+from .nltk_resources import get_stopwords
+from .text_normalizer import normalize_text, normalize_texts
 
-# Ensure NLTK resources are available
-nltk.download('stopwords')
-nltk.download('punkt')
-nltk.download('wordnet')
+logger = logging.getLogger(__name__)
 
 
 def _clean_text(text: str) -> str:
@@ -27,31 +32,10 @@ def _clean_text(text: str) -> str:
     Performs lowercasing, contraction expansion, punctuation/whitespace
     cleanup, ASCII stripping, and alphanumeric filtering.
     """
-    text = text.lower()
-    text = re.sub(r"what's", "what is ", text)
-    text = text.replace('(ap)', '')
-    text = re.sub(r"\'s", " is ", text)
-    text = re.sub(r"\'ve", " have ", text)
-    text = re.sub(r"can't", "cannot ", text)
-    text = re.sub(r"n't", " not ", text)
-    text = re.sub(r"i'm", "i am ", text)
-    text = re.sub(r"\'re", " are ", text)
-    text = re.sub(r"\'d", " would ", text)
-    text = re.sub(r"\'ll", " will ", text)
-    text = re.sub(r'\W+', ' ', text)
-    text = re.sub(r'\s+', ' ', text)
-    text = re.sub(r"\\", "", text)
-    text = re.sub(r"\'", "", text)
-    text = re.sub(r'\"', '', text)
-    text = re.sub('[^a-zA-Z ?!]+', '', text)
-    text = "".join(i for i in text if ord(i) < 128)
-    return text.strip()
+    return normalize_text(text)
 
 
 tokenizer = RegexpTokenizer(r"\w+")
-lemmatizer = WordNetLemmatizer()
-stop_words = set(stopwords.words('english'))
-stop_words.update(['char', 'u', 'hindustan', 'doj', 'washington'])
 
 
 def _tokenize(text: str) -> List[str]:
@@ -59,20 +43,77 @@ def _tokenize(text: str) -> List[str]:
 
 
 def _remove_stopwords(tokens: List[str]) -> List[str]:
+    stop_words = get_stopwords()
     return [w for w in tokens if w not in stop_words]
 
 
 def _lemmatize(tokens: List[str]) -> str:
-    return ' '.join([lemmatizer.lemmatize(word) for word in tokens])
+    return ' '.join(get_lemma_table().lemmatize_tokens(tokens))
+
+
+def _normalize_chunk(texts: List[str]) -> Tuple[List[str], List[List[str]], List[str]]:
+    """Clean, tokenize, drop stopwords and lemmatize a chunk of raw texts."""
+    cleaned = normalize_texts(texts)
+    tokens = [_remove_stopwords(_tokenize(text)) for text in cleaned]
+    lems = [_lemmatize(toks) for toks in tokens]
+    return cleaned, tokens, lems
+
+
+def _init_normalize_worker() -> None:
+    """Load stopwords and the lemma table once per worker process."""
+    get_stopwords()
+    get_lemma_table()
+
+
+_pool: ProcessPoolExecutor | None = None
+_pool_pid: int | None = None
+_pool_lock = threading.Lock()
+
+
+def _get_normalize_pool() -> ProcessPoolExecutor:
+    """Return the shared worker pool, recreating it after a fork."""
+    global _pool, _pool_pid
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid():
+            workers = get_settings().normalize_workers or None
+            _pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_normalize_worker)
+            _pool_pid = os.getpid()
+        return _pool
+
+
+@atexit.register
+def _shutdown_normalize_pool() -> None:
+    if _pool is not None and _pool_pid == os.getpid():
+        _pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _normalize_texts(texts: List[str]) -> Tuple[List[str], List[List[str]], List[str]]:
+    """Run `_normalize_chunk` in-process or across the worker pool.
+
+    Batches below `normalize_parallel_min_rows` stay in-process so small
+    requests don't pay pool overhead. Larger ones are split into chunks
+    whose results are reassembled in the original order.
+    """
+    settings = get_settings()
+    if len(texts) < settings.normalize_parallel_min_rows or settings.normalize_workers == 1:
+        return _normalize_chunk(texts)
+
+    size = max(1, settings.normalize_chunk_size)
+    chunks = [texts[i:i + size] for i in range(0, len(texts), size)]
+    cleaned: List[str] = []
+    tokens: List[List[str]] = []
+    lems: List[str] = []
+    for c, t, l in _get_normalize_pool().map(_normalize_chunk, chunks):
+        cleaned.extend(c)
+        tokens.extend(t)
+        lems.extend(l)
+    return cleaned, tokens, lems
 
 
 def _normalize_frame(df: pd.DataFrame) -> pd.DataFrame:
     """Apply cleaning, tokenization, stopword removal and lemmatization."""
-    df['combined_text'] = df['title'].map(str) + ' ' + df['content'].map(str)
-    df['combined_text'] = df['combined_text'].map(_clean_text)
-    df['tokens'] = df['combined_text'].map(_tokenize)
-    df['tokens'] = df['tokens'].map(_remove_stopwords)
-    df['lems'] = df['tokens'].map(_lemmatize)
+    combined = df['title'].map(str) + ' ' + df['content'].map(str)
+    df['combined_text'], df['tokens'], df['lems'] = _normalize_texts(combined.tolist())
     df.dropna(inplace=True)
     df['pub_date'] = pd.to_datetime(df['pub_date']).apply(lambda x: x.date())
     df['source'] = df['source'].apply(lambda x: x['name'] if isinstance(x, dict) and 'name' in x else None)
@@ -95,48 +136,126 @@ def _articles_from_api_response(items: List[Dict[str, Any]]) -> List[Dict[str, A
     return results
 
 
-def extract_articles(domains: List[str] | None = None, from_date: str | None = None) -> List[Dict[str, Any]]:
-    """Fetch news articles, preprocess text, persist, and return records.
+def _iter_domain_articles(domains: List[str], from_date: str) -> Iterator[List[Dict[str, Any]]]:
+    """Yield each domain's article records as soon as its fetch completes."""
+    fetcher = get_news_fetcher()
+    for _domain, items in fetcher.iter_domains(domains, from_date):
+        yield _articles_from_api_response(items)
+
+
+@dataclass
+class ExtractChunk:
+    """One persisted slice of an extraction run."""
+    records: List[Dict[str, Any]]
+    fetched: int
+    new: int
+    skipped: int
+    dropped: int = 0
+
 
-    Persistence includes MongoDB `DailyNews` and a dated CSV in `assets/`.
+@dataclass
+class ExtractResult:
+    """Outcome of an extraction run."""
+    records: List[Dict[str, Any]]
+    fetched: int
+    new: int
+    skipped: int
+    dropped: int = 0
+
+
+def _to_document(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy a record into a BSON-encodable Mongo document."""
+    doc = dict(record)
+    if isinstance(doc.get('pub_date'), date) and not isinstance(doc['pub_date'], datetime):
+        doc['pub_date'] = datetime.combine(doc['pub_date'], datetime.min.time())
+    return doc
+
+
+def _mark_duplicates(df: pd.DataFrame, dedup: NearDuplicateIndex) -> List[Any]:
+    """Link near-duplicate articles to their cluster representative's URL."""
+    links: List[Any] = []
+    for url, fp, lems in zip(df['url'], df['fingerprint'], df['lems']):
+        links.append(dedup.add(url or fp, lems.split()))
+    return links
+
+
+def _process_chunk(articles: List[Dict[str, Any]], dedup: NearDuplicateIndex | None = None) -> ExtractChunk:
+    """Dedupe, normalize and persist one chunk of fetched articles.
+
+    Only the fingerprints of rows that were stored are committed; rows
+    dropped during normalization (missing fields) are counted as
+    `dropped` and considered again by later runs.
     """
+    index = get_fingerprint_index()
+    new_articles, skipped = index.partition(articles)
+    if not new_articles:
+        return ExtractChunk(records=[], fetched=len(articles), new=0, skipped=skipped)
+
+    df = _normalize_frame(pd.DataFrame(new_articles))
+    dropped = len(new_articles) - len(df)
+    if df.empty:
+        return ExtractChunk(records=[], fetched=len(articles), new=0, skipped=skipped, dropped=dropped)
+    if dedup is not None:
+        df['duplicate_of'] = _mark_duplicates(df, dedup)
+    records = df.to_dict('records')
+    written = bulk_upsert("DailyNews", [_to_document(r) for r in records], key="fingerprint")
+    logger.debug("DailyNews write: %s", written.as_dict())
+    index.commit(records)
+    get_article_store().write("articles", df)
+    record_keywords(frame_documents(df))
+    return ExtractChunk(records=records, fetched=len(articles), new=len(records), skipped=skipped, dropped=dropped)
+
+
+def _extract_chunks(domains: List[str], from_date: str, chunk_size: int) -> Iterator[ExtractChunk]:
     settings = get_settings()
-    news_url = settings.url
-    api_key = settings.api_key
-    if not news_url or not api_key:
+    # One near-duplicate index per run so syndicated copies across domains cluster together
+    dedup = None
+    if settings.dedup_enabled:
+        dedup = NearDuplicateIndex(threshold=settings.dedup_threshold, num_perm=settings.dedup_num_perm)
+    for batch in _iter_domain_articles(domains, from_date):
+        for start in range(0, len(batch), chunk_size):
+            yield _process_chunk(batch[start:start + chunk_size], dedup)
+    logger.info("News API response cache: %s", get_news_fetcher().cache_stats())
+
+
+def iter_extract_chunks(
+    domains: List[str] | None = None,
+    from_date: str | None = None,
+    chunk_size: int | None = None,
+) -> Iterator[ExtractChunk]:
+    """Stream fetch → normalize → persist as a generator of chunks.
+
+    Each domain is split into chunks of at most `chunk_size` articles that
+    are written to `DailyNews` and the article store as soon as they are
+    processed, so memory stays bounded by one chunk and callers see the
+    first domains before the slowest one returns. Configuration is
+    validated eagerly, before the generator is returned.
+    """
+    settings = get_settings()
+    if not settings.url or not settings.api_key:
         raise ValueError("URL and API_KEY must be configured")
 
     if not from_date:
         from_date = (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
 
     domains = domains or settings.default_domains_list
+    chunk_size = max(1, chunk_size or settings.extract_chunk_size)
+    return _extract_chunks(domains, from_date, chunk_size)
 
-    frames: List[pd.DataFrame] = []
-    for domain in domains:
-        params = {
-            'domains': domain,
-            'sortBy': 'popularity',
-            'pageSize': 100,
-            'apiKey': api_key,
-            'language': 'en',
-            'from': from_date,
-        }
-        response = requests.get(news_url, params=params, timeout=30)
-        response.raise_for_status()
-        data = response.json()
-        items = data.get('articles', [])
-        frames.append(pd.DataFrame(_articles_from_api_response(items)))
-
-    df = pd.concat(frames, ignore_index=True)
-    df = _normalize_frame(df)
-
-    # Persist to db and csv
-    records = df.to_dict('records')
-    insert_many("DailyNews", records)
 
-    csv_dir = os.path.join('assets')
-    os.makedirs(csv_dir, exist_ok=True)
-    csv_path = os.path.join(csv_dir, f"{from_date}.csv")
-    df.to_csv(csv_path, index=False)
+def extract_articles(domains: List[str] | None = None, from_date: str | None = None) -> ExtractResult:
+    """Fetch news articles, preprocess text, persist, and return records.
 
-    return records
+    Domains are fetched concurrently (see `news_client.NewsFetcher`).
+    Articles whose fingerprint was already seen are skipped before
+    normalization. Persistence includes MongoDB `DailyNews` and the
+    date/source partitioned `articles` dataset of the columnar store.
+    """
+    result = ExtractResult(records=[], fetched=0, new=0, skipped=0)
+    for chunk in iter_extract_chunks(domains=domains, from_date=from_date):
+        result.records.extend(chunk.records)
+        result.fetched += chunk.fetched
+        result.new += chunk.new
+        result.skipped += chunk.skipped
+        result.dropped += chunk.dropped
+    return result
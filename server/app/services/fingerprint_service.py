@@ -0,0 +1,137 @@
+"""Article fingerprints for incremental extraction.
+
+An article is identified by its normalized URL plus a hash of its
+content, so re-fetching a popular story is a no-op while an edited
+version of it is treated as new. Fingerprints are persisted in Mongo
+under a unique index; an in-memory set in front of it answers repeat
+lookups without a round trip.
+"""
+from __future__ import annotations
+
+import hashlib
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Set, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from ..core.config import get_settings
+from .db import ensure_index, find_values, insert_unique
+
+_TRACKING_PARAMS = {"fbclid", "gclid", "ocid", "cmpid", "ref", "smid", "taid"}
+
+
+def normalize_url(url: str | None) -> str:
+    """Canonicalize a URL for identity comparisons.
+
+    Lowercases scheme and host, drops `www.`, fragments, tracking query
+    parameters and trailing slashes, and sorts the remaining query.
+    """
+    if not url:
+        return ""
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in _TRACKING_PARAMS
+    )
+    path = parts.path.rstrip("/")
+    return urlunsplit((parts.scheme.lower() or "https", host, path, urlencode(query), ""))
+
+
+def content_hash(record: Dict[str, Any]) -> str:
+    text = f"{record.get('title') or ''}\n{record.get('content') or ''}"
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def fingerprint(record: Dict[str, Any]) -> str:
+    """Return the identity of an article as a hex digest."""
+    key = f"{normalize_url(record.get('url'))}|{content_hash(record)}"
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+class FingerprintIndex:
+    """Tracks which articles have already been extracted.
+
+    Use `partition` to split a batch into unseen records and a skipped
+    count, then `commit` the new records once they are persisted so a
+    failed write does not mark them as seen.
+    """
+
+    def __init__(self, collection_name: str = "ArticleFingerprints", max_memory: int = 200_000) -> None:
+        self.collection_name = collection_name
+        self.max_memory = max_memory
+        self._seen: Set[str] = set()
+        self._lock = threading.Lock()
+        self._index_ready = False
+
+    def _ensure_index(self) -> None:
+        if not self._index_ready:
+            ensure_index(self.collection_name, [("fingerprint", 1)], unique=True)
+            self._index_ready = True
+
+    def _remember(self, fingerprints: Iterable[str]) -> None:
+        with self._lock:
+            if len(self._seen) > self.max_memory:
+                self._seen.clear()
+            self._seen.update(fingerprints)
+
+    def partition(self, records: Iterable[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], int]:
+        """Return `(new_records, skipped)` for a batch.
+
+        New records get a `fingerprint` field. Duplicates within the
+        batch itself are skipped as well.
+        """
+        records = list(records)
+        fps = [fingerprint(r) for r in records]
+        with self._lock:
+            unknown = {fp for fp in fps if fp not in self._seen}
+        if unknown:
+            self._ensure_index()
+            self._remember(find_values(self.collection_name, "fingerprint", unknown))
+
+        new: List[Dict[str, Any]] = []
+        batch: Set[str] = set()
+        with self._lock:
+            for record, fp in zip(records, fps):
+                if fp in self._seen or fp in batch:
+                    continue
+                batch.add(fp)
+                record["fingerprint"] = fp
+                new.append(record)
+        return new, len(records) - len(new)
+
+    def commit(self, records: Iterable[Dict[str, Any]]) -> int:
+        """Persist fingerprints of records that were stored successfully."""
+        now = datetime.utcnow()
+        docs = [
+            {
+                "fingerprint": r["fingerprint"],
+                "url_key": normalize_url(r.get("url")),
+                "content_hash": content_hash(r),
+                "first_seen": now,
+            }
+            for r in records
+            if r.get("fingerprint")
+        ]
+        if not docs:
+            return 0
+        self._ensure_index()
+        inserted = insert_unique(self.collection_name, docs)
+        self._remember(d["fingerprint"] for d in docs)
+        return inserted
+
+
+_index: FingerprintIndex | None = None
+_index_lock = threading.Lock()
+
+
+def get_fingerprint_index() -> FingerprintIndex:
+    """Return the process-wide fingerprint index."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = FingerprintIndex(max_memory=get_settings().fingerprint_memory_size)
+    return _index
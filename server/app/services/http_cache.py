@@ -0,0 +1,188 @@
+"""On-disk cache for News API responses.
+
+Entries are keyed on the request URL and parameters (minus the API key),
+stored as gzip-compressed bodies next to a small JSON metadata file, and
+served directly while younger than the TTL. Stale entries are revalidated
+with `If-None-Match` / `If-Modified-Since`, so an unchanged result costs a
+304 instead of a full body. Total size is capped with least-recently-used
+eviction.
+"""
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+_SECRET_PARAMS = {"apikey", "api_key"}
+
+
+def redact_url(url: str) -> str:
+    """`url` without API key query parameters, safe to persist or log."""
+    parts = urlsplit(url or "")
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k.lower() not in _SECRET_PARAMS]
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+class ResponseCache:
+    """TTL + revalidation cache for GET requests, backed by a directory."""
+
+    def __init__(self, directory: str, ttl: float = 600, max_bytes: int = 50 * 1024 * 1024) -> None:
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "revalidated": 0, "stores": 0, "evictions": 0}
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(url: str, params: Dict[str, Any]) -> str:
+        items = sorted((k, str(v)) for k, v in params.items() if k.lower() not in _SECRET_PARAMS)
+        raw = json.dumps([url, items], separators=(",", ":"))
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _paths(self, key: str):
+        base = os.path.join(self.directory, key)
+        return f"{base}.json", f"{base}.body.gz"
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+        lookups = stats["hits"] + stats["revalidated"] + stats["misses"]
+        stats["hit_ratio"] = (stats["hits"] + stats["revalidated"]) / lookups if lookups else 0.0
+        return stats
+
+    def _load(self, key: str) -> Optional[Dict[str, Any]]:
+        meta_path, _ = self._paths(key)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _read_body(self, key: str) -> Optional[bytes]:
+        _, body_path = self._paths(key)
+        try:
+            with gzip.open(body_path, "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _write_meta(self, key: str, meta: Dict[str, Any]) -> None:
+        meta_path, _ = self._paths(key)
+        tmp = f"{meta_path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp, meta_path)
+
+    def _store(self, key: str, response: requests.Response) -> None:
+        _, body_path = self._paths(key)
+        tmp = f"{body_path}.tmp"
+        with gzip.open(tmp, "wb", compresslevel=6) as f:
+            f.write(response.content)
+        os.replace(tmp, body_path)
+        self._write_meta(key, {
+            "url": redact_url(response.url),
+            "status": response.status_code,
+            "content_type": response.headers.get("Content-Type"),
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "stored_at": time.time(),
+            "size": os.path.getsize(body_path),
+        })
+        self._count("stores")
+        self._evict()
+
+    def _evict(self) -> None:
+        """Drop least-recently-used entries until under `max_bytes`.
+
+        Recency is the metadata file's mtime, which is touched on every hit.
+        """
+        entries = []
+        total = 0
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json"):
+                continue
+            key = name[:-5]
+            meta_path, body_path = self._paths(key)
+            try:
+                size = os.path.getsize(body_path) + os.path.getsize(meta_path)
+                entries.append((os.path.getmtime(meta_path), key, size))
+            except OSError:
+                continue
+            total += size
+        entries.sort()
+        for _mtime, key, size in entries:
+            if total <= self.max_bytes:
+                break
+            for path in self._paths(key):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            total -= size
+            self._count("evictions")
+
+    def _response(self, meta: Dict[str, Any], body: bytes) -> requests.Response:
+        response = requests.Response()
+        response.status_code = meta.get("status", 200)
+        response._content = body
+        response.url = meta.get("url") or ""
+        response.encoding = "utf-8"
+        if meta.get("content_type"):
+            response.headers["Content-Type"] = meta["content_type"]
+        response.headers["X-Cache"] = "HIT"
+        return response
+
+    def get(
+        self,
+        session: requests.Session,
+        url: str,
+        params: Dict[str, Any],
+        timeout: float = 30,
+    ) -> requests.Response:
+        """Serve from cache when fresh, otherwise fetch or revalidate."""
+        key = self.key(url, params)
+        meta = self._load(key)
+        body = self._read_body(key) if meta else None
+        meta_path, _ = self._paths(key)
+
+        if meta and body is not None and time.time() - meta.get("stored_at", 0) < self.ttl:
+            self._count("hits")
+            os.utime(meta_path)
+            return self._response(meta, body)
+
+        headers: Dict[str, str] = {}
+        if meta and body is not None:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+
+        response = session.get(url, params=params, headers=headers, timeout=timeout)
+        if response.status_code == 304 and meta and body is not None:
+            self._count("revalidated")
+            meta["stored_at"] = time.time()
+            self._write_meta(key, meta)
+            return self._response(meta, body)
+
+        self._count("misses")
+        if response.status_code == 200:
+            try:
+                self._store(key, response)
+            except OSError:
+                logger.exception("Failed to store cached response for %s", url)
+        return response
@@ -0,0 +1,267 @@
+"""Background jobs for long-running requests.
+
+A job runs a generator of result chunks on a small thread pool. After
+each chunk, the job's progress and partial results are updated, so
+clients can poll them while the work continues. Finished jobs are kept
+for `settings.job_result_ttl` seconds and then dropped.
+
+A job runs in the process that accepted it. With a `collection` (the
+default, `Jobs` in the storage backend, next to `DataVersions`), its
+state and partial results are also written there after every chunk, so
+any worker behind a load balancer can answer `/jobs/<id>`. Without one,
+jobs are visible only to the accepting process, which is fine for a
+single worker.
+"""
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+from pymongo.errors import PyMongoError
+
+from ..core.config import get_settings
+from .db import ensure_index, get_collection
+
+logger = logging.getLogger(__name__)
+
+# A job body yields lists of per-item results; the generator's return
+# value becomes the job's final result.
+JobBody = Callable[[], Iterator[List[Dict[str, Any]]]]
+
+JOB_COLLECTION = "Jobs"
+# Job fields persisted to the job collection (items are stored separately)
+_STATE_FIELDS = ("kind", "total", "status", "processed", "result", "error", "created_at", "started_at", "finished_at")
+
+
+@dataclass
+class Job:
+    id: str
+    kind: str
+    total: int
+    status: str = "queued"
+    processed: int = 0
+    items: List[Dict[str, Any]] = field(default_factory=list)
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("done", "failed")
+
+    def state(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in _STATE_FIELDS}
+
+    @classmethod
+    def from_state(cls, doc: Dict[str, Any]) -> "Job":
+        return cls(id=doc["_id"], **{name: doc.get(name) for name in _STATE_FIELDS})
+
+    def snapshot(self, offset: int = 0, limit: Optional[int] = None) -> Dict[str, Any]:
+        """JSON-ready view with a window of the partial results."""
+        end = None if limit is None else offset + limit
+        return self.view(self.items[offset:end], offset)
+
+    def view(self, items: List[Dict[str, Any]], offset: int = 0) -> Dict[str, Any]:
+        """JSON-ready view with `items` as the window starting at `offset`."""
+        view: Dict[str, Any] = {
+            "id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "total": self.total,
+            "processed": self.processed,
+            "progress": round(self.processed / self.total, 4) if self.total else 1.0,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "offset": offset,
+            "items": items,
+        }
+        if self.error:
+            view["error"] = self.error
+        if self.result is not None:
+            view["result"] = self.result
+        return view
+
+
+class JobManager:
+    """Runs jobs on a thread pool and expires finished ones after a TTL.
+
+    Args:
+        max_workers: Jobs run concurrently by this process.
+        ttl: Seconds finished jobs are kept.
+        collection: Collection sharing job state across processes; its
+            partial results go to `<collection>Items`. None keeps jobs in
+            this process only.
+    """
+
+    def __init__(self, max_workers: int = 2, ttl: float = 3600, collection: Optional[str] = None) -> None:
+        self.max_workers = max_workers
+        self.ttl = ttl
+        self.collection = collection
+        self.items_collection = f"{collection}Items" if collection else None
+        self._indexes_ready = False
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_pid: Optional[int] = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # Pool threads do not survive a fork; start a fresh pool per process.
+        if self._executor is None or self._executor_pid != os.getpid():
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="job")
+            self._executor_pid = os.getpid()
+        return self._executor
+
+    def _purge(self, now: float) -> None:
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished and job.finished_at is not None and now - job.finished_at > self.ttl
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def _ensure_indexes(self) -> None:
+        if not self._indexes_ready:
+            ensure_index(self.items_collection, [("job_id", 1), ("n", 1)], unique=True)
+            ensure_index(self.collection, [("finished_at", 1)])
+            self._indexes_ready = True
+
+    def _delete_stored(self, job_ids: List[str]) -> None:
+        get_collection(self.items_collection).delete_many({"job_id": {"$in": job_ids}})
+        get_collection(self.collection).delete_many({"_id": {"$in": job_ids}})
+
+    def _purge_stored(self, now: float) -> None:
+        stale = get_collection(self.collection).find({"finished_at": {"$lt": now - self.ttl}}, {"_id": 1})
+        expired = [doc["_id"] for doc in stale]
+        if expired:
+            self._delete_stored(expired)
+
+    def _save(
+        self, job: Job, items: Sequence[Dict[str, Any]] = (), offset: int = 0, status: Optional[str] = None
+    ) -> None:
+        """Write the job's state (with `status`, if given), and a chunk of results first at `offset`."""
+        if self.collection is None:
+            return
+        try:
+            self._ensure_indexes()
+            if items:
+                # Items before the processed count, so readers never see a count ahead of its items
+                get_collection(self.items_collection).insert_many(
+                    [{"job_id": job.id, "n": offset + i, "item": item} for i, item in enumerate(items)]
+                )
+            state = job.state()
+            if status is not None:
+                state["status"] = status
+            get_collection(self.collection).update_one({"_id": job.id}, {"$set": state}, upsert=True)
+        except PyMongoError:
+            logger.exception("Failed to store state of job %s", job.id)
+
+    def submit(self, kind: str, total: int, body: JobBody) -> Job:
+        """Queue `body` and return its job immediately."""
+        job = Job(id=uuid.uuid4().hex, kind=kind, total=total)
+        now = time.time()
+        if self.collection is not None:
+            self._ensure_indexes()
+            self._purge_stored(now)
+            # Stored before the 202 goes out, so any worker can serve the first poll
+            get_collection(self.collection).insert_one({"_id": job.id, **job.state()})
+        with self._lock:
+            self._purge(now)
+            self._jobs[job.id] = job
+            self._get_executor().submit(self._run, job, body)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """A job run by this process."""
+        with self._lock:
+            self._purge(time.time())
+            return self._jobs.get(job_id)
+
+    def view(self, job_id: str, offset: int = 0, limit: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """Status and a window of results of a job run by any process.
+
+        Returns:
+            The job's view, or None when it is unknown or expired.
+        """
+        job = self.get(job_id)
+        if job is not None:
+            return job.snapshot(offset=offset, limit=limit)
+        if self.collection is None:
+            return None
+        doc = get_collection(self.collection).find_one({"_id": job_id})
+        if doc is None:
+            return None
+        job = Job.from_state(doc)
+        if job.finished and job.finished_at is not None and time.time() - job.finished_at > self.ttl:
+            self._delete_stored([job_id])
+            return None
+        window: Dict[str, Any] = {"$gte": offset}
+        if limit is not None:
+            window["$lt"] = offset + limit
+        cursor = get_collection(self.items_collection).find({"job_id": job_id, "n": window}, {"_id": 0, "item": 1})
+        return job.view([doc["item"] for doc in cursor.sort("n", 1)], offset)
+
+    def _run(self, job: Job, body: JobBody) -> None:
+        job.started_at = time.time()
+        job.status = "running"
+        self._save(job)
+        status = "failed"
+        try:
+            chunks = body()
+            while True:
+                try:
+                    items = next(chunks)
+                except StopIteration as stop:
+                    job.result = stop.value
+                    break
+                offset = len(job.items)
+                job.items.extend(items)
+                job.processed += len(items)
+                self._save(job, items, offset)
+            status = "done"
+        except Exception as exc:  # noqa: BLE001
+            logger.exception("Job %s (%s) failed", job.id, job.kind)
+            job.error = str(exc)
+        finally:
+            job.finished_at = time.time()
+            # Stored before the job looks finished here, so a finished job is never behind in the store
+            self._save(job, status=status)
+            job.status = status
+
+    def shutdown(self) -> None:
+        if self._executor is not None and self._executor_pid == os.getpid():
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_manager: Optional[JobManager] = None
+_manager_lock = threading.Lock()
+
+
+def get_job_manager() -> JobManager:
+    """Return the process-wide job manager."""
+    global _manager
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                settings = get_settings()
+                _manager = JobManager(
+                    max_workers=settings.job_workers,
+                    ttl=settings.job_result_ttl,
+                    collection=JOB_COLLECTION if settings.job_shared_state else None,
+                )
+    return _manager
+
+
+@atexit.register
+def _shutdown_job_manager() -> None:
+    if _manager is not None:
+        _manager.shutdown()
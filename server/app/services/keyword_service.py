@@ -0,0 +1,386 @@
+"""Incremental TF-IDF keywords over the extracted corpus.
+
+Extraction already produces stopword-free lemmas for every article, so
+the index reuses them. It never re-tokenizes stored text. For each new
+article it updates:
+
+* the global document frequency of every term (for IDF),
+* the term counts of the article's `(day, source)` cell.
+
+Articles posted to /analyze are counted as well, unless they were
+already extracted or analyzed.
+
+Counts live in the storage backend, so every worker and the extraction
+job add to the same totals. `record_keywords` folds a batch of articles
+into one `KeywordCells` document per `(day, source)` and into the
+corpus totals in `KeywordTotals`, each with a single atomic `$inc`, then
+bumps the shared `KeywordCells` data version.
+
+Each process keeps a `KeywordIndex` for queries. When the data version
+changes it re-reads the cells written since its last sync and keeps the
+top `settings.keyword_sketch_capacity` terms of each one in a
+space-saving sketch. Queries merge the cells in scope (one day, a date
+range, a source, or everything) and rank terms by `tf * idf` with a
+heap. Their cost depends on the number of cells in scope, not on the
+number of articles, and the memory of each cell is bounded. The counts
+are backfilled or rebuilt from the columnar store by running::
+
+    python -m app.services.keyword_service
+"""
+from __future__ import annotations
+
+import heapq
+import logging
+import math
+import threading
+import time
+from collections import Counter
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import pandas as pd
+from pymongo import UpdateOne
+
+from ..core.config import get_settings
+from .db import ensure_index, get_collection
+from .keyword_sketch import SpaceSaving
+from .lemma_table import get_lemma_table
+from .nltk_resources import get_stopwords
+from .payload_cache import bump_data_version, get_data_version
+from .text_normalizer import normalize_text
+
+logger = logging.getLogger(__name__)
+
+KEYWORD_COLLECTION = "KeywordCells"
+TOTALS_COLLECTION = "KeywordTotals"
+GRANULARITIES = ("day", "week", "month")
+
+Cell = Tuple[str, str]
+# Seconds of overlap between syncs, covering writes that land after the
+# timestamp they carry; re-reading a cell is harmless since it holds totals
+SYNC_OVERLAP = 60.0
+
+
+def _day(value: Any) -> str:
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    parsed = pd.to_datetime(value, errors="coerce", utc=True) if value is not None else None
+    return "unknown" if parsed is None or pd.isna(parsed) else parsed.date().isoformat()
+
+
+def _source(value: Any) -> str:
+    if isinstance(value, dict):
+        value = value.get("name")
+    return value if isinstance(value, str) and value else "unknown"
+
+
+def _period(day: str, granularity: str) -> str:
+    """First day of the `day`/`week` (Monday)/`month` containing `day`."""
+    start = date.fromisoformat(day)
+    if granularity == "week":
+        start -= timedelta(days=start.weekday())
+    elif granularity == "month":
+        start = start.replace(day=1)
+    return start.isoformat()
+
+
+def text_terms(text: str) -> List[str]:
+    """Terms of a raw text, produced the same way extraction produces `lems`."""
+    stop_words = get_stopwords()
+    return get_lemma_table().lemmatize_tokens(t for t in normalize_text(text or "").split() if t not in stop_words)
+
+
+class KeywordIndex:
+    """Document frequencies plus per-(day, source) term count sketches.
+
+    Args:
+        capacity: Terms kept per `(day, source)` cell.
+    """
+
+    def __init__(self, capacity: int = 2000) -> None:
+        self.capacity = capacity
+        self.documents = 0
+        self.df: Counter = Counter()
+        self.cells: Dict[Cell, SpaceSaving] = {}
+        self.cell_documents: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def add(self, terms: Sequence[str], day: Any = None, source: Any = None) -> None:
+        """Count one document's terms."""
+        if not terms:
+            return
+        cell = (_day(day), _source(source))
+        with self._lock:
+            self.documents += 1
+            self.df.update(set(terms))
+            self.cells.setdefault(cell, SpaceSaving(self.capacity)).update(Counter(terms))
+            self.cell_documents[cell] += 1
+
+    def add_frame(self, df: pd.DataFrame) -> int:
+        """Count the articles of an extracted frame; near-duplicates are skipped."""
+        added = 0
+        for terms, day, source in frame_documents(df):
+            self.add(terms, day, source)
+            added += 1
+        return added
+
+    def replace_cell(self, cell: Cell, counts: Dict[str, int], documents: int) -> None:
+        """Set a cell to stored totals, keeping its `capacity` most frequent terms."""
+        sketch = SpaceSaving(self.capacity)
+        sketch.update(dict(Counter(counts).most_common(self.capacity)))
+        sketch.total = sum(counts.values())
+        with self._lock:
+            self.cells[cell] = sketch
+            self.cell_documents[cell] = documents
+
+    def idf(self, term: str) -> float:
+        """Smoothed inverse document frequency."""
+        return math.log((1 + self.documents) / (1 + self.df.get(term, 0))) + 1.0
+
+    def _rank(self, counts: Dict[str, float], top_k: int) -> List[Tuple[str, float]]:
+        idf = self.idf
+        return heapq.nlargest(top_k, ((t, c * idf(t)) for t, c in counts.items()), key=lambda item: item[1])
+
+    def _select(
+        self, start: Optional[str], end: Optional[str], sources: Optional[Iterable[str]]
+    ) -> List[Tuple[str, SpaceSaving]]:
+        """`(day, sketch)` of the cells in scope; call with the lock held."""
+        wanted = set(sources) if sources else None
+        return [
+            (cell_day, sketch) for (cell_day, cell_source), sketch in self.cells.items()
+            if (not start or cell_day >= start)
+            and (not end or cell_day <= end)
+            and (wanted is None or cell_source in wanted)
+        ]
+
+    def top_keywords(
+        self,
+        top_k: int = 20,
+        day: Optional[str] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        sources: Optional[Iterable[str]] = None,
+    ) -> List[Tuple[str, float]]:
+        """Highest TF-IDF terms in a scope.
+
+        Args:
+            top_k: Number of terms to return.
+            day: Only this day (YYYY-MM-DD); overrides `start`/`end`.
+            start: Inclusive first day.
+            end: Inclusive last day.
+            sources: Only these sources.
+
+        Returns:
+            `(term, score)` pairs, best first.
+        """
+        if day:
+            start = end = day
+        with self._lock:
+            selected = self._select(start, end, sources)
+            if len(selected) == 1:
+                return self._rank(selected[0][1].counts, top_k)
+            totals: Counter = Counter()
+            for _, sketch in selected:
+                totals.update(sketch.counts)
+            return self._rank(totals, top_k)
+
+    def keyword_series(
+        self,
+        top_k: int = 5,
+        granularity: str = "day",
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        sources: Optional[Iterable[str]] = None,
+        max_points: Optional[int] = None,
+    ) -> List[Tuple[str, List[Tuple[str, float]]]]:
+        """Highest TF-IDF terms of each period in a scope.
+
+        Articles without a usable date are left out. When there are more
+        than `max_points` periods, runs of `ceil(n / max_points)` adjacent
+        periods are merged and labelled with the first one.
+
+        Returns:
+            `(period_start, [(term, score), ...])` pairs in date order.
+        """
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"granularity must be one of: {', '.join(GRANULARITIES)}")
+        with self._lock:
+            periods: Dict[str, Counter] = {}
+            for cell_day, sketch in self._select(start, end, sources):
+                if cell_day != "unknown":
+                    periods.setdefault(_period(cell_day, granularity), Counter()).update(sketch.counts)
+            ordered = sorted(periods)
+            step = max(1, math.ceil(len(ordered) / max_points)) if max_points else 1
+            series = []
+            for first in range(0, len(ordered), step):
+                totals: Counter = Counter()
+                for period in ordered[first:first + step]:
+                    totals.update(periods[period])
+                series.append((ordered[first], self._rank(totals, top_k)))
+            return series
+
+    def rank_texts(self, texts: Iterable[str], top_k: int = 20) -> List[Tuple[str, float]]:
+        """Rank the terms of ad hoc texts against the corpus IDF."""
+        counts: Counter = Counter()
+        for text in texts:
+            counts.update(text_terms(text))
+        with self._lock:
+            return self._rank(counts, top_k)
+
+
+def frame_documents(df: pd.DataFrame) -> Iterator[Tuple[List[str], Any, Any]]:
+    """`(terms, pub_date, source)` of each article of an extracted frame.
+
+    Near-duplicates and articles without lemmas are skipped.
+    """
+    if df.empty or "lems" not in df:
+        return
+    days = df["pub_date"] if "pub_date" in df else [None] * len(df)
+    sources = df["source"] if "source" in df else [None] * len(df)
+    duplicates = df["duplicate_of"] if "duplicate_of" in df else [None] * len(df)
+    for lems, day, source, duplicate_of in zip(df["lems"], days, sources, duplicates):
+        if isinstance(duplicate_of, str) and duplicate_of:
+            continue
+        if isinstance(lems, str) and lems:
+            yield lems.split(), day, source
+
+
+def _storable(term: str) -> bool:
+    # Terms become field names of the stored documents
+    return bool(term) and "." not in term and not term.startswith("$")
+
+
+_indexes_ready = False
+_indexes_lock = threading.Lock()
+
+
+def ensure_keyword_indexes() -> None:
+    """Unique `(day, source)` and `updated_at` indexes, once per process."""
+    global _indexes_ready
+    if _indexes_ready:
+        return
+    with _indexes_lock:
+        if not _indexes_ready:
+            ensure_index(KEYWORD_COLLECTION, [("day", 1), ("source", 1)], unique=True)
+            ensure_index(KEYWORD_COLLECTION, [("updated_at", 1)])
+            _indexes_ready = True
+
+
+def record_keywords(documents: Iterable[Tuple[Sequence[str], Any, Any]]) -> int:
+    """Add articles to the shared keyword counts.
+
+    Args:
+        documents: `(terms, pub_date, source)` of each article.
+
+    Returns:
+        Number of articles counted.
+    """
+    cells: Dict[Cell, Counter] = {}
+    cell_documents: Counter = Counter()
+    df: Counter = Counter()
+    counted = 0
+    for terms, day, source in documents:
+        terms = [t for t in terms if _storable(t)]
+        if not terms:
+            continue
+        cell = (_day(day), _source(source))
+        cells.setdefault(cell, Counter()).update(terms)
+        cell_documents[cell] += 1
+        df.update(set(terms))
+        counted += 1
+    if not counted:
+        return 0
+    now = time.time()
+    ensure_keyword_indexes()
+    try:
+        get_collection(KEYWORD_COLLECTION).bulk_write([
+            UpdateOne(
+                {"day": day, "source": source},
+                {
+                    "$inc": {"documents": cell_documents[(day, source)], **{f"terms.{t}": n for t, n in counts.items()}},
+                    "$max": {"updated_at": now},
+                },
+                upsert=True,
+            )
+            for (day, source), counts in cells.items()
+        ], ordered=False)
+        get_collection(TOTALS_COLLECTION).update_one(
+            {"_id": "corpus"},
+            {"$inc": {"documents": counted, **{f"df.{t}": n for t, n in df.items()}}},
+            upsert=True,
+        )
+    finally:
+        bump_data_version(KEYWORD_COLLECTION)
+    return counted
+
+
+def sync_keyword_index(index: "KeywordIndex", since: Optional[float] = None) -> None:
+    """Load the shared counts into `index`.
+
+    Args:
+        index: Index to update in place.
+        since: Only re-read cells written at or after this UNIX time.
+    """
+    query = {"updated_at": {"$gte": since}} if since is not None else {}
+    for doc in get_collection(KEYWORD_COLLECTION).find(query, {"_id": 0, "day": 1, "source": 1, "terms": 1, "documents": 1}):
+        index.replace_cell((doc["day"], doc["source"]), doc.get("terms") or {}, int(doc.get("documents", 0)))
+    totals = get_collection(TOTALS_COLLECTION).find_one({"_id": "corpus"}) or {}
+    df = Counter(totals.get("df") or {})
+    with index._lock:
+        index.documents = int(totals.get("documents", 0))
+        index.df = df
+
+
+def rebuild_keywords() -> int:
+    """Recount the shared keyword counts from the `articles` dataset of the columnar store.
+
+    Writes that land during the rebuild may be lost or counted twice, so
+    run it while writers are paused.
+
+    Returns:
+        Number of articles counted.
+    """
+    from .article_store import get_article_store
+
+    get_collection(KEYWORD_COLLECTION).delete_many({})
+    get_collection(TOTALS_COLLECTION).delete_many({})
+    counted = 0
+    for frame in get_article_store().iter_batches("articles", columns=["lems", "pub_date", "source", "duplicate_of"]):
+        counted += record_keywords(frame_documents(frame))
+    return counted
+
+
+_index: Optional[KeywordIndex] = None
+_index_version: Optional[int] = None
+_synced_at: Optional[float] = None
+_index_lock = threading.Lock()
+
+
+def get_keyword_index() -> KeywordIndex:
+    """Return the process-wide index, synced with the shared counts.
+
+    Only cells written since the last sync are re-read, and only when the
+    shared `KeywordCells` version has changed.
+    """
+    global _index, _index_version, _synced_at
+    version = get_data_version(KEYWORD_COLLECTION)
+    if _index is None or version != _index_version:
+        with _index_lock:
+            if _index is None:
+                _index = KeywordIndex(get_settings().keyword_sketch_capacity)
+                _index_version = _synced_at = None
+            if version != _index_version:
+                started = time.time()
+                since = _synced_at - SYNC_OVERLAP if _synced_at is not None else None
+                sync_keyword_index(_index, since)
+                if _synced_at is None and not _index.documents:
+                    logger.info("No keyword counts yet (backfill with `python -m app.services.keyword_service`)")
+                _index_version, _synced_at = version, started
+    return _index
+
+
+if __name__ == "__main__":  # pragma: no cover
+    total = rebuild_keywords()
+    print(f"Counted keywords of {total} articles into {KEYWORD_COLLECTION}")
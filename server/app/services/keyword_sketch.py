@@ -0,0 +1,86 @@
+"""Bounded term counters (space-saving sketches).
+
+A `SpaceSaving` sketch keeps at most `capacity` terms. When a new term
+arrives and the sketch is full, it takes over the slot of the currently
+least frequent term and inherits that term's count as its error. Stored
+counts therefore never underestimate, and they overestimate by at most
+`total / capacity`. Any term occurring more often than that is
+guaranteed to be kept.
+
+Sketches over disjoint slices of a corpus (e.g. one per day and source)
+are merged by summing their counts. Top terms of a merged range are
+accurate for the heavy hitters that matter to a keyword chart, while
+memory per slice stays fixed however many articles it covers.
+"""
+from __future__ import annotations
+
+import heapq
+from typing import Any, Dict, Iterator, List, Mapping, Tuple
+
+
+class SpaceSaving:
+    """Approximate term counts in at most `capacity` slots.
+
+    Args:
+        capacity: Maximum number of terms tracked.
+    """
+
+    def __init__(self, capacity: int = 2000) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self.counts: Dict[str, int] = {}
+        self.errors: Dict[str, int] = {}
+        self.total = 0
+        # Lazy min-heap of (count, term); entries go stale as counts grow
+        self._heap: List[Tuple[int, str]] = []
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.counts)
+
+    def _pop_min(self) -> Tuple[str, int]:
+        while True:
+            count, term = heapq.heappop(self._heap)
+            if self.counts.get(term) == count:
+                return term, count
+
+    def _compact(self) -> None:
+        self._heap = [(count, term) for term, count in self.counts.items()]
+        heapq.heapify(self._heap)
+
+    def update(self, counts: Mapping[str, int]) -> None:
+        """Add term occurrences, e.g. the `Counter` of one document."""
+        for term, weight in counts.items():
+            if weight <= 0:
+                continue
+            self.total += weight
+            if term in self.counts:
+                self.counts[term] += weight
+            elif len(self.counts) < self.capacity:
+                self.counts[term] = weight
+                self.errors[term] = 0
+            else:
+                evicted, floor = self._pop_min()
+                del self.counts[evicted]
+                del self.errors[evicted]
+                self.counts[term] = floor + weight
+                self.errors[term] = floor
+            heapq.heappush(self._heap, (self.counts[term], term))
+        if len(self._heap) > 4 * self.capacity:
+            self._compact()
+
+    def top(self, k: int) -> List[Tuple[str, int]]:
+        """The `k` terms with the highest estimated counts."""
+        return heapq.nlargest(k, self.counts.items(), key=lambda item: item[1])
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        state["_heap"] = []
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._compact()
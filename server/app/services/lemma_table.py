@@ -0,0 +1,185 @@
+"""Compact noun lemma lookup compiled from WordNet.
+
+`WordNetLemmatizer.lemmatize(word)` (noun POS, as used by the pipeline)
+only needs three things from WordNet: the noun exception list, the set of
+noun lemmas, and the morphological substitution rules. This module
+compiles those into a small pickled artifact that loads in milliseconds,
+instead of initialising the full WordNet corpus reader in every worker.
+
+Build the artifact once with::
+
+    python -m app.services.lemma_table [output_path]
+"""
+from __future__ import annotations
+
+import logging
+import os
+import pickle
+import sys
+import threading
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+import nltk
+
+from ..core.config import get_settings
+from .nltk_resources import find
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_VERSION = 1
+
+# Mirrors WordNetCorpusReader.MORPHOLOGICAL_SUBSTITUTIONS[NOUN].
+NOUN_RULES: Tuple[Tuple[str, str], ...] = (
+    ("s", ""),
+    ("ses", "s"),
+    ("ves", "f"),
+    ("xes", "x"),
+    ("zes", "z"),
+    ("ches", "ch"),
+    ("shes", "sh"),
+    ("men", "man"),
+    ("ies", "y"),
+)
+
+
+def _shortest(word: str, forms: Iterable[str], lemmas: FrozenSet[str]) -> str:
+    """Replicate `_morphy` filtering followed by `min(..., key=len)`."""
+    best: Optional[str] = None
+    for form in (word, *forms):
+        if form in lemmas and (best is None or len(form) < len(best)):
+            best = form
+    return best if best is not None else word
+
+
+def _apply_rules(word: str, rules: Tuple[Tuple[str, str], ...]) -> List[str]:
+    return [word[: -len(old)] + new for old, new in rules if word.endswith(old)]
+
+
+class LemmaTable:
+    """Dictionary-backed noun lemmatizer with WordNet-identical output.
+
+    `surface` maps every exception form, and every noun lemma whose
+    lemmatization differs from itself, to its lemma. Other known lemmas
+    map to themselves. Unknown tokens fall back to the substitution rules
+    through a bounded in-process memo.
+    """
+
+    def __init__(
+        self,
+        surface: Dict[str, str],
+        lemmas: FrozenSet[str],
+        rules: Tuple[Tuple[str, str], ...] = NOUN_RULES,
+        memo_size: int = 65536,
+    ) -> None:
+        self.surface = surface
+        self.lemmas = lemmas
+        self.rules = rules
+        self._fallback = lru_cache(maxsize=memo_size)(self._morphy)
+
+    def _morphy(self, word: str) -> str:
+        return _shortest(word, _apply_rules(word, self.rules), self.lemmas)
+
+    def lemmatize(self, word: str) -> str:
+        lemma = self.surface.get(word)
+        if lemma is not None:
+            return lemma
+        if word in self.lemmas:
+            return word
+        return self._fallback(word)
+
+    def lemmatize_tokens(self, tokens: Iterable[str]) -> List[str]:
+        return [self.lemmatize(token) for token in tokens]
+
+    def memo_info(self):
+        """Hit/miss statistics of the fallback memo."""
+        return self._fallback.cache_info()
+
+    def save(self, path: str) -> str:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        payload = {
+            "version": ARTIFACT_VERSION,
+            "surface": self.surface,
+            "lemmas": self.lemmas,
+            "rules": self.rules,
+        }
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        return path
+
+
+def _read_wordnet_file(name: str) -> List[str]:
+    find("wordnet")
+    pointer = nltk.data.find(f"corpora/wordnet/{name}")
+    with pointer.open(encoding="utf8") as fp:
+        return fp.read().splitlines()
+
+
+def build_lemma_table(memo_size: int = 65536) -> LemmaTable:
+    """Compile a `LemmaTable` from the installed WordNet corpus files."""
+    lemmas = set()
+    for line in _read_wordnet_file("index.noun"):
+        if not line or line.startswith(" "):
+            continue
+        lemmas.add(sys.intern(line.split(" ", 1)[0]))
+    frozen = frozenset(lemmas)
+
+    surface: Dict[str, str] = {}
+    for line in _read_wordnet_file("noun.exc"):
+        terms = line.split()
+        if not terms:
+            continue
+        word = sys.intern(terms[0])
+        surface[word] = sys.intern(_shortest(word, terms[1:], frozen))
+
+    for word in frozen:
+        if word in surface:
+            continue
+        lemma = _shortest(word, _apply_rules(word, NOUN_RULES), frozen)
+        if lemma != word:
+            surface[word] = lemma
+
+    return LemmaTable(surface, frozen, NOUN_RULES, memo_size=memo_size)
+
+
+def load_lemma_table(path: str, memo_size: int = 65536) -> LemmaTable:
+    with open(path, "rb") as f:
+        payload = pickle.load(f)
+    if payload.get("version") != ARTIFACT_VERSION:
+        raise ValueError(f"Unsupported lemma table version in {path}")
+    return LemmaTable(payload["surface"], payload["lemmas"], tuple(payload["rules"]), memo_size=memo_size)
+
+
+_table: Optional[LemmaTable] = None
+_table_lock = threading.Lock()
+
+
+def get_lemma_table() -> LemmaTable:
+    """Return the process-wide table, loading the artifact on first use.
+
+    Falls back to compiling from WordNet when the artifact has not been
+    built yet.
+    """
+    global _table
+    if _table is None:
+        with _table_lock:
+            if _table is None:
+                settings = get_settings()
+                path = settings.lemma_table_path
+                if os.path.isfile(path):
+                    _table = load_lemma_table(path, memo_size=settings.lemma_memo_size)
+                else:
+                    logger.warning("Lemma table %s not found; compiling from WordNet", path)
+                    _table = build_lemma_table(memo_size=settings.lemma_memo_size)
+    return _table
+
+
+if __name__ == "__main__":  # pragma: no cover
+    output = sys.argv[1] if len(sys.argv) > 1 else get_settings().lemma_table_path
+    table = build_lemma_table()
+    table.save(output)
+    print(f"Wrote {len(table.surface)} surface forms and {len(table.lemmas)} lemmas to {output}")
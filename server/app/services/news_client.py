@@ -0,0 +1,149 @@
+"""Concurrent News API client with pooled keep-alive connections."""
+from __future__ import annotations
+
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from ..core.config import get_settings
+from .http_cache import ResponseCache
+
+logger = logging.getLogger(__name__)
+
+
+class NewsFetcher:
+    """Fetch articles for many domains concurrently over one shared session.
+
+    Every request goes through a single `requests.Session` so TCP/TLS
+    connections are kept alive and reused. All requests go to the one API
+    host, so `max_workers` is also the cap on requests in flight against
+    it. An optional `ResponseCache` serves repeated requests from disk.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        api_key: str,
+        max_workers: int = 8,
+        page_size: int = 100,
+        max_pages: int = 5,
+        timeout: float = 30,
+        cache: Optional[ResponseCache] = None,
+    ) -> None:
+        self.url = url
+        self.api_key = api_key
+        self.max_workers = max(1, max_workers)
+        self.page_size = page_size
+        self.max_pages = max(1, max_pages)
+        self.timeout = timeout
+        self.cache = cache
+
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.max_workers, pool_maxsize=self.max_workers)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+    def _get(self, params: Dict[str, Any]) -> requests.Response:
+        if self.cache is not None:
+            return self.cache.get(self._session, self.url, params, timeout=self.timeout)
+        return self._session.get(self.url, params=params, timeout=self.timeout)
+
+    def fetch_domain(self, domain: str, from_date: str) -> List[Dict[str, Any]]:
+        """Fetch every page of results for a single domain.
+
+        Pagination stops when a page comes back short, `totalResults` is
+        reached, or `max_pages` is hit. Errors on the first page are raised;
+        errors on later pages (e.g. plan result limits) end pagination and
+        keep what was already fetched.
+        """
+        items: List[Dict[str, Any]] = []
+        for page in range(1, self.max_pages + 1):
+            params = {
+                'domains': domain,
+                'sortBy': 'popularity',
+                'pageSize': self.page_size,
+                'page': page,
+                'apiKey': self.api_key,
+                'language': 'en',
+                'from': from_date,
+            }
+            response = self._get(params)
+            if page > 1 and not response.ok:
+                logger.warning("Stopping pagination for %s at page %d (HTTP %d)", domain, page, response.status_code)
+                break
+            response.raise_for_status()
+            data = response.json()
+            batch = data.get('articles', [])
+            items.extend(batch)
+            total = int(data.get('totalResults') or 0)
+            if len(batch) < self.page_size or len(items) >= total:
+                break
+        return items
+
+    def iter_domains(
+        self,
+        domains: Iterable[str],
+        from_date: str,
+        skip_failed: bool = False,
+    ) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+        """Yield `(domain, articles)` pairs in completion order.
+
+        Wall time tracks the slowest domain rather than the sum of all of
+        them. Pending requests are cancelled if the consumer stops early or
+        a domain fails. With `skip_failed`, a failing domain is logged and
+        yields no articles instead, and the other domains carry on.
+        """
+        domains = list(domains)
+        if not domains:
+            return
+        pool = ThreadPoolExecutor(max_workers=min(self.max_workers, len(domains)))
+        try:
+            futures: Dict[Future, str] = {
+                pool.submit(self.fetch_domain, domain, from_date): domain for domain in domains
+            }
+            for future in as_completed(futures):
+                domain = futures[future]
+                try:
+                    items = future.result()
+                except (requests.RequestException, ValueError):
+                    if not skip_failed:
+                        raise
+                    logger.exception("Failed to fetch articles for %s", domain)
+                    items = []
+                yield domain, items
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def cache_stats(self) -> Dict[str, Any]:
+        return self.cache.stats() if self.cache is not None else {}
+
+    def close(self) -> None:
+        self._session.close()
+
+
+@lru_cache()
+def get_news_fetcher() -> NewsFetcher:
+    """Return the process-wide fetcher configured from settings."""
+    settings = get_settings()
+    if not settings.url or not settings.api_key:
+        raise ValueError("URL and API_KEY must be configured")
+    cache = None
+    if settings.http_cache_enabled:
+        cache = ResponseCache(
+            settings.http_cache_dir,
+            ttl=settings.http_cache_ttl,
+            max_bytes=settings.http_cache_max_bytes,
+        )
+    return NewsFetcher(
+        url=settings.url,
+        api_key=settings.api_key,
+        max_workers=settings.fetch_max_workers,
+        page_size=settings.fetch_page_size,
+        max_pages=settings.fetch_max_pages,
+        timeout=settings.fetch_timeout,
+        cache=cache,
+    )
@@ -0,0 +1,102 @@
+"""Lazy, offline resolution of NLTK data.
+
+Resources are looked up in the pinned `settings.nltk_data_dir` first and
+then NLTK's standard search path. Nothing is ever downloaded: a missing
+artifact raises `ResourceMissingError` immediately with the command that
+installs it. Each resource is loaded on first use and cached for the life
+of the process; `prewarm()` loads everything up front, e.g. before a
+pre-forking server starts its workers.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, Optional
+
+import nltk
+
+from ..core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+RESOURCES: Dict[str, str] = {
+    "stopwords": "corpora/stopwords",
+    "wordnet": "corpora/wordnet",
+    "vader_lexicon": "sentiment/vader_lexicon.zip",
+}
+
+VADER_LEXICON_URL = "sentiment/vader_lexicon.zip/vader_lexicon/vader_lexicon.txt"
+
+EXTRA_STOPWORDS = ("char", "u", "hindustan", "doj", "washington")
+
+
+class ResourceMissingError(LookupError):
+    """Raised when a required NLTK artifact is not installed locally."""
+
+
+_paths_lock = threading.Lock()
+_paths_ready = False
+
+
+def _configure_paths() -> None:
+    global _paths_ready
+    if _paths_ready:
+        return
+    with _paths_lock:
+        if not _paths_ready:
+            data_dir = get_settings().nltk_data_dir
+            if data_dir and data_dir not in nltk.data.path:
+                nltk.data.path.insert(0, data_dir)
+            _paths_ready = True
+
+
+def find(name: str) -> str:
+    """Return the local path of a resource or fail fast without network."""
+    _configure_paths()
+    try:
+        return str(nltk.data.find(RESOURCES[name]))
+    except LookupError:
+        target = get_settings().nltk_data_dir or "<nltk_data_dir>"
+        raise ResourceMissingError(
+            f"NLTK resource '{name}' is not installed (searched {list(nltk.data.path)}). "
+            f"Install it with: python -m nltk.downloader -d {target} {name}"
+        ) from None
+
+
+@lru_cache()
+def get_stopwords() -> FrozenSet[str]:
+    """English stopwords plus the project-specific additions."""
+    find("stopwords")
+    from nltk.corpus import stopwords
+
+    return frozenset(stopwords.words("english")).union(EXTRA_STOPWORDS)
+
+
+@lru_cache()
+def get_vader_lexicon_path() -> str:
+    """Resource URL of the VADER lexicon, verified to exist locally."""
+    find("vader_lexicon")
+    return VADER_LEXICON_URL
+
+
+def prewarm(names: Optional[Iterable[str]] = None) -> Dict[str, float]:
+    """Load resources eagerly and return seconds spent per resource."""
+    from .analyzer_service import get_analyzer
+    from .lemma_table import get_lemma_table
+    from .vader_batch import get_vader_scorer
+
+    loaders = {
+        "stopwords": get_stopwords,
+        "vader_lexicon": get_vader_scorer,
+        "lemma_table": get_lemma_table,
+        "analyzer": get_analyzer,
+    }
+    timings: Dict[str, float] = {}
+    for name in names or loaders:
+        started = time.perf_counter()
+        loaders[name]()
+        timings[name] = time.perf_counter() - started
+    logger.info("Pre-warmed NLTK resources: %s", {k: round(v, 4) for k, v in timings.items()})
+    return timings
@@ -0,0 +1,155 @@
+"""Versioned response cache for read-heavy endpoints such as /visualize.
+
+Every write to a watched collection bumps a counter in `DataVersions`
+(one `$inc`). The counter lives in the database, so every worker sees
+the bump. Cached payloads are stored with the version they were built
+from and served until it changes. No TTL guesswork is needed, and
+polling clients get the same bytes, and therefore the same strong
+ETag, from every worker.
+
+Concurrent misses for one key share a single computation (single
+flight): the first request builds the payload while the others wait for
+its result, instead of all of them recomputing it.
+"""
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from ..core.config import get_settings
+from .db import get_collection
+
+DATA_VERSION_COLLECTION = "DataVersions"
+
+_versions: Dict[str, Tuple[int, float]] = {}
+_versions_lock = threading.Lock()
+
+
+def bump_data_version(name: str) -> None:
+    """Record that `name` changed, invalidating payloads built from it."""
+    get_collection(DATA_VERSION_COLLECTION).update_one({"_id": name}, {"$inc": {"version": 1}}, upsert=True)
+    with _versions_lock:
+        _versions.pop(name, None)
+
+
+def get_data_version(name: str) -> int:
+    """Current version of `name`.
+
+    Memoized for `settings.data_version_ttl` seconds, so heavy polling
+    costs at most one point lookup per interval. Bumps made by this
+    process are seen immediately.
+    """
+    ttl = get_settings().data_version_ttl
+    now = time.monotonic()
+    with _versions_lock:
+        memo = _versions.get(name)
+    if memo is not None and now - memo[1] < ttl:
+        return memo[0]
+    doc = get_collection(DATA_VERSION_COLLECTION).find_one({"_id": name})
+    version = int(doc.get("version", 0)) if doc else 0
+    with _versions_lock:
+        _versions[name] = (version, now)
+    return version
+
+
+@dataclass
+class CachedPayload:
+    version: Hashable
+    body: bytes
+    etag: str
+
+
+@dataclass
+class _Flight:
+    done: threading.Event = field(default_factory=threading.Event)
+    result: Optional[CachedPayload] = None
+    error: Optional[BaseException] = None
+
+
+class PayloadCache:
+    """LRU of serialized payloads keyed on request parameters.
+
+    Args:
+        max_entries: Maximum cached keys.
+    """
+
+    def __init__(self, max_entries: int = 256) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, CachedPayload]" = OrderedDict()
+        self._flights: Dict[Tuple[Hashable, Hashable], _Flight] = {}
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "coalesced": 0}
+
+    def get_or_compute(self, key: Hashable, version: Hashable, compute: Callable[[], bytes]) -> CachedPayload:
+        """Cached payload for `key` at `version`, computing it at most once.
+
+        `compute` returns the serialized body. Its ETag is a hash of those
+        bytes, so equal payloads get equal ETags.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.version == version:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return entry
+            flight = self._flights.get((key, version))
+            leader = flight is None
+            if leader:
+                flight = self._flights[(key, version)] = _Flight()
+                self._stats["misses"] += 1
+            else:
+                self._stats["coalesced"] += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result  # type: ignore[return-value]
+
+        try:
+            body = compute()
+            entry = CachedPayload(version=version, body=body, etag=hashlib.sha256(body).hexdigest()[:32])
+            flight.result = entry
+            with self._lock:
+                self._entries[key] = entry
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            return entry
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop((key, version), None)
+            flight.done.set()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+        lookups = stats["hits"] + stats["misses"] + stats["coalesced"]
+        stats["hit_ratio"] = (stats["hits"] + stats["coalesced"]) / lookups if lookups else 0.0
+        return stats
+
+
+_cache: Optional[PayloadCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_visualize_cache() -> PayloadCache:
+    """Return the process-wide /visualize payload cache."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = PayloadCache(max_entries=get_settings().visualize_cache_size)
+    return _cache
@@ -0,0 +1,249 @@
+"""Daily sentiment rollups maintained at write time.
+
+`PolarityRollups` holds one document per `(date, source)` with the sum
+of `compound` plus the number of rows and of each label:
+
+    {"date": "2024-05-01", "source": "BBC News",
+     "compound_sum": 3.2, "count": 12, "pos": 7, "neg": 2, "neu": 3}
+
+Every PolarityData writer passes the rows it wrote, and the rows they
+replaced, to `apply_polarity_delta`. Each affected cell is then updated
+with a single atomic `$inc`, so concurrent writers never lose counts.
+/visualize sums cells instead of scanning articles. Rows without a
+usable `pub_date` are kept under `date: null`; they count towards
+summaries but not towards trends, as in the aggregation pipeline.
+
+Deltas are best effort. A write that fails halfway leaves the cells
+behind PolarityData. Rebuilding them from scratch fixes that, and also
+backfills rows written before rollups existed::
+
+    python -m app.services.rollup_service
+
+Cells written by deltas alone only cover rows written since the upgrade,
+so readers use them only once a rebuild has recorded its marker in
+`DataVersions` (see `rollups_available`).
+"""
+from __future__ import annotations
+
+import logging
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+
+import pandas as pd
+from pymongo import UpdateOne
+
+from .db import WriteResult, bulk_upsert, ensure_index, get_collection, iter_collection
+from .payload_cache import DATA_VERSION_COLLECTION, bump_data_version
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_COLLECTION = "PolarityRollups"
+POLARITY_COLLECTION = "PolarityData"
+ROLLUP_FIELDS = ("compound_sum", "count", "pos", "neg", "neu")
+# Fields of a PolarityData row that feed its rollup cell
+SOURCE_FIELDS = {"_id": 0, "pub_date": 1, "source": 1, "compound": 1, "label": 1}
+
+_indexes_ready = False
+_indexes_lock = threading.Lock()
+
+
+def ensure_rollup_indexes() -> None:
+    """Unique `(date, source)` index, once per process."""
+    global _indexes_ready
+    if _indexes_ready:
+        return
+    with _indexes_lock:
+        if not _indexes_ready:
+            ensure_index(ROLLUP_COLLECTION, [("date", 1), ("source", 1)], unique=True)
+            _indexes_ready = True
+
+
+def rollup_cells(rows: Union[pd.DataFrame, Iterable[Dict[str, Any]]]) -> pd.DataFrame:
+    """Per-(date, source) contributions of polarity rows, computed vectorized.
+
+    Dates are bucketed by UTC day, the way the aggregation pipeline does it.
+    """
+    if isinstance(rows, pd.DataFrame):
+        df = rows.reindex(columns=["pub_date", "source", "compound", "label"])
+    else:
+        df = pd.DataFrame(list(rows), columns=["pub_date", "source", "compound", "label"])
+    if df.empty:
+        return pd.DataFrame(columns=["date", "source", *ROLLUP_FIELDS])
+    days = pd.to_datetime(df["pub_date"], errors="coerce", utc=True, format="mixed")
+    label = pd.to_numeric(df["label"], errors="coerce")
+    cells = pd.DataFrame({
+        "date": days.dt.strftime("%Y-%m-%d"),
+        "source": df["source"].where(df["source"].map(lambda s: isinstance(s, str) and bool(s))),
+        "compound_sum": pd.to_numeric(df["compound"], errors="coerce").fillna(0.0),
+        "count": 1,
+        "pos": (label == 1).astype(int),
+        "neg": (label == -1).astype(int),
+        "neu": (label == 0).astype(int),
+    })
+    return cells.groupby(["date", "source"], dropna=False, sort=False)[list(ROLLUP_FIELDS)].sum().reset_index()
+
+
+def _cell_key(row: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "date": None if pd.isna(row["date"]) else row["date"],
+        "source": None if pd.isna(row["source"]) else row["source"],
+    }
+
+
+def apply_polarity_delta(
+    added: Iterable[Dict[str, Any]],
+    removed: Iterable[Dict[str, Any]] = (),
+) -> int:
+    """Fold written rows (and the versions they replaced) into the rollups.
+
+    Args:
+        added: Polarity rows as written.
+        removed: Previous versions of rows that `added` overwrote.
+
+    Returns:
+        Number of rollup cells touched. Zero means nothing any rollup or
+        chart depends on changed, and the data version is left alone.
+    """
+    plus = rollup_cells(added)
+    minus = rollup_cells(removed)
+    if not minus.empty:
+        minus[list(ROLLUP_FIELDS)] = -minus[list(ROLLUP_FIELDS)]
+        plus = pd.concat([plus, minus], ignore_index=True)
+        plus = plus.groupby(["date", "source"], dropna=False, sort=False)[list(ROLLUP_FIELDS)].sum().reset_index()
+    operations = []
+    for row in plus.to_dict(orient="records"):
+        inc = {f: (float(row[f]) if f == "compound_sum" else int(row[f])) for f in ROLLUP_FIELDS}
+        if not any(inc.values()):
+            continue
+        operations.append(UpdateOne(_cell_key(row), {"$inc": inc}, upsert=True))
+    if not operations:
+        return 0
+    try:
+        ensure_rollup_indexes()
+        get_collection(ROLLUP_COLLECTION).bulk_write(operations, ordered=False)
+    finally:
+        # The rows changed even if their rollups did not; cached payloads are stale
+        bump_data_version(POLARITY_COLLECTION)
+    return len(operations)
+
+
+def previous_rows(collection_name: str, key: str, values: Sequence[Any]) -> List[Dict[str, Any]]:
+    """Stored rollup-relevant fields of the rows an upsert on `key` will replace."""
+    values = [v for v in values if v is not None]
+    if not values:
+        return []
+    return list(get_collection(collection_name).find({key: {"$in": values}}, SOURCE_FIELDS))
+
+
+def write_polarity(
+    records: List[Dict[str, Any]],
+    key: Optional[str] = None,
+    collection_name: str = POLARITY_COLLECTION,
+) -> WriteResult:
+    """`bulk_upsert` polarity rows and fold them into the rollups.
+
+    Rows repeating a key within `records` are reduced to the last one, so
+    each stored row is counted once.
+    """
+    if key:
+        latest: Dict[Any, Dict[str, Any]] = {}
+        keyless = []
+        for record in records:
+            if record.get(key) is None:
+                keyless.append(record)
+            else:
+                latest[record[key]] = record
+        records = keyless + list(latest.values())
+    previous = previous_rows(collection_name, key, list(latest)) if key else []
+    result = bulk_upsert(collection_name, records, key=key)
+    try:
+        apply_polarity_delta(records, previous)
+    except Exception:  # rollups can be rebuilt; never fail the write for them
+        logger.exception("Failed to update %s", ROLLUP_COLLECTION)
+    return result
+
+
+def _cells_from(rows: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Rollup documents for fully-aggregated cells."""
+    documents = []
+    for row in rows.to_dict(orient="records"):
+        doc = _cell_key(row)
+        doc.update({f: (float(row[f]) if f == "compound_sum" else int(row[f])) for f in ROLLUP_FIELDS})
+        documents.append(doc)
+    return documents
+
+
+def rebuild_rollups(batch_size: Optional[int] = None) -> int:
+    """Recompute every rollup cell from PolarityData.
+
+    Streams the source collection, then overwrites each cell with `$set`
+    and removes cells that no longer have rows. Writes that land during
+    the rebuild may be missed, so run it while writers are paused.
+
+    Returns:
+        Number of cells written.
+    """
+    totals: Optional[pd.DataFrame] = None
+    for batch in iter_collection(POLARITY_COLLECTION, SOURCE_FIELDS, batch_size=batch_size):
+        cells = rollup_cells(batch)
+        totals = cells if totals is None else pd.concat([totals, cells], ignore_index=True)
+        totals = totals.groupby(["date", "source"], dropna=False, sort=False)[list(ROLLUP_FIELDS)].sum().reset_index()
+    documents = _cells_from(totals) if totals is not None else []
+
+    ensure_rollup_indexes()
+    collection = get_collection(ROLLUP_COLLECTION)
+    keep = {(d["date"], d["source"]) for d in documents}
+    stale = [
+        doc["_id"] for doc in collection.find({}, {"_id": 1, "date": 1, "source": 1})
+        if (doc.get("date"), doc.get("source")) not in keep
+    ]
+    if stale:
+        collection.delete_many({"_id": {"$in": stale}})
+    if documents:
+        collection.bulk_write(
+            [UpdateOne({"date": d["date"], "source": d["source"]}, {"$set": d}, upsert=True) for d in documents],
+            ordered=False,
+        )
+    # Deltas keep the cells complete from here on; readers may switch to them
+    get_collection(DATA_VERSION_COLLECTION).update_one(
+        {"_id": ROLLUP_COLLECTION}, {"$set": {"built_at": datetime.now(timezone.utc)}}, upsert=True
+    )
+    bump_data_version(POLARITY_COLLECTION)
+    return len(documents)
+
+
+def rollups_available() -> bool:
+    """Whether a rebuild has backfilled the rollups.
+
+    Cells appear with the first write after an upgrade, but until a
+    rebuild they miss every row written before it.
+    """
+    marker = get_collection(DATA_VERSION_COLLECTION).find_one({"_id": ROLLUP_COLLECTION})
+    return bool(marker and marker.get("built_at"))
+
+
+def load_rollups(
+    sources: Optional[Sequence[str]] = None,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+) -> pd.DataFrame:
+    """Rollup cells in scope, one row per `(date, source)`."""
+    query: Dict[str, Any] = {}
+    if sources:
+        query["source"] = sources[0] if len(sources) == 1 else {"$in": list(sources)}
+    if start or end:
+        days: Dict[str, Any] = {}
+        if start:
+            days["$gte"] = start
+        if end:
+            days["$lte"] = end
+        query["date"] = days
+    columns = ["date", "source", *ROLLUP_FIELDS]
+    docs = get_collection(ROLLUP_COLLECTION).find(query, {"_id": 0, **{c: 1 for c in columns}})
+    return pd.DataFrame(list(docs), columns=columns)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    written = rebuild_rollups()
+    print(f"Rebuilt {written} {ROLLUP_COLLECTION} cells from {POLARITY_COLLECTION}")
@@ -0,0 +1,148 @@
+"""Content-addressed cache of sentiment scores.
+
+Scores depend only on the text and the analyzer that produced them, so
+entries are keyed on a SHA-256 of the text within a `<model>:<version>`
+namespace; changing the model or its lexicon starts a fresh keyspace
+instead of serving stale scores. A bounded in-memory LRU answers repeat
+texts within a worker. An optional SQLite file behind it is shared by
+every worker on the host and survives restarts.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional
+
+from ..core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+_SQL_BATCH = 500
+
+
+class SentimentCache:
+    """Two-tier (memory LRU + optional SQLite) score cache.
+
+    Args:
+        namespace: Model and version the cached scores belong to.
+        memory_size: Maximum entries kept in the in-process LRU.
+        path: SQLite file for the persistent tier; None keeps it in memory only.
+    """
+
+    def __init__(self, namespace: str, memory_size: int = 50_000, path: Optional[str] = None) -> None:
+        self.namespace = namespace
+        self.memory_size = memory_size
+        self.path = path
+        self._memory: "OrderedDict[str, Dict[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._stats = {"memory_hits": 0, "persistent_hits": 0, "misses": 0, "stores": 0}
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+    def key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.namespace}\0{text}".encode("utf-8")).hexdigest()
+
+    def _connection(self) -> sqlite3.Connection:
+        # One connection per thread and process; never reuse one across a fork.
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS sentiment (key TEXT PRIMARY KEY, scores TEXT NOT NULL)")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _remember(self, entries: Dict[str, Dict[str, float]]) -> None:
+        with self._lock:
+            for key, scores in entries.items():
+                self._memory[key] = scores
+                self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_size:
+                self._memory.popitem(last=False)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Dict[str, float]]:
+        """Return the cached scores for whichever `keys` are known."""
+        wanted = list(dict.fromkeys(keys))
+        found: Dict[str, Dict[str, float]] = {}
+        with self._lock:
+            for key in wanted:
+                scores = self._memory.get(key)
+                if scores is not None:
+                    self._memory.move_to_end(key)
+                    found[key] = scores
+            self._stats["memory_hits"] += len(found)
+
+        missing = [k for k in wanted if k not in found]
+        if missing and self.path:
+            loaded: Dict[str, Dict[str, float]] = {}
+            try:
+                conn = self._connection()
+                for i in range(0, len(missing), _SQL_BATCH):
+                    batch = missing[i:i + _SQL_BATCH]
+                    rows = conn.execute(
+                        f"SELECT key, scores FROM sentiment WHERE key IN ({','.join('?' * len(batch))})", batch
+                    )
+                    loaded.update((key, json.loads(raw)) for key, raw in rows)
+            except (sqlite3.Error, ValueError):
+                logger.exception("Sentiment cache lookup failed; scoring without it")
+            if loaded:
+                self._remember(loaded)
+                found.update(loaded)
+            with self._lock:
+                self._stats["persistent_hits"] += len(loaded)
+
+        with self._lock:
+            self._stats["misses"] += len(wanted) - len(found)
+        return found
+
+    def put_many(self, entries: Dict[str, Dict[str, float]]) -> None:
+        """Store freshly computed scores in both tiers."""
+        if not entries:
+            return
+        self._remember(entries)
+        with self._lock:
+            self._stats["stores"] += len(entries)
+        if not self.path:
+            return
+        try:
+            conn = self._connection()
+            with conn:
+                conn.executemany(
+                    "INSERT OR IGNORE INTO sentiment (key, scores) VALUES (?, ?)",
+                    [(key, json.dumps(scores)) for key, scores in entries.items()],
+                )
+        except sqlite3.Error:
+            logger.exception("Failed to persist %d sentiment cache entries", len(entries))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_entries"] = len(self._memory)
+        lookups = stats["memory_hits"] + stats["persistent_hits"] + stats["misses"]
+        hits = stats["memory_hits"] + stats["persistent_hits"]
+        stats["hit_ratio"] = hits / lookups if lookups else 0.0
+        stats["namespace"] = self.namespace
+        stats["persistent"] = bool(self.path)
+        return stats
+
+
+def build_sentiment_cache(namespace: str) -> Optional[SentimentCache]:
+    """Create the cache described by settings, or None when disabled."""
+    settings = get_settings()
+    if not settings.sentiment_cache_enabled:
+        return None
+    return SentimentCache(
+        namespace,
+        memory_size=settings.sentiment_cache_size,
+        path=settings.sentiment_cache_path or None,
+    )
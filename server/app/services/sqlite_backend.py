@@ -0,0 +1,627 @@
+"""Embedded SQLite storage with a pymongo-compatible surface.
+
+Each collection is a table of JSON documents (`id`, `doc`, `types`).
+Filters, sorts and indexes compile to `json_extract(doc, '$.field')`
+expressions, so an index created through `create_index` is used by
+queries on the same fields. Dates and ObjectIds are stored as ISO and
+hex strings, which keep their ordering; their field paths are recorded
+in `types` so documents read back with the original Python types.
+
+Only the subset of the pymongo API this project uses is implemented:
+`find`/`find_one` with projection, sort, skip and limit; `insert_one`,
+`insert_many`, `update_one`, `update_many`, `delete_many` and
+`bulk_write` with `$set`, `$setOnInsert`, `$inc`, `$unset`, `$min` and
+`$max`; `count_documents`, `distinct` and `create_index`. Aggregation
+pipelines raise `NotImplementedError`, which callers treat as "group in
+pandas instead".
+"""
+from __future__ import annotations
+
+import json
+import math
+import os
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime, timezone
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+from bson import ObjectId
+from pymongo import DeleteMany, DeleteOne, InsertOne, ReplaceOne, UpdateMany, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError, ExecutionTimeout, OperationFailure
+from pymongo.results import BulkWriteResult, DeleteResult, InsertManyResult, InsertOneResult, UpdateResult
+
+_FIELD_RE = re.compile(r"^[A-Za-z0-9_][A-Za-z0-9_.]*$")
+_JSON_TYPES = {
+    "string": "'text'",
+    "int": "'integer'",
+    "long": "'integer'",
+    "double": "'real'",
+    "number": "'integer', 'real'",
+    "bool": "'true', 'false'",
+    "object": "'object'",
+    "array": "'array'",
+    "null": "'null'",
+}
+_FETCH_SIZE = 500
+
+Sort = List[Tuple[str, int]]
+
+
+# --- value encoding ---------------------------------------------------------
+
+def _utc_naive(value: datetime) -> datetime:
+    # BSON dates are naive UTC; keep that convention so strings compare in order
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _scalar(value: Any) -> Any:
+    """Plain Python/JSON value of a scalar (numpy and pandas types included)."""
+    if isinstance(value, datetime):
+        return None if value != value else _utc_naive(value).isoformat()  # NaT
+    if isinstance(value, date):
+        return datetime.combine(value, datetime.min.time()).isoformat()
+    if isinstance(value, ObjectId):
+        return str(value)
+    if hasattr(value, "item") and not isinstance(value, (str, bytes)):
+        value = value.item()  # numpy scalar
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+def _encode(value: Any, path: str, types: Dict[str, str]) -> Any:
+    if isinstance(value, Mapping):
+        return {str(k): _encode(v, f"{path}.{k}" if path else str(k), types) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_encode(v, f"{path}.{i}", types) for i, v in enumerate(value)]
+    if isinstance(value, ObjectId):
+        types[path] = "oid"
+    elif isinstance(value, (datetime, date)) and value == value:
+        types[path] = "date"
+    return _scalar(value)
+
+
+def _decode(doc: Dict[str, Any], types: Dict[str, str]) -> Dict[str, Any]:
+    for path, kind in types.items():
+        *parents, leaf = path.split(".")
+        node: Any = doc
+        for part in parents:
+            node = node[int(part)] if isinstance(node, list) else node.get(part)
+            if node is None:
+                break
+        else:
+            key: Any = int(leaf) if isinstance(node, list) else leaf
+            value = node[key] if isinstance(node, list) else node.get(key)
+            if isinstance(value, str):
+                node[key] = ObjectId(value) if kind == "oid" else datetime.fromisoformat(value)
+    return doc
+
+
+def _dump(doc: Dict[str, Any]) -> Tuple[str, Optional[str]]:
+    types: Dict[str, str] = {}
+    encoded = _encode(doc, "", types)
+    return json.dumps(encoded, separators=(",", ":")), json.dumps(types) if types else None
+
+
+def _load(raw: str, raw_types: Optional[str]) -> Dict[str, Any]:
+    doc = json.loads(raw)
+    return _decode(doc, json.loads(raw_types)) if raw_types else doc
+
+
+# --- query compilation ------------------------------------------------------
+
+def _field(path: str) -> str:
+    if path == "_id":
+        return "id"
+    if not _FIELD_RE.match(path):
+        raise ValueError(f"Unsupported field name for the SQLite backend: {path!r}")
+    return f"json_extract(doc, '$.{path}')"
+
+
+class _Compiler:
+    """Turns a Mongo filter into a SQL predicate.
+
+    With `inline=True` values are rendered as literals, which `CREATE
+    INDEX ... WHERE` requires.
+    """
+
+    def __init__(self, inline: bool = False) -> None:
+        self.inline = inline
+        self.params: List[Any] = []
+
+    def value(self, value: Any) -> str:
+        value = _scalar(value)
+        if isinstance(value, bool):
+            value = int(value)
+        if isinstance(value, (dict, list)):
+            raise NotImplementedError("Matching whole documents or arrays is not supported by the SQLite backend")
+        if not self.inline:
+            self.params.append(value)
+            return "?"
+        if isinstance(value, str):
+            return "'" + value.replace("'", "''") + "'"
+        return repr(value)
+
+    def compile(self, query: Optional[Mapping[str, Any]]) -> str:
+        clauses = [self._clause(key, value) for key, value in (query or {}).items()]
+        return " AND ".join(f"({c})" for c in clauses) if clauses else "1"
+
+    def _clause(self, key: str, value: Any) -> str:
+        if key in ("$and", "$or", "$nor"):
+            parts = [self.compile(sub) for sub in value]
+            if key == "$and":
+                return " AND ".join(f"({p})" for p in parts) or "1"
+            joined = " OR ".join(f"({p})" for p in parts) or "0"
+            return joined if key == "$or" else f"NOT ({joined})"
+        field = _field(key)
+        if isinstance(value, Mapping) and value and all(str(k).startswith("$") for k in value):
+            return " AND ".join(self._operator(key, field, op, arg) for op, arg in value.items())
+        return self._operator(key, field, "$eq", value)
+
+    def _operator(self, key: str, field: str, op: str, arg: Any) -> str:
+        if op == "$eq":
+            return f"{field} IS NULL" if arg is None else f"{field} = {self.value(arg)}"
+        if op == "$ne":
+            return f"{field} IS NOT NULL" if arg is None else f"({field} IS NULL OR {field} != {self.value(arg)})"
+        if op in ("$gt", "$gte", "$lt", "$lte"):
+            sign = {"$gt": ">", "$gte": ">=", "$lt": "<", "$lte": "<="}[op]
+            return f"{field} {sign} {self.value(arg)}"
+        if op in ("$in", "$nin"):
+            values = list(arg)
+            present = [v for v in values if v is not None]
+            parts = [f"{field} IN ({', '.join(self.value(v) for v in present)})"] if present else []
+            if len(present) != len(values):
+                parts.append(f"{field} IS NULL")
+            clause = " OR ".join(parts) or "0"
+            return clause if op == "$in" else f"NOT ({clause})"
+        if op == "$exists":
+            if key == "_id":
+                return "1" if arg else "0"
+            exists = f"json_type(doc, '$.{key}') IS NOT NULL"
+            return exists if arg else f"NOT ({exists})"
+        if op == "$type":
+            kind = _JSON_TYPES.get(arg)
+            if kind is None:
+                raise NotImplementedError(f"$type {arg!r} is not supported by the SQLite backend")
+            return f"json_type(doc, '$.{key}') IN ({kind})"
+        raise NotImplementedError(f"{op} is not supported by the SQLite backend")
+
+
+def _sort_spec(key_or_list: Union[str, Sequence[Tuple[str, int]]], direction: Optional[int] = None) -> Sort:
+    if isinstance(key_or_list, str):
+        return [(key_or_list, direction or 1)]
+    return [(key, int(d)) for key, d in key_or_list]
+
+
+def _order_by(sort: Sort) -> str:
+    return ", ".join(f"{_field(key)} {'DESC' if d < 0 else 'ASC'}" for key, d in sort)
+
+
+def _project(doc: Dict[str, Any], projection: Optional[Mapping[str, Any]]) -> Dict[str, Any]:
+    if not projection:
+        return doc
+    include_id = bool(projection.get("_id", 1))
+    fields = {k: bool(v) for k, v in projection.items() if k != "_id"}
+    if any(fields.values()):
+        projected = {k: doc[k] for k, keep in fields.items() if keep and k in doc}
+        if include_id and "_id" in doc:
+            projected = {"_id": doc["_id"], **projected}
+        return projected
+    dropped = {k for k, keep in fields.items() if not keep}
+    if not include_id:
+        dropped.add("_id")
+    return {k: v for k, v in doc.items() if k not in dropped}
+
+
+# --- updates ----------------------------------------------------------------
+
+def _set_path(doc: Dict[str, Any], path: str, value: Any) -> None:
+    *parents, leaf = path.split(".")
+    for part in parents:
+        doc = doc.setdefault(part, {})
+    doc[leaf] = value
+
+
+def _get_path(doc: Dict[str, Any], path: str) -> Any:
+    for part in path.split("."):
+        if not isinstance(doc, dict):
+            return None
+        doc = doc.get(part)
+    return doc
+
+
+def _apply_update(doc: Dict[str, Any], update: Mapping[str, Any], inserting: bool) -> Dict[str, Any]:
+    if not any(str(k).startswith("$") for k in update):
+        # Replacement document
+        return {"_id": doc.get("_id"), **{k: v for k, v in update.items() if k != "_id"}}
+    for op, fields in update.items():
+        if op == "$setOnInsert" and not inserting:
+            continue
+        for path, value in fields.items():
+            if op in ("$set", "$setOnInsert"):
+                _set_path(doc, path, value)
+            elif op == "$inc":
+                _set_path(doc, path, (_get_path(doc, path) or 0) + value)
+            elif op == "$unset":
+                *parents, leaf = path.split(".")
+                parent = _get_path(doc, ".".join(parents)) if parents else doc
+                if isinstance(parent, dict):
+                    parent.pop(leaf, None)
+            elif op in ("$min", "$max"):
+                current = _get_path(doc, path)
+                if current is None or (value < current if op == "$min" else value > current):
+                    _set_path(doc, path, value)
+            else:
+                raise NotImplementedError(f"{op} is not supported by the SQLite backend")
+    return doc
+
+
+def _upsert_seed(query: Mapping[str, Any]) -> Dict[str, Any]:
+    """Fields an upsert copies from its filter's top-level equality clauses."""
+    seed: Dict[str, Any] = {}
+    for key, value in query.items():
+        if key.startswith("$"):
+            continue
+        if isinstance(value, Mapping) and value and all(str(k).startswith("$") for k in value):
+            if "$eq" in value:
+                _set_path(seed, key, value["$eq"])
+            continue
+        _set_path(seed, key, value)
+    return seed
+
+
+# --- cursor, collection, database ---------------------------------------------
+
+class SQLiteCursor:
+    """Lazy, chainable result set; the query runs on first iteration."""
+
+    def __init__(self, collection: "SQLiteCollection", query: Optional[Mapping[str, Any]], projection: Optional[Mapping[str, Any]]) -> None:
+        self._collection = collection
+        self._query = query or {}
+        self._projection = projection
+        self._sort: Sort = []
+        self._skip = 0
+        self._limit = 0
+        self._batch_size = _FETCH_SIZE
+        self._iterator: Optional[Iterator[Dict[str, Any]]] = None
+
+    def sort(self, key_or_list: Union[str, Sequence[Tuple[str, int]]], direction: Optional[int] = None) -> "SQLiteCursor":
+        self._sort = _sort_spec(key_or_list, direction)
+        return self
+
+    def skip(self, count: int) -> "SQLiteCursor":
+        self._skip = count
+        return self
+
+    def limit(self, count: int) -> "SQLiteCursor":
+        self._limit = count
+        return self
+
+    def batch_size(self, size: int) -> "SQLiteCursor":
+        self._batch_size = max(1, size)
+        return self
+
+    def _rows(self) -> Iterator[Dict[str, Any]]:
+        compiler = _Compiler()
+        sql = f"SELECT doc, types FROM {self._collection.table} WHERE {compiler.compile(self._query)}"
+        if self._sort:
+            sql += f" ORDER BY {_order_by(self._sort)}"
+        if self._limit or self._skip:
+            sql += " LIMIT ? OFFSET ?"
+            compiler.params += [self._limit or -1, self._skip]
+        rows = self._collection._execute(sql, compiler.params)
+        while True:
+            batch = rows.fetchmany(self._batch_size)
+            if not batch:
+                return
+            for raw, raw_types in batch:
+                yield _project(_load(raw, raw_types), self._projection)
+
+    def __iter__(self) -> "SQLiteCursor":
+        return self
+
+    def __next__(self) -> Dict[str, Any]:
+        if self._iterator is None:
+            self._iterator = self._rows()
+        return next(self._iterator)
+
+
+class SQLiteCollection:
+    """One table of JSON documents behaving like a pymongo `Collection`."""
+
+    def __init__(self, database: "SQLiteDatabase", name: str) -> None:
+        if not re.match(r"^[A-Za-z0-9_]+$", name):
+            raise ValueError(f"Unsupported collection name for the SQLite backend: {name!r}")
+        self.database = database
+        self.name = name
+        self._table = f"c_{name}"
+        self.table = f'"{self._table}"'
+        database._ensure_table(self.table)
+
+    def _execute(self, sql: str, params: Sequence[Any] = ()) -> sqlite3.Cursor:
+        try:
+            return self.database._connection().execute(sql, params)
+        except sqlite3.OperationalError as exc:
+            raise _translate(exc) from exc
+
+    # reads
+
+    def find(self, filter: Optional[Mapping[str, Any]] = None, projection: Optional[Mapping[str, Any]] = None, **_: Any) -> SQLiteCursor:
+        return SQLiteCursor(self, filter, projection)
+
+    def find_one(self, filter: Optional[Mapping[str, Any]] = None, projection: Optional[Mapping[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        return next(self.find(filter, projection).limit(1), None)
+
+    def count_documents(self, filter: Mapping[str, Any]) -> int:
+        compiler = _Compiler()
+        where = compiler.compile(filter)
+        return int(self._execute(f"SELECT COUNT(*) FROM {self.table} WHERE {where}", compiler.params).fetchone()[0])
+
+    def distinct(self, key: str, filter: Optional[Mapping[str, Any]] = None) -> List[Any]:
+        values: List[Any] = []
+        for doc in self.find(filter):
+            value = _get_path(doc, key)
+            if value is not None and value not in values:
+                values.append(value)
+        return values
+
+    def aggregate(self, pipeline: Sequence[Mapping[str, Any]], **_: Any) -> Any:
+        raise NotImplementedError("Aggregation pipelines are not supported by the SQLite backend")
+
+    def create_index(self, keys: Union[str, Sequence[Tuple[str, int]]], unique: bool = False, name: Optional[str] = None, partialFilterExpression: Optional[Mapping[str, Any]] = None, **_: Any) -> str:
+        spec = _sort_spec(keys)
+        name = name or "_".join(f"{k}_{d}" for k, d in spec)
+        where = ""
+        if partialFilterExpression:
+            where = f" WHERE {_partial_filter(partialFilterExpression)}"
+        index = f'"{self._table}__{name.replace(".", "_")}"'
+        sql = f"CREATE {'UNIQUE ' if unique else ''}INDEX IF NOT EXISTS {index} ON {self.table} ({_order_by(spec)}){where}"
+        try:
+            with self.database._transaction() as conn:
+                conn.execute(sql)
+        except sqlite3.IntegrityError as exc:
+            raise OperationFailure(f"E11000 duplicate key error building index {name}: {exc}", code=11000) from exc
+        return name
+
+    # writes
+
+    def _insert(self, conn: sqlite3.Connection, doc: Dict[str, Any]) -> Any:
+        if doc.get("_id") is None:
+            doc["_id"] = ObjectId()
+        raw, raw_types = _dump(doc)
+        conn.execute(
+            f"INSERT INTO {self.table} (id, doc, types) VALUES (?, ?, ?)",
+            (_scalar(doc["_id"]), raw, raw_types),
+        )
+        return doc["_id"]
+
+    def _update(self, conn: sqlite3.Connection, query: Mapping[str, Any], update: Mapping[str, Any], upsert: bool, multi: bool) -> Dict[str, Any]:
+        compiler = _Compiler()
+        sql = f"SELECT id, doc, types FROM {self.table} WHERE {compiler.compile(query)}"
+        rows = conn.execute(sql + ("" if multi else " LIMIT 1"), compiler.params).fetchall()
+        if not rows:
+            if not upsert:
+                return {"n": 0, "nModified": 0}
+            doc = _apply_update(_upsert_seed(query), update, inserting=True)
+            return {"n": 1, "nModified": 0, "upserted": self._insert(conn, doc)}
+        modified = 0
+        for row_id, raw, raw_types in rows:
+            doc = _apply_update(_load(raw, raw_types), update, inserting=False)
+            new_raw, new_types = _dump(doc)
+            if new_raw != raw or new_types != raw_types:
+                conn.execute(f"UPDATE {self.table} SET doc = ?, types = ? WHERE id = ?", (new_raw, new_types, row_id))
+                modified += 1
+        return {"n": len(rows), "nModified": modified}
+
+    def _delete(self, conn: sqlite3.Connection, query: Mapping[str, Any], multi: bool) -> int:
+        compiler = _Compiler()
+        where = compiler.compile(query)
+        if not multi:
+            where = f"id IN (SELECT id FROM {self.table} WHERE {where} LIMIT 1)"
+        return conn.execute(f"DELETE FROM {self.table} WHERE {where}", compiler.params).rowcount
+
+    def insert_one(self, document: Dict[str, Any], **_: Any) -> InsertOneResult:
+        try:
+            with self.database._transaction() as conn:
+                inserted_id = self._insert(conn, document)
+        except sqlite3.IntegrityError as exc:
+            raise DuplicateKeyError(f"E11000 duplicate key error: {exc}", code=11000) from exc
+        return InsertOneResult(inserted_id, True)
+
+    def insert_many(self, documents: Sequence[Dict[str, Any]], ordered: bool = True, **_: Any) -> InsertManyResult:
+        result = self.bulk_write([InsertOne(doc) for doc in documents], ordered=ordered)
+        return InsertManyResult([doc["_id"] for doc in documents if "_id" in doc], result.acknowledged)
+
+    def update_one(self, filter: Mapping[str, Any], update: Mapping[str, Any], upsert: bool = False, **_: Any) -> UpdateResult:
+        return self._single(lambda conn: self._update(conn, filter, update, upsert, multi=False))
+
+    def update_many(self, filter: Mapping[str, Any], update: Mapping[str, Any], upsert: bool = False, **_: Any) -> UpdateResult:
+        return self._single(lambda conn: self._update(conn, filter, update, upsert, multi=True))
+
+    def replace_one(self, filter: Mapping[str, Any], replacement: Mapping[str, Any], upsert: bool = False, **_: Any) -> UpdateResult:
+        return self.update_one(filter, replacement, upsert=upsert)
+
+    def delete_one(self, filter: Mapping[str, Any], **_: Any) -> DeleteResult:
+        with self.database._transaction() as conn:
+            return DeleteResult({"n": self._delete(conn, filter, multi=False)}, True)
+
+    def delete_many(self, filter: Mapping[str, Any], **_: Any) -> DeleteResult:
+        with self.database._transaction() as conn:
+            return DeleteResult({"n": self._delete(conn, filter, multi=True)}, True)
+
+    def _single(self, operation) -> UpdateResult:
+        try:
+            with self.database._transaction() as conn:
+                raw = operation(conn)
+        except sqlite3.IntegrityError as exc:
+            raise DuplicateKeyError(f"E11000 duplicate key error: {exc}", code=11000) from exc
+        return UpdateResult(raw, True)
+
+    def bulk_write(self, requests: Sequence[Any], ordered: bool = True, **_: Any) -> BulkWriteResult:
+        """Apply write models in one transaction.
+
+        A duplicate key fails only its own operation; unordered writes carry
+        on and ordered ones stop, then a `BulkWriteError` reports both.
+        """
+        details: Dict[str, Any] = {
+            "nInserted": 0, "nUpserted": 0, "nMatched": 0, "nModified": 0, "nRemoved": 0,
+            "upserted": [], "writeErrors": [], "writeConcernErrors": [],
+        }
+        with self.database._transaction() as conn:
+            for index, request in enumerate(requests):
+                try:
+                    self._apply(conn, index, request, details)
+                except sqlite3.IntegrityError as exc:
+                    details["writeErrors"].append({"index": index, "code": 11000, "errmsg": f"E11000 duplicate key error: {exc}"})
+                    if ordered:
+                        break
+        if details["writeErrors"]:
+            raise BulkWriteError(details)
+        return BulkWriteResult(details, True)
+
+    def _apply(self, conn: sqlite3.Connection, index: int, request: Any, details: Dict[str, Any]) -> None:
+        if isinstance(request, InsertOne):
+            self._insert(conn, request._doc)
+            details["nInserted"] += 1
+        elif isinstance(request, (UpdateOne, UpdateMany, ReplaceOne)):
+            raw = self._update(conn, request._filter, request._doc, bool(request._upsert), multi=isinstance(request, UpdateMany))
+            if "upserted" in raw:
+                details["nUpserted"] += 1
+                details["upserted"].append({"index": index, "_id": raw["upserted"]})
+            else:
+                details["nMatched"] += raw["n"]
+                details["nModified"] += raw["nModified"]
+        elif isinstance(request, (DeleteOne, DeleteMany)):
+            details["nRemoved"] += self._delete(conn, request._filter, multi=isinstance(request, DeleteMany))
+        else:
+            raise NotImplementedError(f"{type(request).__name__} is not supported by the SQLite backend")
+
+
+def _partial_filter(expression: Mapping[str, Any]) -> str:
+    """SQL for an index `WHERE`.
+
+    `$exists: true` and `$type` become `IS NOT NULL`. SQLite uses a
+    partial index only when the query implies its condition, and an
+    equality lookup implies `IS NOT NULL` but not a `json_type` check.
+    """
+    clauses = []
+    for key, condition in expression.items():
+        if isinstance(condition, Mapping) and (condition.get("$exists") is True or "$type" in condition):
+            clauses.append(f"{_field(key)} IS NOT NULL")
+        else:
+            clauses.append(_Compiler(inline=True).compile({key: condition}))
+    return " AND ".join(clauses)
+
+
+def _translate(exc: sqlite3.OperationalError) -> Exception:
+    if "locked" in str(exc) or "busy" in str(exc):
+        # Surfaces as a transient error, so the bulk writer retries it
+        return ExecutionTimeout(str(exc))
+    return OperationFailure(str(exc))
+
+
+class SQLiteDatabase:
+    """A SQLite file standing in for a MongoDB database.
+
+    Connections are opened per thread and per process, in WAL mode, so
+    readers never block the single writer. `close` closes every thread's
+    connection; threads reconnect on their next call.
+    """
+
+    def __init__(self, path: str, timeout: float = 30.0) -> None:
+        self.path = path
+        self.name = os.path.splitext(os.path.basename(path))[0]
+        self.timeout = timeout
+        self._local = threading.local()
+        # Every open connection of this process, so `close` can reach other threads' ones
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_pid = os.getpid()
+        self._connections_lock = threading.Lock()
+        self._generation = 0
+        self._collections: Dict[str, SQLiteCollection] = {}
+        self._tables: set = set()
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid() or self._local.generation != self._generation:
+            # Used by this thread only, but `close` may run on another one
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with self._connections_lock:
+                if self._connections_pid != os.getpid():
+                    # Inherited across a fork: the parent still owns those
+                    self._connections, self._connections_pid = [], os.getpid()
+                self._connections.append(conn)
+                self._local.generation = self._generation
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+            self._local.depth = 0
+        return conn
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        conn = self._connection()
+        if self._local.depth:
+            yield conn
+            return
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+        except sqlite3.OperationalError as exc:
+            raise _translate(exc) from exc
+        self._local.depth = 1
+        try:
+            yield conn
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            self._local.depth = 0
+
+    def _ensure_table(self, table: str) -> None:
+        if table in self._tables:
+            return
+        with self._lock:
+            if table not in self._tables:
+                self._connection().execute(
+                    f"CREATE TABLE IF NOT EXISTS {table} (id TEXT PRIMARY KEY, doc TEXT NOT NULL, types TEXT)"
+                )
+                self._tables.add(table)
+
+    def __getitem__(self, name: str) -> SQLiteCollection:
+        collection = self._collections.get(name)
+        if collection is None:
+            collection = self._collections.setdefault(name, SQLiteCollection(self, name))
+        return collection
+
+    get_collection = __getitem__
+
+    def list_collection_names(self) -> List[str]:
+        rows = self._connection().execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name LIKE 'c\\_%' ESCAPE '\\'")
+        return sorted(name[2:] for (name,) in rows)
+
+    def command(self, command: Union[str, Mapping[str, Any]], **_: Any) -> Dict[str, Any]:
+        name = command if isinstance(command, str) else next(iter(command))
+        if name != "ping":
+            raise NotImplementedError(f"Command {name!r} is not supported by the SQLite backend")
+        self._connection().execute("SELECT 1")
+        return {"ok": 1.0}
+
+    def close(self) -> None:
+        """Close the connections of every thread of this process."""
+        with self._connections_lock:
+            connections = self._connections if self._connections_pid == os.getpid() else []
+            self._connections = []
+            self._generation += 1
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
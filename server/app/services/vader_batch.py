@@ -0,0 +1,302 @@
+"""Batch VADER scoring over array-backed lexicon lookups.
+
+`SentimentIntensityAnalyzer.polarity_scores` re-tokenizes each text,
+builds a punctuation product table per call, probes the lexicon dict
+several times per token and finds every token's position with a linear
+`list.index`. `BatchVaderScorer` tokenizes each text once, resolves the
+batch vocabulary against a precompiled lexicon (word -> row of a float
+array) in a single gather, and lays every token of the batch out in flat
+arrays with document offsets. VADER's booster, caps, negation, idiom,
+"least" and "but" rules then only run at positions that carry a lexicon
+valence, and the per-document sums, pos/neg/neu sifting, punctuation
+emphasis and normalization are computed for the whole batch with numpy.
+
+The rules are ported verbatim, including NLTK's quirks (repeated tokens
+share the valence of their first occurrence; idiom and "never" checks
+are case-sensitive). Scores agree with NLTK's implementation within
+`TOLERANCE`: one unit in the last rounded digit, i.e. 1e-3 for
+neg/neu/pos and 1e-4 for compound.
+"""
+from __future__ import annotations
+
+import hashlib
+import re
+import string
+from functools import lru_cache
+from typing import Dict, Iterable, List, Sequence
+
+import nltk
+import numpy as np
+from nltk.sentiment.vader import VaderConstants
+
+from .nltk_resources import get_vader_lexicon_path
+
+ENGINE_VERSION = 1
+
+TOLERANCE: Dict[str, float] = {"neg": 1e-3, "neu": 1e-3, "pos": 1e-3, "compound": 1e-4}
+
+_C = VaderConstants
+_PUNCT = string.punctuation
+_PUNC_SET = frozenset(_C.PUNC_LIST)
+_HAS_PUNCT = re.compile(f"[{re.escape(_PUNCT)}]").search
+_SO_THIS = ("so", "this")
+
+
+def _strip_punctuation(token: str) -> str:
+    """Drop one leading or trailing `PUNC_LIST` affix from a bare word.
+
+    Equivalent to `SentiText._words_plus_punc` lookups: the remainder must
+    be punctuation-free and longer than one character.
+    """
+    lead = len(token) - len(token.lstrip(_PUNCT))
+    if lead:
+        word = token[lead:]
+        if token[:lead] in _PUNC_SET and len(word) > 1 and not _HAS_PUNCT(word):
+            return word
+        return token
+    trail = len(token) - len(token.rstrip(_PUNCT))
+    if trail:
+        word = token[:-trail]
+        if token[-trail:] in _PUNC_SET and len(word) > 1 and not _HAS_PUNCT(word):
+            return word
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    """VADER's `words_and_emoticons` for one text."""
+    return [_strip_punctuation(tok) for tok in text.split() if len(tok) > 1]
+
+
+def _punctuation_amplifier(text: str) -> float:
+    ep_count = min(text.count("!"), 4)
+    qm_count = text.count("?")
+    qm = 0
+    if qm_count > 1:
+        qm = qm_count * 0.18 if qm_count <= 3 else 0.96
+    return ep_count * 0.292 + qm
+
+
+class BatchVaderScorer:
+    """VADER polarity scoring for batches of texts.
+
+    Args:
+        words: Lexicon entries, lowercase.
+        valences: Mean valence of each entry, aligned with `words`.
+    """
+
+    def __init__(self, words: Sequence[str], valences: Sequence[float]) -> None:
+        self.index: Dict[str, int] = {w: i for i, w in enumerate(words)}
+        self.valences = np.asarray(valences, dtype=np.float64)
+        digest = hashlib.sha1("\n".join(words).encode("utf-8") + self.valences.tobytes()).hexdigest()
+        # Identifies engine + lexicon, e.g. for keying cached scores.
+        self.version = f"{ENGINE_VERSION}-{digest[:12]}"
+
+    @classmethod
+    def from_lexicon_text(cls, text: str) -> "BatchVaderScorer":
+        """Parse the `word<TAB>mean<TAB>...` lexicon format (last entry wins)."""
+        lexicon: Dict[str, float] = {}
+        for line in text.split("\n"):
+            word, measure = line.strip().split("\t")[0:2]
+            lexicon[word] = float(measure)
+        return cls(list(lexicon), list(lexicon.values()))
+
+    def polarity_scores(self, text: str) -> Dict[str, float]:
+        return self.score_texts([text])[0]
+
+    def score_texts(self, texts: Iterable[str]) -> List[Dict[str, float]]:
+        """Score texts in one pass.
+
+        Returns:
+            One `{"neg", "neu", "pos", "compound"}` dict per text, rounded
+            like NLTK's `polarity_scores`.
+        """
+        texts = list(texts)
+        n_docs = len(texts)
+        if not n_docs:
+            return []
+
+        words: List[str] = []
+        first: List[int] = []
+        lengths = np.zeros(n_docs, dtype=np.int64)
+        for d, text in enumerate(texts):
+            offset = len(words)
+            seen: Dict[str, int] = {}
+            for tok in tokenize(text):
+                first.append(seen.setdefault(tok, len(words)))
+                words.append(tok)
+            lengths[d] = len(words) - offset
+
+        n = len(words)
+        if not n:
+            return [_scores(0.0, 0.0, 0.0, 0.0) for _ in texts]
+
+        doc_ids = np.repeat(np.arange(n_docs), lengths)
+        ends = np.cumsum(lengths)
+        positions = np.arange(n)
+
+        # Resolve the batch vocabulary once, then gather per-token features.
+        lowers = [w.lower() for w in words]
+        vocab: Dict[str, int] = {}
+        vid = np.fromiter((vocab.setdefault(w, len(vocab)) for w in lowers), dtype=np.int64, count=n)
+        terms = list(vocab)
+        rows = np.fromiter((self.index.get(t, -1) for t in terms), dtype=np.int64, count=len(terms))[vid]
+        is_booster = np.fromiter((t in _C.BOOSTER_DICT for t in terms), dtype=bool, count=len(terms))[vid]
+        booster = np.fromiter((_C.BOOSTER_DICT.get(t, 0.0) for t in terms), dtype=np.float64, count=len(terms))[vid]
+        negated = np.fromiter((t in _C.NEGATE or "n't" in t for t in terms), dtype=bool, count=len(terms))[vid]
+        in_lex = rows >= 0
+        valence = np.where(in_lex, self.valences[rows], 0.0)
+
+        upper = np.fromiter((w.isupper() for w in words), dtype=bool, count=n)
+        n_upper = np.bincount(doc_ids, weights=upper, minlength=n_docs)
+        cap_diff = ((n_upper > 0) & (n_upper < lengths))[doc_ids]
+
+        # Boosters and "kind of" carry no valence of their own.
+        token_end = ends[doc_ids]
+        kind_of = np.zeros(n, dtype=bool)
+        kind_of[:-1] = (vid[:-1] == vocab.get("kind", -1)) & (vid[1:] == vocab.get("of", -1))
+        skip = is_booster | (kind_of & (positions < token_end - 1))
+
+        # NLTK locates tokens with `list.index`, so repeats reuse the
+        # valence computed at their first occurrence.
+        first_arr = np.asarray(first, dtype=np.int64)
+        heads = np.flatnonzero((first_arr == positions) & in_lex & ~skip)
+        values = np.zeros(n, dtype=np.float64)
+        if heads.size:
+            context = _RuleContext(
+                words, lowers, in_lex.tolist(), valence.tolist(), is_booster.tolist(), booster.tolist(),
+                negated.tolist(), cap_diff.tolist(), (token_end - lengths[doc_ids]).tolist(), token_end.tolist(),
+            )
+            values[heads] = [context.valence(p) for p in heads.tolist()]
+        sentiments = values[first_arr]
+
+        # "but" halves what precedes its first occurrence and boosts what follows.
+        but_positions = np.flatnonzero(vid == vocab.get("but", -1))
+        if but_positions.size:
+            docs_with_but, idx = np.unique(doc_ids[but_positions], return_index=True)
+            pivot = np.full(n_docs, -1, dtype=np.int64)
+            pivot[docs_with_but] = but_positions[idx]
+            token_pivot = pivot[doc_ids]
+            scale = np.where(positions < token_pivot, 0.5, np.where(positions > token_pivot, 1.5, 1.0))
+            sentiments = np.where(token_pivot >= 0, sentiments * scale, sentiments)
+
+        sum_s = np.bincount(doc_ids, weights=sentiments, minlength=n_docs)
+        pos_sum = np.bincount(doc_ids, weights=np.where(sentiments > 0, sentiments + 1, 0.0), minlength=n_docs)
+        neg_sum = np.bincount(doc_ids, weights=np.where(sentiments < 0, sentiments - 1, 0.0), minlength=n_docs)
+        neu_count = np.bincount(doc_ids, weights=sentiments == 0, minlength=n_docs)
+
+        amplifier = np.array([_punctuation_amplifier(t) for t in texts])
+        sum_s = np.where(sum_s > 0, sum_s + amplifier, np.where(sum_s < 0, sum_s - amplifier, sum_s))
+        compound = sum_s / np.sqrt(sum_s * sum_s + 15)
+
+        abs_neg = np.abs(neg_sum)
+        pos_adj = np.where(pos_sum > abs_neg, pos_sum + amplifier, pos_sum)
+        neg_adj = np.where(pos_sum < abs_neg, neg_sum - amplifier, neg_sum)
+        total = pos_adj + np.abs(neg_adj) + neu_count
+        empty = lengths == 0
+        total[empty] = 1.0
+        pos = np.where(empty, 0.0, np.abs(pos_adj / total))
+        neg = np.where(empty, 0.0, np.abs(neg_adj / total))
+        neu = np.where(empty, 0.0, np.abs(neu_count / total))
+        compound[empty] = 0.0
+
+        return [
+            _scores(*values)
+            for values in zip(neg.tolist(), neu.tolist(), pos.tolist(), compound.tolist())
+        ]
+
+
+def _scores(neg: float, neu: float, pos: float, compound: float) -> Dict[str, float]:
+    return {"neg": round(neg, 3), "neu": round(neu, 3), "pos": round(pos, 3), "compound": round(compound, 4)}
+
+
+class _RuleContext:
+    """Flat per-token features of one batch, for the positional rules."""
+
+    def __init__(self, words, lowers, in_lex, valence, is_booster, booster, negated, cap_diff, starts, ends) -> None:
+        self.words = words
+        self.lowers = lowers
+        self.in_lex = in_lex
+        self.valence0 = valence
+        self.is_booster = is_booster
+        self.booster = booster
+        self.negated = negated
+        self.cap_diff = cap_diff
+        self.starts = starts
+        self.ends = ends
+
+    def valence(self, p: int) -> float:
+        """`SentimentIntensityAnalyzer.sentiment_valence` at flat position `p`."""
+        words, in_lex, negated = self.words, self.in_lex, self.negated
+        i = p - self.starts[p]
+        cap_diff = self.cap_diff[p]
+        valence = self.valence0[p]
+        if cap_diff and words[p].isupper():
+            valence = valence + _C.C_INCR if valence > 0 else valence - _C.C_INCR
+
+        for start_i in range(3):
+            q = p - (start_i + 1)
+            if i <= start_i or in_lex[q]:
+                continue
+            scalar = 0.0
+            if self.is_booster[q]:
+                scalar = self.booster[q]
+                if valence < 0:
+                    scalar *= -1
+                if words[q].isupper() and cap_diff:
+                    scalar = scalar + _C.C_INCR if valence > 0 else scalar - _C.C_INCR
+            if start_i == 1 and scalar != 0:
+                scalar = scalar * 0.95
+            if start_i == 2 and scalar != 0:
+                scalar = scalar * 0.9
+            valence = valence + scalar
+
+            if start_i == 0:
+                if negated[q]:
+                    valence = valence * _C.N_SCALAR
+            elif start_i == 1:
+                if words[p - 2] == "never" and words[p - 1] in _SO_THIS:
+                    valence = valence * 1.5
+                elif negated[q]:
+                    valence = valence * _C.N_SCALAR
+            else:
+                if (words[p - 3] == "never" and words[p - 2] in _SO_THIS) or words[p - 1] in _SO_THIS:
+                    valence = valence * 1.25
+                elif negated[q]:
+                    valence = valence * _C.N_SCALAR
+                valence = self._idioms(valence, p)
+
+        lowers = self.lowers
+        if i > 1 and not in_lex[p - 1] and lowers[p - 1] == "least":
+            if lowers[p - 2] != "at" and lowers[p - 2] != "very":
+                valence = valence * _C.N_SCALAR
+        elif i > 0 and not in_lex[p - 1] and lowers[p - 1] == "least":
+            valence = valence * _C.N_SCALAR
+        return valence
+
+    def _idioms(self, valence: float, p: int) -> float:
+        words = self.words
+        w0, w1, w2, w3 = words[p], words[p - 1], words[p - 2], words[p - 3]
+        twoone = f"{w2} {w1}"
+        threetwo = f"{w3} {w2}"
+        for seq in (f"{w1} {w0}", f"{w2} {w1} {w0}", twoone, f"{w3} {w2} {w1}", threetwo):
+            if seq in _C.SPECIAL_CASE_IDIOMS:
+                valence = _C.SPECIAL_CASE_IDIOMS[seq]
+                break
+        end = self.ends[p]
+        if end - 1 > p:
+            zeroone = f"{w0} {words[p + 1]}"
+            if zeroone in _C.SPECIAL_CASE_IDIOMS:
+                valence = _C.SPECIAL_CASE_IDIOMS[zeroone]
+        if end - 1 > p + 1:
+            zeroonetwo = f"{w0} {words[p + 1]} {words[p + 2]}"
+            if zeroonetwo in _C.SPECIAL_CASE_IDIOMS:
+                valence = _C.SPECIAL_CASE_IDIOMS[zeroonetwo]
+        if threetwo in _C.BOOSTER_DICT or twoone in _C.BOOSTER_DICT:
+            valence = valence + _C.B_DECR
+        return valence
+
+
+@lru_cache()
+def get_vader_scorer() -> BatchVaderScorer:
+    """Process-wide scorer compiled from the local VADER lexicon."""
+    return BatchVaderScorer.from_lexicon_text(nltk.data.load(get_vader_lexicon_path(), format="text"))
@@ -1,46 +1,339 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+import logging
+import math
+import threading
+from datetime import date
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
 import pandas as pd
+from pymongo.errors import OperationFailure
 
-from .db import fetch_collection
+from ..core.config import get_settings
+from .article_service import pub_date_filter
+from .article_store import get_article_store
+from .db import ensure_index, get_collection
+from .keyword_service import KEYWORD_COLLECTION, get_keyword_index
+from .payload_cache import get_data_version
+from .rollup_service import ROLLUP_FIELDS, load_rollups, rollup_cells, rollups_available
 
+logger = logging.getLogger(__name__)
 
-def get_visualization_payload(source: Optional[str] = None) -> Dict[str, Any]:
-    """Aggregate polarity by date and compute top keywords from stored polarity data.
+POLARITY_COLLECTION = "PolarityData"
+_FIELDS = {"_id": 0, "pub_date": 1, "source": 1, "compound": 1, "label": 1}
 
-    Args:
-        source: Optional source filter
+_indexes_ready = False
+_indexes_lock = threading.Lock()
 
-    Returns:
-        Dict payload with trends and summary series.
+
+def ensure_visualize_indexes() -> None:
+    """Create the PolarityData indexes used by the /visualize `$match`, once per process."""
+    global _indexes_ready
+    if _indexes_ready:
+        return
+    with _indexes_lock:
+        if not _indexes_ready:
+            ensure_index(POLARITY_COLLECTION, [("source", 1), ("pub_date", 1)])
+            ensure_index(POLARITY_COLLECTION, [("pub_date", 1)])
+            _indexes_ready = True
+
+
+def _sources(source: Union[str, Sequence[str], None]) -> Optional[List[str]]:
+    if not source:
+        return None
+    return [source] if isinstance(source, str) else list(source)
+
+
+def _match(source: Union[str, Sequence[str], None], start: Optional[str], end: Optional[str]) -> Dict[str, Any]:
+    """Index-friendly filter on source(s) and an inclusive day range."""
+    match: Dict[str, Any] = {}
+    sources = _sources(source)
+    if sources:
+        match["source"] = sources[0] if len(sources) == 1 else {"$in": sources}
+    match.update(pub_date_filter(start, end))
+    return match
+
+
+def _label_count(value: int) -> Dict[str, Any]:
+    return {"$sum": {"$cond": [{"$eq": ["$label", value]}, 1, 0]}}
+
+
+def build_polarity_pipeline(
+    source: Union[str, Sequence[str], None] = None,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    by_source: bool = False,
+) -> List[Dict[str, Any]]:
+    """Aggregation computing per-day compound sums plus the overall summary.
+
+    With `by_source` the daily cells are also split by source.
+    """
+    day = {
+        "$dateToString": {
+            "format": "%Y-%m-%d",
+            "date": {"$convert": {"input": "$pub_date", "to": "date", "onError": None, "onNull": None}},
+        }
+    }
+    project: Dict[str, Any] = {"_id": 0, "compound": 1, "label": 1, "day": day}
+    cell: Any = "$day"
+    if by_source:
+        project["source"] = 1
+        cell = {"day": "$day", "source": "$source"}
+    return [
+        {"$match": _match(source, start, end)},
+        {"$project": project},
+        {"$facet": {
+            "cells": [
+                {"$match": {"day": {"$ne": None}}},
+                {"$group": {"_id": cell, "compound_sum": {"$sum": "$compound"}, "count": {"$sum": 1}}},
+            ],
+            "summary": [
+                {"$group": {
+                    "_id": None,
+                    "count": {"$sum": 1},
+                    "avg_compound": {"$avg": "$compound"},
+                    "pos": _label_count(1),
+                    "neg": _label_count(-1),
+                    "neu": _label_count(0),
+                }},
+            ],
+        }},
+    ]
+
+
+def _aggregate(
+    sources: Optional[List[str]], start: Optional[str], end: Optional[str], by_source: bool
+) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    ensure_visualize_indexes()
+    pipeline = build_polarity_pipeline(sources, start, end, by_source=by_source)
+    result = next(get_collection(POLARITY_COLLECTION).aggregate(pipeline), None)
+    if not result or not result["summary"]:
+        return _empty_cells(), {}
+    cells = pd.DataFrame([
+        {
+            "date": row["_id"]["day"] if by_source else row["_id"],
+            "source": row["_id"].get("source") if by_source else None,
+            "compound_sum": float(row["compound_sum"] or 0.0),
+            "count": int(row["count"]),
+        }
+        for row in result["cells"]
+    ], columns=_CELL_COLUMNS)
+    totals = result["summary"][0]
+    summary = {
+        "count": int(totals["count"]),
+        "avg_compound": float(totals["avg_compound"] or 0.0),
+        "pos": int(totals["pos"]),
+        "neg": int(totals["neg"]),
+        "neu": int(totals["neu"]),
+    }
+    return cells, summary
+
+
+def _load_polarity(sources: Optional[List[str]], start: Optional[str], end: Optional[str]) -> pd.DataFrame:
+    """Load polarity rows for the pandas path.
+
+    The columnar store reads only the needed columns and prunes
+    partitions; the Mongo fallback filters and projects server-side.
     """
-    records = fetch_collection("PolarityData")
-    if source:
-        records = [r for r in records if r.get("source") == source]
+    if get_settings().visualize_source == "store":
+        return get_article_store().scan(
+            "polarity",
+            columns=["pub_date", "source", "compound", "label"],
+            start=start,
+            end=end,
+            sources=sources,
+        )
+    return pd.DataFrame(list(get_collection(POLARITY_COLLECTION).find(_match(sources, start, end), _FIELDS)))
 
-    if not records:
-        return {"trends": [], "summary": {}}
 
-    df = pd.DataFrame(records)
-    if "pub_date" in df.columns:
-        df["pub_date"] = pd.to_datetime(df["pub_date"])  # mongo datetime
-        df["date"] = df["pub_date"].dt.date
-    else:
-        df["date"] = None
+_CELL_COLUMNS = ["date", "source", "compound_sum", "count"]
+
+
+def _empty_cells() -> pd.DataFrame:
+    return pd.DataFrame(columns=_CELL_COLUMNS)
+
+
+def _summarize_cells(cells: pd.DataFrame) -> Dict[str, Any]:
+    """Overall summary from `(date, source)` cells carrying label counts."""
+    if cells.empty or not cells["count"].sum():
+        return {}
+    totals = cells[list(ROLLUP_FIELDS)].sum()
+    return {
+        "count": int(totals["count"]),
+        "avg_compound": float(totals["compound_sum"] / totals["count"]),
+        "pos": int(totals["pos"]),
+        "neg": int(totals["neg"]),
+        "neu": int(totals["neu"]),
+    }
 
+
+def _series(cells: pd.DataFrame, granularity: str, max_points: int) -> Tuple[List[Dict[str, Any]], int]:
+    """Count-weighted mean compound per period, capped at `max_points`.
+
+    Daily cells are bucketed into calendar periods (weeks start on
+    Monday). When more than `max_points` periods remain, runs of
+    `ceil(n / max_points)` adjacent periods are merged. Each merged
+    point is labelled with its first period and is still an exact mean
+    of the rows it covers.
+
+    Returns:
+        The points and the number of periods merged into each one.
+    """
+    dated = cells.dropna(subset=["date"])
+    if dated.empty:
+        return [], 1
+    days = pd.to_datetime(dated["date"], format="%Y-%m-%d", errors="coerce")
+    periods = days.dt.to_period(_PERIODS[granularity]).dt.start_time
     grouped = (
-        df.groupby("date")["compound"].mean().reset_index().rename(columns={"compound": "avg_compound"})
+        dated.assign(period=periods.values)
+        .groupby("period")[["compound_sum", "count"]].sum()
+        .sort_index()
     )
+    grouped = grouped[grouped["count"] > 0]
+    step = max(1, math.ceil(len(grouped) / max_points))
+    if step > 1:
+        buckets = np.arange(len(grouped)) // step
+        labels = grouped.index.to_series().groupby(buckets).first()
+        grouped = grouped.groupby(buckets).sum().set_index(labels.values)
+    avg = grouped["compound_sum"] / grouped["count"]
+    points = [
+        {"date": period.date().isoformat(), "avg_compound": float(mean), "count": int(count)}
+        for period, mean, count in zip(grouped.index, avg, grouped["count"])
+    ]
+    return points, step
 
-    trends = [{"date": str(r["date"]), "avg_compound": float(r["avg_compound"]) } for _, r in grouped.iterrows()]
 
-    summary = {
-        "count": int(len(df)),
-        "avg_compound": float(df.get("compound", pd.Series([0])).mean()) if "compound" in df else 0.0,
-        "pos": int((df.get("label", pd.Series([])) == 1).sum()) if "label" in df else 0,
-        "neg": int((df.get("label", pd.Series([])) == -1).sum()) if "label" in df else 0,
-        "neu": int((df.get("label", pd.Series([])) == 0).sum()) if "label" in df else 0,
+_PERIODS = {"day": "D", "week": "W-SUN", "month": "M"}
+GRANULARITIES = tuple(_PERIODS)
+
+
+def _weighted(ranked: List[Tuple[str, float]]) -> List[Dict[str, Any]]:
+    return [{"term": term, "weight": round(weight, 4)} for term, weight in ranked]
+
+
+def visualization_version() -> Tuple[int, int]:
+    """Changes whenever a /visualize payload could: polarity or keyword writes.
+
+    Both counters live in the database, so every worker agrees on them.
+    """
+    return get_data_version(POLARITY_COLLECTION), get_data_version(KEYWORD_COLLECTION)
+
+
+def visualize_params(args: Any) -> Dict[str, Any]:
+    """`get_visualization_payload` keyword arguments from query args (a MultiDict).
+
+    Raises:
+        ValueError: On an unknown granularity or group_by, a malformed
+            date, or a non-positive `max_points`.
+    """
+    start, end = args.get("from") or None, args.get("to") or None
+    for value in (start, end):
+        if value:
+            try:
+                date.fromisoformat(value)
+            except ValueError:
+                raise ValueError(f"Invalid date '{value}'; expected YYYY-MM-DD") from None
+    granularity = (args.get("granularity") or "day").lower()
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"granularity must be one of: {', '.join(GRANULARITIES)}")
+    group_by = args.get("group_by") or None
+    if group_by not in (None, "source"):
+        raise ValueError("group_by must be 'source'")
+    max_points = args.get("max_points")
+    try:
+        max_points = int(max_points) if max_points else None
+    except ValueError:
+        raise ValueError("max_points must be an integer") from None
+    if max_points is not None and max_points < 1:
+        raise ValueError("max_points must be positive")
+    return {
+        "source": [s for s in args.getlist("source") if s] or None,
+        "start": start,
+        "end": end,
+        "granularity": granularity,
+        "group_by": group_by,
+        "max_points": max_points,
     }
 
-    return {"trends": trends, "summary": summary}
+
+def get_visualization_payload(
+    source: Union[str, Sequence[str], None] = None,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    granularity: str = "day",
+    group_by: Optional[str] = None,
+    max_points: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Aggregate polarity over time and add the top TF-IDF keywords of the articles.
+
+    With `VISUALIZE_SOURCE=rollup` the trends and summary are summed from
+    the daily `(date, source)` rollups, reading one document per day and
+    source; until rollups have been built the `mongo` path is used. With
+    `mongo` they are computed by a MongoDB aggregation pipeline. Stand-ins
+    that cannot run it (e.g. the SQLite backend) fall back to grouping the
+    projected rows in pandas. Every path yields daily cells, which are then
+    resampled to the requested granularity.
+
+    Args:
+        source: Optional source, or list of sources, to include
+        start: Optional first day (YYYY-MM-DD), inclusive
+        end: Optional last day (YYYY-MM-DD), inclusive
+        granularity: `day`, `week` or `month`
+        group_by: `source` to add one series per source
+        max_points: Cap on points per series (at most
+            `settings.visualize_max_points`); longer series are downsampled
+
+    Returns:
+        Dict payload with trends, summary, keywords and the top keywords of
+        each period (`keyword_trends`); `series` per source when grouped.
+    """
+    if granularity not in _PERIODS:
+        raise ValueError(f"granularity must be one of: {', '.join(GRANULARITIES)}")
+    settings = get_settings()
+    sources = _sources(source)
+    by_source = group_by == "source"
+    max_points = min(max_points or settings.visualize_max_points, settings.visualize_max_points)
+
+    keyword_index = get_keyword_index()
+    keywords = _weighted(keyword_index.top_keywords(settings.keyword_top_k, start=start, end=end, sources=sources))
+    keyword_trends = [
+        {"date": period, "keywords": _weighted(ranked)}
+        for period, ranked in keyword_index.keyword_series(
+            settings.keyword_series_top_k, granularity, start=start, end=end, sources=sources, max_points=max_points
+        )
+    ]
+
+    mode = settings.visualize_source
+    if mode == "rollup" and not rollups_available():
+        logger.info("Polarity rollups not built yet; aggregating PolarityData (backfill with `python -m app.services.rollup_service`)")
+        mode = "mongo"
+    if mode == "rollup":
+        cells = load_rollups(sources, start, end)
+        summary = _summarize_cells(cells)
+    elif mode == "mongo":
+        try:
+            cells, summary = _aggregate(sources, start, end, by_source)
+        except (NotImplementedError, OperationFailure) as exc:
+            logger.warning("Aggregation unavailable (%s); grouping PolarityData in pandas", exc)
+            cells = rollup_cells(_load_polarity(sources, start, end))
+            summary = _summarize_cells(cells)
+    else:
+        cells = rollup_cells(_load_polarity(sources, start, end))
+        summary = _summarize_cells(cells)
+
+    trends, step = _series(cells, granularity, max_points)
+    payload: Dict[str, Any] = {
+        "trends": trends,
+        "summary": summary,
+        "keywords": keywords,
+        "keyword_trends": keyword_trends,
+        "granularity": granularity,
+        "points_per_bucket": step,
+    }
+    if by_source:
+        payload["series"] = {
+            str(name): _series(group, granularity, max_points)[0]
+            for name, group in cells.fillna({"source": "unknown"}).groupby("source", sort=True)
+        }
+    return payload
@@ -0,0 +1,14 @@
+import pytest
+
+from app.services import db
+
+
+@pytest.fixture
+def sqlite_settings(tmp_path, monkeypatch):
+    """Point the storage backend at a throwaway SQLite file."""
+    settings = db.get_settings()
+    monkeypatch.setattr(settings, "storage_backend", "sqlite")
+    monkeypatch.setattr(settings, "sqlite_db_path", str(tmp_path / "db.sqlite3"))
+    db.close_storage_backend()
+    yield settings
+    db.close_storage_backend()
@@ -12,8 +12,37 @@ def test_vader_analyze_texts_basic():
     assert 1 in labels and -1 in labels
 
 
-def test_keywords_extraction():
+def test_keywords_extraction(sqlite_settings):
     analyzer = get_analyzer()
     kws = analyzer.extract_keywords(["Apple launches new iPhone", "Apple and Google partner"])
     assert isinstance(kws, list)
     assert len(kws) > 0
+
+
+def test_get_analyzer_returns_shared_instance():
+    assert get_analyzer() is get_analyzer()
+
+
+def test_registry_builds_each_backend_once_across_threads():
+    import threading
+
+    from app.services.analyzer_service import AnalyzerRegistry
+
+    calls = []
+
+    def build():
+        calls.append(1)
+        return object()
+
+    registry = AnalyzerRegistry({"stub": build})
+    seen = []
+    threads = [threading.Thread(target=lambda: seen.append(registry.get("stub"))) for _ in range(16)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(calls) == 1
+    assert all(s is seen[0] for s in seen)
+    assert set(registry.load_times()) == {"stub"}
+    with pytest.raises(ValueError, match="stub"):
+        registry.get("missing")
@@ -0,0 +1,70 @@
+from datetime import datetime, timedelta
+
+import pytest
+from bson import ObjectId
+
+from app.services import article_service, db
+
+
+@pytest.fixture
+def articles(sqlite_settings, monkeypatch):
+    monkeypatch.setattr(article_service, "_indexes_ready", False)
+    start = datetime(2024, 5, 1)
+    docs = []
+    for i in range(20):
+        day = start + timedelta(hours=6 * i)
+        docs.append({
+            "_id": ObjectId.from_datetime(start + timedelta(seconds=i)),
+            # Extractor rows carry dates, /analyze rows ISO strings
+            "pub_date": day if i % 2 else day.isoformat() + "Z",
+            "source": "BBC" if i % 3 else "CNN",
+            "label": (i % 3) - 1,
+            "title": f"t{i}",
+        })
+    docs.append({"title": "undated", "source": "BBC", "label": 0})
+    db.get_collection("PolarityData").insert_many(docs)
+    return docs
+
+
+def _pages(**filters):
+    titles, cursor = [], None
+    while True:
+        page = article_service.list_articles(limit=6, cursor=cursor, fields=["title"], **filters)
+        titles += [item["title"] for item in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return titles
+
+
+def test_pages_cover_everything_once_newest_first(articles):
+    titles = _pages()
+    assert titles == [f"t{i}" for i in reversed(range(20))] + ["undated"]
+
+
+def test_filters_and_projection(articles):
+    assert _pages(sources=["CNN"]) == [f"t{i}" for i in (18, 15, 12, 9, 6, 3, 0)]
+    assert _pages(labels=[1], start="2024-05-02", end="2024-05-03") == ["t11", "t8", "t5"]
+    page = article_service.list_articles(limit=1, fields=["title", "_id"])
+    assert set(page["items"][0]) == {"title", "_id"} and isinstance(page["items"][0]["_id"], str)
+    full = article_service.list_articles(limit=1)["items"][0]
+    assert "_id" not in full and full["title"] == "t19"
+
+
+def test_invalid_input_raises_value_error(articles):
+    with pytest.raises(ValueError):
+        article_service.list_articles(cursor="not-a-cursor")
+    with pytest.raises(ValueError):
+        article_service.list_articles(limit=0)
+
+
+def test_typed_keyset_includes_lower_bson_types():
+    after = db._after("pub_date", datetime(2024, 5, 1), ObjectId("0" * 24), typed=True)
+    assert {"pub_date": {"$type": "string"}} in after["$or"]
+    assert {"pub_date": None} in after["$or"]
+    assert db._after("pub_date", None, "x", typed=True) == {"$or": [{"pub_date": None, "_id": {"$lt": "x"}}]}
+
+
+def test_iter_collection_streams_batches(articles):
+    batches = list(db.iter_collection("PolarityData", {"title": 1, "_id": 0}, batch_size=8))
+    assert [len(b) for b in batches] == [8, 8, 5]
+    assert len(db.fetch_collection("PolarityData")) == 21
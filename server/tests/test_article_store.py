@@ -0,0 +1,68 @@
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from app.services.article_store import DATASETS, ColumnarStore, _schemas
+
+
+def _articles():
+    return pd.DataFrame({
+        "title": ["a", "b", "c"],
+        "source": ["Al Jazeera English", "Reuters", "Reuters"],
+        "pub_date": [date(2024, 10, 20), date(2024, 10, 21), date(2024, 10, 22)],
+        "tokens": [["state", "race"], ["market"], []],
+        "lems": ["state race", "market", ""],
+        "not_in_schema": [1, 2, 3],
+    })
+
+
+def test_round_trip_keeps_types(tmp_path):
+    store = ColumnarStore(str(tmp_path))
+    assert store.write("articles", _articles()) == 3
+    df = store.scan("articles", columns=["title", "tokens", "pub_date", "source"]).sort_values("title")
+    assert list(df["tokens"].iloc[0]) == ["state", "race"]
+    assert df["pub_date"].iloc[0] == date(2024, 10, 20)
+    assert df["source"].iloc[0] == "Al Jazeera English"
+
+
+def test_scan_prunes_by_date_and_source(tmp_path):
+    store = ColumnarStore(str(tmp_path))
+    store.write("articles", _articles())
+    df = store.scan("articles", columns=["title"], start="2024-10-21", end="2024-10-21", sources=["Reuters"])
+    assert df["title"].tolist() == ["b"]
+    assert store.scan("polarity").empty
+
+
+def test_replace_partitions_and_export(tmp_path):
+    store = ColumnarStore(str(tmp_path / "store"))
+    for mean in (0.1, 0.5):
+        entry = {"date": "2024-10-21", "mean_compound": mean, "count": 2, "pos": 1, "neg": 1, "neu": 0}
+        store.write("mean_polarity", pd.DataFrame([entry]), date_column="date", replace_partitions=True)
+    assert store.scan("mean_polarity")["mean_compound"].tolist() == [0.5]
+
+    path = store.export_csv("mean_polarity", str(tmp_path / "out" / "mean.csv"), start="2024-10-01")
+    assert pd.read_csv(path)["count"].tolist() == [2]
+
+
+def test_compact_merges_part_files_per_partition(tmp_path):
+    store = ColumnarStore(str(tmp_path))
+    for _ in range(3):
+        store.write("articles", _articles())
+    before = store.scan("articles", columns=["title", "tokens", "date", "source"]).sort_values("title")
+
+    assert store.compact("articles") == {"partitions": 3, "files": 9}
+    assert all(len(list(p.glob("*.parquet"))) == 1 for p in tmp_path.glob("articles/date=*/source=*"))
+    after = store.scan("articles", columns=["title", "tokens", "date", "source"]).sort_values("title")
+    pd.testing.assert_frame_equal(after.reset_index(drop=True), before.reset_index(drop=True))
+    assert store.compact("articles") == {"partitions": 0, "files": 0}
+
+
+def test_export_rejects_unknown_datasets_before_writing(tmp_path):
+    assert set(DATASETS) == set(_schemas())
+    victim = tmp_path / "victim.csv"
+    victim.write_text("keep me")
+    store = ColumnarStore(str(tmp_path / "store"))
+    with pytest.raises(ValueError):
+        store.export_csv("../victim", str(victim))
+    assert victim.read_text() == "keep me"
@@ -0,0 +1,134 @@
+import pytest
+from pymongo import InsertOne
+from pymongo.errors import AutoReconnect, BulkWriteError, OperationFailure
+
+from app.services import db
+
+
+class FakeResult:
+    def __init__(self, details):
+        self.bulk_api_result = details
+
+
+class FakeCollection:
+    """Applies InsertOne/UpdateOne to a dict keyed on `_id` or the upsert key."""
+
+    name = "Fake"
+
+    def __init__(self, failures=0):
+        self.docs = {}
+        self.batches = []
+        self.failures = failures
+
+    def bulk_write(self, ops, ordered=True):
+        assert ordered is False
+        if self.failures:
+            self.failures -= 1
+            raise AutoReconnect("primary stepped down")
+        self.batches.append(len(ops))
+        details = {"nInserted": 0, "nUpserted": 0, "nMatched": 0, "nModified": 0, "writeErrors": []}
+        for i, op in enumerate(ops):
+            doc = op._doc
+            if isinstance(op, InsertOne):
+                if doc["_id"] in self.docs:
+                    details["writeErrors"].append({"index": i, "code": 11000})
+                    continue
+                self.docs[doc["_id"]] = dict(doc)
+                details["nInserted"] += 1
+            else:
+                (key, value), = op._filter.items()
+                fields = doc["$set"]
+                current = self.docs.get(value)
+                if current is None:
+                    self.docs[value] = dict(fields)
+                    details["nUpserted"] += 1
+                else:
+                    details["nMatched"] += 1
+                    if current != fields:
+                        current.update(fields)
+                        details["nModified"] += 1
+        if details["writeErrors"]:
+            raise BulkWriteError(details)
+        return FakeResult(details)
+
+
+@pytest.fixture
+def fake(monkeypatch):
+    collection = FakeCollection()
+    monkeypatch.setattr(db, "get_collection", lambda name: collection)
+    monkeypatch.setattr(db, "_ensure_key_index", lambda name, key: None)
+    monkeypatch.setattr(db.time, "sleep", lambda seconds: None)
+    return collection
+
+
+def _records(n, title="t"):
+    return [{"url": f"https://x/{i}", "title": title} for i in range(n)]
+
+
+def test_upserts_are_idempotent_and_counted(fake):
+    first = db.bulk_upsert("News", _records(5), key="url", batch_size=2)
+    assert (first.inserted, first.updated, first.skipped, first.batches) == (5, 0, 0, 3)
+    assert fake.batches == [2, 2, 1]
+
+    records = _records(5)
+    records[0]["title"] = "changed"
+    second = db.bulk_upsert("News", records, key="url", batch_size=10)
+    assert (second.inserted, second.updated, second.skipped) == (0, 1, 4)
+    assert len(fake.docs) == 5
+
+
+def test_batches_are_bounded_by_bytes(fake):
+    records = [{"url": str(i), "body": "x" * 100} for i in range(4)]
+    db.bulk_upsert("News", records, key="url", batch_size=100, batch_bytes=300)
+    assert fake.batches == [2, 2]
+
+
+def test_transient_errors_are_retried(fake):
+    fake.failures = 2
+    result = db.bulk_upsert("News", _records(3), key="url", retries=3)
+    assert result.inserted == 3
+    assert result.retries == 2
+
+
+def test_retries_are_bounded(fake):
+    fake.failures = 5
+    with pytest.raises(AutoReconnect):
+        db.bulk_upsert("News", _records(1), key="url", retries=1)
+
+
+def test_keyless_records_skip_duplicates_on_replay(fake):
+    records = [{"title": "a"}, {"title": "b"}]
+    db.bulk_upsert("News", records, key="url")
+    # The caller's dicts are not mutated, so pin ids to simulate a replayed batch
+    replay = list(fake.docs.values())
+    result = db.bulk_upsert("News", replay + [{"title": "c"}])
+    assert (result.inserted, result.skipped) == (1, 2)
+    assert "_id" not in records[0]
+
+
+def test_other_write_errors_propagate(fake, monkeypatch):
+    def fail(ops, ordered=True):
+        raise BulkWriteError({"writeErrors": [{"index": 0, "code": 121}]})
+
+    monkeypatch.setattr(fake, "bulk_write", fail)
+    with pytest.raises(BulkWriteError):
+        db.bulk_upsert("News", _records(1), key="url")
+
+
+def test_insert_many_returns_inserted_count(fake):
+    assert db.insert_many("News", _records(3), key="url") == 3
+    assert db.insert_many("News", []) == 0
+
+
+def test_key_index_failure_is_tolerated(monkeypatch):
+    calls = []
+
+    def ensure(name, keys, unique=False, **options):
+        calls.append((name, keys, unique, options))
+        raise OperationFailure("E11000 duplicate key error", code=11000)
+
+    monkeypatch.setattr(db, "ensure_index", ensure)
+    monkeypatch.setattr(db, "_key_indexes", set())
+    db._ensure_key_index("News", "url")
+    db._ensure_key_index("News", "url")
+    assert calls == [("News", [("url", 1)], True, {"partialFilterExpression": {"url": {"$type": "string"}}})]
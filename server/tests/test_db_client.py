@@ -0,0 +1,38 @@
+import os
+
+import pytest
+
+from app.services import db
+
+
+@pytest.fixture
+def local_uri(monkeypatch):
+    settings = db.get_settings()
+    monkeypatch.setattr(settings, "mongo_uri", "mongodb://127.0.0.1:1/?serverSelectionTimeoutMS=50")
+    monkeypatch.setattr(settings, "db_name", "testdb")
+    db.close_mongo_client()
+    yield
+    db.close_mongo_client()
+
+
+def test_client_is_shared_and_lazy(local_uri):
+    client = db.get_mongo_client()
+    assert db.get_mongo_client() is client
+    assert db.get_collection("DailyNews").database.client is client
+    stats = db.mongo_pool_stats()
+    assert stats["initialized"] and stats["open_connections"] == 0
+    assert stats["max_pool_size"] == db.get_settings().mongo_max_pool_size
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires fork()")
+def test_forked_child_builds_its_own_client(local_uri):
+    parent = db.get_mongo_client()
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:  # pragma: no cover - child process
+        ok = not db.mongo_pool_stats()["initialized"] and db.get_mongo_client() is not parent
+        os.write(write_fd, b"1" if ok else b"0")
+        os._exit(0)
+    os.waitpid(pid, 0)
+    assert os.read(read_fd, 1) == b"1"
+    assert db.get_mongo_client() is parent
@@ -0,0 +1,20 @@
+from app.services.dedup_service import NearDuplicateIndex, cluster_duplicates
+
+WIRE = (
+    "the federal reserve held interest rates steady on wednesday while signalling that "
+    "cuts could come later this year as inflation continues to cool across the economy"
+).split()
+
+
+def test_syndicated_copies_cluster_together():
+    edited = WIRE[:-2] + ["us", "economy"]
+    unrelated = "apple unveiled a new iphone with a faster chip and a better camera at its event".split()
+    assert cluster_duplicates([WIRE, edited, unrelated, list(WIRE)], threshold=0.7) == [None, 0, None, 0]
+
+
+def test_threshold_controls_matching():
+    half = WIRE[: len(WIRE) // 2] + "markets rallied after the announcement with stocks rising sharply".split()
+    strict = NearDuplicateIndex(threshold=0.9)
+    strict.add("a", WIRE)
+    assert strict.add("b", half) is None
+    assert strict.add("c", []) is None
@@ -0,0 +1,32 @@
+import pytest
+
+from app.services import email_service
+
+
+@pytest.mark.parametrize("spec", [
+    "store:../victim",
+    "store:articles/../../victim",
+    "store:polarity:2024-05-01:../../x",
+    "store:polarity:May",
+])
+def test_store_specs_are_validated_before_writing(spec, tmp_path, monkeypatch):
+    exports = []
+    monkeypatch.setattr(email_service, "get_article_store", lambda: exports.append(spec))
+    with pytest.raises(ValueError):
+        email_service._resolve_attachment(spec, str(tmp_path / "tmp"))
+    assert exports == []
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_store_spec_exports_inside_tmp_dir(tmp_path, monkeypatch):
+    class Store:
+        def export_csv(self, dataset, path, start=None, end=None):
+            self.args = (dataset, path, start, end)
+            return path
+
+    store = Store()
+    monkeypatch.setattr(email_service, "get_article_store", lambda: store)
+    path = email_service._resolve_attachment("store:polarity:2024-05-01:2024-05-31", str(tmp_path))
+    assert path == str(tmp_path / "polarity_2024-05-01_2024-05-31.csv")
+    assert store.args[2:] == ("2024-05-01", "2024-05-31")
+    assert email_service._resolve_attachment("assets/report.csv", str(tmp_path)) == "assets/report.csv"
@@ -0,0 +1,118 @@
+import json
+
+import pytest
+
+from app.services import article_store, extractor_service, fingerprint_service, keyword_service, payload_cache
+from app.services.db import get_collection
+
+
+def _article(i, photo="https://img.example/p.jpg"):
+    return {
+        "title": f"Markets rally {i}",
+        "author": "AP",
+        "source": {"id": None, "name": "Reuters"},
+        "description": "Stocks rose",
+        "content": f"Investors cheered earnings {i}",
+        "pub_date": "2024-05-01T10:00:00Z",
+        "url": f"https://example.com/{i}",
+        "photo_url": photo,
+    }
+
+
+@pytest.fixture
+def extract_env(sqlite_settings, tmp_path, monkeypatch):
+    """Extraction against SQLite, a throwaway article store and keyword counts."""
+    monkeypatch.setattr(sqlite_settings, "store_path", str(tmp_path / "store"))
+    monkeypatch.setattr(sqlite_settings, "dedup_enabled", False)
+    monkeypatch.setattr(article_store, "_store", None)
+    monkeypatch.setattr(fingerprint_service, "_index", None)
+    monkeypatch.setattr(keyword_service, "_indexes_ready", False)
+    monkeypatch.setattr(keyword_service, "_index", None)
+    monkeypatch.setattr(payload_cache, "_versions", {})
+    return sqlite_settings
+
+
+def test_only_persisted_rows_are_committed_and_counted(extract_env):
+    articles = [_article(0), _article(1, photo=None), _article(2)]
+    chunk = extractor_service._process_chunk(articles)
+    assert (chunk.fetched, chunk.new, chunk.skipped, chunk.dropped) == (3, 2, 0, 1)
+    assert get_collection("DailyNews").count_documents({}) == 2
+    assert keyword_service.get_keyword_index().documents == 2
+
+    # The dropped article was not marked as seen; a fixed copy is picked up later
+    again = extractor_service._process_chunk([_article(0), _article(1), _article(2)])
+    assert (again.new, again.skipped, again.dropped) == (1, 2, 0)
+    assert [r["url"] for r in again.records] == ["https://example.com/1"]
+
+
+class StubFetcher:
+    def __init__(self, batches):
+        self.batches = batches
+
+    def iter_domains(self, domains, from_date):
+        for domain in domains:
+            yield domain, self.batches[domain]
+
+    def cache_stats(self):
+        return {}
+
+
+def _api_item(i):
+    article = _article(i)
+    return dict(article, publishedAt=article.pop("pub_date"), urlToImage=article.pop("photo_url"))
+
+
+@pytest.fixture
+def stub_news(extract_env, monkeypatch):
+    monkeypatch.setattr(extract_env, "url", "https://newsapi.example/v2/everything")
+    monkeypatch.setattr(extract_env, "api_key", "key")
+    fetcher = StubFetcher({
+        "a.com": [_api_item(i) for i in range(5)],
+        "b.com": [_api_item(i) for i in range(3, 6)],
+    })
+    monkeypatch.setattr(extractor_service, "get_news_fetcher", lambda: fetcher)
+    return fetcher
+
+
+def test_chunks_split_each_domain_and_count_per_chunk(stub_news):
+    chunks = list(extractor_service.iter_extract_chunks(domains=["a.com", "b.com"], chunk_size=2))
+    assert [(c.fetched, c.new, c.skipped) for c in chunks] == [
+        (2, 2, 0), (2, 2, 0), (1, 1, 0),  # a.com: 5 articles in chunks of 2
+        (2, 0, 2), (1, 1, 0),  # b.com: articles 3 and 4 were already extracted
+    ]
+    assert [r["url"] for r in chunks[-1].records] == ["https://example.com/5"]
+
+
+def test_extract_chunks_normalize_in_process_and_large_batches_use_the_pool(extract_env, monkeypatch):
+    texts = [f"Markets rallied {i} times, banks didn't" for i in range(extract_env.normalize_parallel_min_rows)]
+    expected = extractor_service._normalize_chunk(texts)
+
+    def no_pool():
+        raise AssertionError("pool used for an extract chunk")
+
+    monkeypatch.setattr(extractor_service, "_get_normalize_pool", no_pool)
+    assert extractor_service._normalize_texts(texts[:extract_env.extract_chunk_size]) == tuple(
+        part[:extract_env.extract_chunk_size] for part in expected
+    )
+
+    class InlinePool:
+        pieces = []
+
+        def map(self, fn, chunks):
+            self.pieces.extend(len(c) for c in chunks)
+            return map(fn, chunks)
+
+    monkeypatch.setattr(extractor_service, "_get_normalize_pool", InlinePool)
+    assert extractor_service._normalize_texts(texts) == expected
+    assert set(InlinePool.pieces) == {extract_env.normalize_chunk_size}
+
+
+def test_stream_returns_ndjson_lines_and_summary(stub_news):
+    from app import create_app
+
+    response = create_app().test_client().post("/extract?stream=true", json={"domains": ["a.com", "b.com"]})
+    assert response.status_code == 200
+    assert response.mimetype == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert len(lines) == 7 and all("url" in line for line in lines[:-1])
+    assert lines[-1] == {"done": True, "fetched": 8, "new": 6, "skipped": 2, "dropped": 0}
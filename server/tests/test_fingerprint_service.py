@@ -0,0 +1,37 @@
+from app.services import fingerprint_service
+from app.services.fingerprint_service import FingerprintIndex, fingerprint, normalize_url
+
+
+def test_normalize_url_strips_tracking_and_noise():
+    a = normalize_url("HTTPS://www.Reuters.com/world/story-1/?utm_source=x&b=2&a=1#top")
+    b = normalize_url("https://reuters.com/world/story-1?a=1&b=2")
+    assert a == b == "https://reuters.com/world/story-1?a=1&b=2"
+
+
+def test_fingerprint_changes_with_content():
+    base = {"url": "https://apnews.com/a", "title": "T", "content": "v1"}
+    assert fingerprint(base) == fingerprint(dict(base, url="https://www.apnews.com/a/"))
+    assert fingerprint(base) != fingerprint(dict(base, content="v2"))
+
+
+def test_partition_skips_stored_and_in_batch_duplicates(monkeypatch):
+    stored = {fingerprint({"url": "https://x.com/old", "title": "Old", "content": ""})}
+    monkeypatch.setattr(fingerprint_service, "ensure_index", lambda *a, **k: "fingerprint_1")
+    monkeypatch.setattr(fingerprint_service, "find_values", lambda _c, _f, values: stored & set(values))
+    inserted = []
+    monkeypatch.setattr(fingerprint_service, "insert_unique", lambda _c, docs: inserted.extend(docs) or len(docs))
+
+    index = FingerprintIndex()
+    batch = [
+        {"url": "https://x.com/old", "title": "Old", "content": ""},
+        {"url": "https://x.com/new", "title": "New", "content": ""},
+        {"url": "https://x.com/new?utm_medium=rss", "title": "New", "content": ""},
+    ]
+    new, skipped = index.partition(batch)
+    assert [r["url"] for r in new] == ["https://x.com/new"]
+    assert skipped == 2
+
+    index.commit(new)
+    assert len(inserted) == 1
+    new, skipped = index.partition([{"url": "https://x.com/new", "title": "New", "content": ""}])
+    assert new == [] and skipped == 1
@@ -0,0 +1,76 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from app.services.http_cache import ResponseCache
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    calls = []
+
+    def do_GET(self):
+        type(self).calls.append((self.path, self.headers.get("If-None-Match")))
+        if self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = json.dumps({"articles": [{"title": "x" * 200}], "totalResults": 1}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("ETag", '"v1"')
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_url():
+    _StubHandler.calls = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/v2/everything"
+    server.shutdown()
+
+
+def test_fresh_hit_then_revalidation(stub_url, tmp_path):
+    cache = ResponseCache(str(tmp_path), ttl=60)
+    session = requests.Session()
+
+    first = cache.get(session, stub_url, {"domains": "bbc.co.uk", "apiKey": "secret-1"})
+    second = cache.get(session, stub_url, {"domains": "bbc.co.uk", "apiKey": "secret-2"})
+    assert first.json() == second.json()
+    assert len(_StubHandler.calls) == 1
+
+    cache.ttl = 0
+    third = cache.get(session, stub_url, {"domains": "bbc.co.uk", "apiKey": "secret-1"})
+    assert third.json()["totalResults"] == 1
+    assert _StubHandler.calls[-1][1] == '"v1"'
+
+    stats = cache.stats()
+    assert (stats["misses"], stats["hits"], stats["revalidated"]) == (1, 1, 1)
+    assert stats["hit_ratio"] == pytest.approx(2 / 3)
+
+
+def test_lru_eviction_respects_size_cap(stub_url, tmp_path):
+    cache = ResponseCache(str(tmp_path), ttl=60, max_bytes=400)
+    session = requests.Session()
+    for domain in ("a.com", "b.com", "c.com"):
+        cache.get(session, stub_url, {"domains": domain})
+    assert cache.stats()["evictions"] >= 1
+    assert len(list(tmp_path.glob("*.json"))) < 3
+
+
+def test_metadata_never_contains_the_api_key(stub_url, tmp_path):
+    cache = ResponseCache(str(tmp_path), ttl=60)
+    cache.get(requests.Session(), stub_url, {"domains": "bbc.co.uk", "apiKey": "SUPERSECRET"})
+    cached = cache.get(requests.Session(), stub_url, {"domains": "bbc.co.uk", "apiKey": "SUPERSECRET"})
+    meta = [p.read_text() for p in tmp_path.glob("*.json")]
+    assert meta and not any("SUPERSECRET" in text for text in meta)
+    assert "domains=bbc.co.uk" in cached.url and "apiKey" not in cached.url
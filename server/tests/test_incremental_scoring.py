@@ -0,0 +1,69 @@
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+
+import analyzer
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def sort(self, key, direction):
+        self.docs = sorted(self.docs, key=lambda d: d[key], reverse=direction < 0)
+        return self
+
+    def batch_size(self, size):
+        return self
+
+    def __iter__(self):
+        return iter(self.docs)
+
+
+class FakeCollection:
+    def __init__(self, docs):
+        self.docs = docs
+        self.queries = []
+
+    def find(self, query):
+        self.queries.append(query)
+        lower = query.get("_id", {}).get("$gt")
+        docs = [
+            d for d in self.docs
+            if d.get("duplicate_of") is None and (lower is None or d["_id"] > lower)
+        ]
+        return FakeCursor(docs)
+
+
+def _docs(n, start):
+    return [
+        {"_id": ObjectId.from_datetime(start + timedelta(minutes=i)), "lems": f"good news {i}"}
+        for i in range(n)
+    ]
+
+
+def test_batches_only_cover_documents_after_the_watermark():
+    start = datetime(2024, 5, 1)
+    docs = _docs(7, start)
+    docs.append({"_id": ObjectId.from_datetime(start + timedelta(hours=1)), "lems": "x", "duplicate_of": "u"})
+    collection = FakeCollection(docs)
+
+    batches = list(analyzer.iter_unscored_batches(collection, since_id=docs[1]["_id"], batch_size=2))
+    assert [len(b) for b in batches] == [2, 2, 1]
+    assert batches[0][0]["_id"] == docs[2]["_id"]
+    assert collection.queries[0]["duplicate_of"] is None
+
+
+def test_lookback_rereads_a_window_below_the_watermark():
+    docs = _docs(5, datetime(2024, 5, 1))
+    collection = FakeCollection(docs)
+    batches = list(analyzer.iter_unscored_batches(collection, since_id=docs[3]["_id"], lookback_seconds=90))
+    assert [d["_id"] for d in batches[0]] == [d["_id"] for d in docs[2:]]
+
+
+def test_polarity_rows_carry_the_article_id():
+    import pandas as pd
+
+    docs = _docs(3, datetime(2024, 5, 1))
+    polarity = analyzer.calculate_polarity(pd.DataFrame(docs))
+    assert polarity["article_id"].tolist() == [d["_id"] for d in docs]
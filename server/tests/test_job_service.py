@@ -0,0 +1,71 @@
+import time
+
+from app.services import db
+from app.services.job_service import JobManager
+
+
+def _wait(manager, job_id, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = manager.get(job_id)
+        if job.finished:
+            return job
+        time.sleep(0.01)
+    raise AssertionError("job did not finish")
+
+
+def test_job_reports_progress_and_result():
+    manager = JobManager(max_workers=1)
+
+    def body():
+        for start in range(0, 5, 2):
+            yield [{"n": n} for n in range(start, min(start + 2, 5))]
+        return {"count": 5}
+
+    job = manager.submit("test", 5, body)
+    job = _wait(manager, job.id)
+    view = job.snapshot(offset=3)
+    assert view["status"] == "done"
+    assert view["processed"] == 5 and view["progress"] == 1.0
+    assert view["items"] == [{"n": 3}, {"n": 4}]
+    assert view["result"] == {"count": 5}
+
+
+def test_failed_job_keeps_partial_results():
+    manager = JobManager(max_workers=1)
+
+    def body():
+        yield [{"n": 0}]
+        raise RuntimeError("boom")
+
+    job = _wait(manager, manager.submit("test", 2, body).id)
+    assert job.status == "failed" and job.error == "boom"
+    assert job.items == [{"n": 0}]
+
+
+def test_finished_jobs_expire_after_ttl():
+    manager = JobManager(max_workers=1, ttl=60)
+    job = _wait(manager, manager.submit("test", 0, lambda: iter(())).id)
+    job.finished_at -= 61
+    assert manager.get(job.id) is None
+
+
+def test_shared_state_is_served_by_other_processes(sqlite_settings):
+    runner = JobManager(max_workers=1, ttl=60, collection="Jobs")
+    other = JobManager(ttl=60, collection="Jobs")
+
+    def body():
+        yield [{"n": 0}, {"n": 1}]
+        yield [{"n": 2}]
+        return {"count": 3}
+
+    job = _wait(runner, runner.submit("test", 3, body).id)
+    view = other.view(job.id, offset=1, limit=1)
+    assert (view["status"], view["processed"], view["result"]) == ("done", 3, {"count": 3})
+    assert view["offset"] == 1 and view["items"] == [{"n": 1}]
+    assert other.view(job.id)["items"] == job.snapshot()["items"]
+    assert other.view("missing") is None
+
+    db.get_collection("Jobs").update_one({"_id": job.id}, {"$set": {"finished_at": time.time() - 61}})
+    assert other.view(job.id) is None
+    assert db.get_collection("JobsItems").count_documents({"job_id": job.id}) == 0
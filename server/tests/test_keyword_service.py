@@ -0,0 +1,131 @@
+import pandas as pd
+import pytest
+
+from app.routes import analyze_routes
+from app.schemas.models import Article
+from app.services import fingerprint_service, keyword_service, payload_cache
+from app.services.analyzer_service import VaderAnalyzer
+from app.services.fingerprint_service import fingerprint, get_fingerprint_index
+from app.services.keyword_service import KeywordIndex, frame_documents, record_keywords, text_terms
+
+
+def _frame():
+    return pd.DataFrame({
+        "lems": [
+            "market rally stock investor",
+            "market election vote",
+            "market rally bank",
+            "market rally bank",
+            "football match goal",
+        ],
+        "pub_date": ["2024-05-01", "2024-05-01", "2024-05-02", "2024-05-02", "2024-05-02"],
+        "source": ["Reuters", "BBC News", "Reuters", "CNN", "BBC News"],
+        "duplicate_of": [None, None, None, "https://example.com/3", None],
+    })
+
+
+def test_common_terms_rank_below_distinctive_ones():
+    index = KeywordIndex()
+    assert index.add_frame(_frame()) == 4
+    scores = dict(index.top_keywords(top_k=20))
+    assert index.idf("market") < index.idf("election")
+    assert scores["rally"] > scores["election"]
+
+
+def test_scopes_by_day_and_source():
+    index = KeywordIndex()
+    index.add_frame(_frame())
+    day_terms = {t for t, _ in index.top_keywords(day="2024-05-02")}
+    assert day_terms == {"market", "rally", "bank", "football", "match", "goal"}
+    bbc_terms = {t for t, _ in index.top_keywords(sources=["BBC News"])}
+    assert "election" in bbc_terms and "rally" not in bbc_terms
+    assert index.top_keywords(top_k=1, start="2024-05-01", end="2024-05-01", sources=["Reuters"])[0][0] in {
+        "rally", "stock", "investor",
+    }
+
+
+@pytest.fixture
+def shared(sqlite_settings, monkeypatch):
+    """Shared keyword counts in SQLite, with no index loaded in this process yet."""
+    monkeypatch.setattr(keyword_service, "_indexes_ready", False)
+    monkeypatch.setattr(keyword_service, "_index", None)
+    monkeypatch.setattr(payload_cache, "_versions", {})
+    return sqlite_settings
+
+
+def test_incremental_updates_match_single_build():
+    frame = _frame()
+    whole = KeywordIndex()
+    whole.add_frame(frame)
+    parts = KeywordIndex()
+    parts.add_frame(frame.iloc[:2])
+    parts.add_frame(frame.iloc[2:])
+    assert parts.top_keywords(top_k=10) == whole.top_keywords(top_k=10)
+
+
+def test_rank_texts_drops_stopwords():
+    assert "the" not in text_terms("The markets and the banks said")
+    index = KeywordIndex()
+    terms = [t for t, _ in index.rank_texts(["The market and the bank", "the market rally"], top_k=3)]
+    assert terms[0] == "market"
+    assert "the" not in terms and "and" not in terms
+
+
+def test_keyword_series_buckets_and_downsamples_periods():
+    index = KeywordIndex()
+    index.add_frame(_frame())
+    index.add(["budget", "vote"], "2024-05-13", "BBC News")
+    index.add(["budget"], None, "BBC News")
+    days = index.keyword_series(top_k=2)
+    assert [period for period, _ in days] == ["2024-05-01", "2024-05-02", "2024-05-13"]
+    weeks = index.keyword_series(top_k=3, granularity="week")
+    assert [period for period, _ in weeks] == ["2024-04-29", "2024-05-13"]
+    assert {t for t, _ in weeks[1][1]} == {"budget", "vote"}
+    merged = index.keyword_series(top_k=50, max_points=2)
+    assert [period for period, _ in merged] == ["2024-05-01", "2024-05-13"]
+    assert {t for t, _ in merged[0][1]} == {t for t, _ in index.top_keywords(top_k=50, end="2024-05-02")}
+
+
+def test_cells_are_bounded():
+    index = KeywordIndex(capacity=3)
+    index.add(["market"] * 5 + ["a", "b", "c", "d"], "2024-05-01", "Reuters")
+    assert len(index.cells[("2024-05-01", "Reuters")]) == 3
+    assert index.top_keywords(top_k=1)[0][0] == "market"
+
+    index.replace_cell(("2024-05-02", "Reuters"), {"rally": 1, "market": 4, "bank": 2, "vote": 1}, 2)
+    assert index.cells[("2024-05-02", "Reuters")].counts == {"market": 4, "bank": 2, "rally": 1}
+
+
+def test_workers_share_keyword_counts(shared, monkeypatch):
+    frame = _frame()
+    expected = KeywordIndex()
+    expected.add_frame(frame)
+
+    assert record_keywords(frame_documents(frame.iloc[:2])) == 2
+    worker = keyword_service.get_keyword_index()
+    assert worker.documents == 2
+    # Another worker writes; this one picks it up on its next read
+    assert record_keywords(frame_documents(frame.iloc[2:])) == 2
+    assert keyword_service.get_keyword_index() is worker
+    assert worker.top_keywords(top_k=10) == expected.top_keywords(top_k=10)
+
+    monkeypatch.setattr(keyword_service, "_index", None)
+    restarted = keyword_service.get_keyword_index()
+    assert restarted.top_keywords(top_k=10) == expected.top_keywords(top_k=10)
+    assert restarted.keyword_series(top_k=3) == expected.keyword_series(top_k=3)
+
+
+def test_analyzed_articles_are_counted_once(shared, monkeypatch):
+    monkeypatch.setattr(fingerprint_service, "_index", None)
+    articles = [
+        Article(title="Market rally", content="Stocks rally", url="https://example.com/a", source="CNN", pub_date="2024-05-01"),
+        Article(title="Bank vote", content="Lenders vote", url="https://example.com/b", source="CNN", pub_date="2024-05-01"),
+    ]
+    get_fingerprint_index().commit([dict(articles[1].dict(), fingerprint=fingerprint(articles[1].dict()))])
+    results = VaderAnalyzer(cache=None).analyze_texts([f"{a.title} {a.content}" for a in articles])
+
+    analyze_routes._persist_polarity(articles, results)
+    analyze_routes._persist_polarity(articles, results)
+    index = keyword_service.get_keyword_index()
+    assert index.documents == 1
+    assert "rally" in {t for t, _ in index.top_keywords(sources=["CNN"])}
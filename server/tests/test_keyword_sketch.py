@@ -0,0 +1,29 @@
+import pickle
+from collections import Counter
+
+from app.services.keyword_sketch import SpaceSaving
+
+
+def test_memory_is_bounded_and_heavy_hitters_kept():
+    sketch = SpaceSaving(capacity=10)
+    exact: Counter = Counter()
+    for i in range(500):
+        doc = Counter({"market": 3, "rally": 1, f"rare{i}": 1})
+        sketch.update(doc)
+        exact.update(doc)
+    assert len(sketch) == 10
+    assert [term for term, _ in sketch.top(2)] == ["market", "rally"]
+    for term in sketch:
+        # Never under-counts, over-counts by at most total / capacity
+        assert exact[term] <= sketch.counts[term] <= exact[term] + sketch.total / sketch.capacity
+        assert sketch.counts[term] - sketch.errors[term] <= exact[term]
+
+
+def test_exact_below_capacity_and_survives_pickling():
+    sketch = SpaceSaving(capacity=5)
+    sketch.update({"a": 2, "b": 1})
+    sketch.update({"a": 1})
+    loaded = pickle.loads(pickle.dumps(sketch))
+    assert loaded.counts == {"a": 3, "b": 1} and loaded.total == 4
+    loaded.update({f"t{i}": 1 for i in range(6)})
+    assert len(loaded) == 5 and loaded.counts["a"] == 3
@@ -0,0 +1,36 @@
+import pytest
+from nltk.stem import WordNetLemmatizer
+
+from app.services.lemma_table import build_lemma_table, load_lemma_table
+
+
+@pytest.fixture(scope="module")
+def table():
+    return build_lemma_table(memo_size=128)
+
+
+WORDS = [
+    "dogs", "churches", "aardwolves", "abaci", "hardrock", "women", "buses",
+    "boxes", "children", "geese", "mice", "feet", "analyses", "crises",
+    "species", "news", "politics", "takeaways", "elections", "voters",
+    "appeals", "states", "says", "was", "is", "zzzxqs", "unknownwords", "ties",
+]
+
+
+def test_lemma_table_matches_wordnet_lemmatizer(table):
+    reference = WordNetLemmatizer()
+    sample = WORDS + sorted(table.surface)[::97] + sorted(table.lemmas)[::997]
+    for word in sample:
+        assert table.lemmatize(word) == reference.lemmatize(word), word
+
+
+def test_lemma_table_round_trip(table, tmp_path):
+    path = table.save(str(tmp_path / "lemmas.pickle"))
+    loaded = load_lemma_table(path)
+    assert loaded.lemmatize_tokens(WORDS) == table.lemmatize_tokens(WORDS)
+
+
+def test_fallback_is_memoized(table):
+    table.lemmatize("zzzxqs")
+    table.lemmatize("zzzxqs")
+    assert table.memo_info().hits >= 1
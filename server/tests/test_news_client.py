@@ -0,0 +1,95 @@
+import threading
+import time
+
+import pytest
+import requests
+
+from app.services.news_client import NewsFetcher
+
+
+class _Response:
+    def __init__(self, status_code, payload=None):
+        self.status_code = status_code
+        self.ok = status_code < 400
+        self._payload = payload or {}
+
+    def json(self):
+        return self._payload
+
+    def raise_for_status(self):
+        if not self.ok:
+            raise requests.HTTPError(f"HTTP {self.status_code}")
+
+
+class StubSession:
+    """Serves `totalResults` articles per domain, `pageSize` per page."""
+
+    def __init__(self, totals, failing=(), delay=0.0):
+        self.totals = totals
+        self.failing = set(failing)
+        self.delay = delay
+        self.calls = []
+        self.in_flight = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def get(self, url, params=None, timeout=None):
+        with self._lock:
+            self.calls.append(dict(params))
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        try:
+            time.sleep(self.delay)
+            domain, page, size = params["domains"], params["page"], params["pageSize"]
+            if domain in self.failing:
+                return _Response(500)
+            total = self.totals[domain]
+            first = (page - 1) * size
+            articles = [{"title": f"{domain}-{i}"} for i in range(first, min(first + size, total))]
+            return _Response(200, {"articles": articles, "totalResults": total})
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def close(self):
+        pass
+
+
+def _fetcher(session, **kwargs):
+    fetcher = NewsFetcher("https://newsapi.example/v2/everything", "key", **kwargs)
+    fetcher._session = session
+    return fetcher
+
+
+def test_pagination_stops_at_total_results_and_max_pages():
+    session = StubSession({"a.com": 25, "b.com": 500})
+    fetcher = _fetcher(session, page_size=10, max_pages=3)
+    assert len(fetcher.fetch_domain("a.com", "2024-05-01")) == 25
+    assert [c["page"] for c in session.calls] == [1, 2, 3]
+
+    session.calls.clear()
+    session.totals["a.com"] = 20
+    assert len(fetcher.fetch_domain("a.com", "2024-05-01")) == 20
+    assert [c["page"] for c in session.calls] == [1, 2]
+
+    assert len(fetcher.fetch_domain("b.com", "2024-05-01")) == 30
+
+
+def test_domains_are_fetched_concurrently_up_to_max_workers():
+    domains = [f"d{i}.com" for i in range(6)]
+    session = StubSession({d: 5 for d in domains}, delay=0.05)
+    fetcher = _fetcher(session, max_workers=3)
+    results = dict(fetcher.iter_domains(domains, "2024-05-01"))
+    assert sorted(results) == domains
+    assert all(len(items) == 5 for items in results.values())
+    assert 1 < session.peak <= 3
+
+
+def test_failing_domain_is_isolated_only_when_asked():
+    session = StubSession({"a.com": 3, "c.com": 2}, failing={"b.com"})
+    fetcher = _fetcher(session)
+    results = dict(fetcher.iter_domains(["a.com", "b.com", "c.com"], "2024-05-01", skip_failed=True))
+    assert (len(results["a.com"]), results["b.com"], len(results["c.com"])) == (3, [], 2)
+
+    with pytest.raises(requests.HTTPError):
+        dict(fetcher.iter_domains(["a.com", "b.com"], "2024-05-01"))
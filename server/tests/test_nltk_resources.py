@@ -0,0 +1,17 @@
+import nltk
+import pytest
+
+from app.services import nltk_resources
+from app.services.nltk_resources import ResourceMissingError, find, get_stopwords
+
+
+def test_missing_resource_fails_fast_offline(monkeypatch, tmp_path):
+    monkeypatch.setattr(nltk.data, "path", [str(tmp_path)])
+    monkeypatch.setitem(nltk_resources.RESOURCES, "stopwords", "corpora/not-installed")
+    with pytest.raises(ResourceMissingError, match="nltk.downloader"):
+        find("stopwords")
+
+
+def test_stopwords_include_project_words():
+    words = get_stopwords()
+    assert {"the", "washington", "char"} <= words
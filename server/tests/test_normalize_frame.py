@@ -0,0 +1,26 @@
+import pandas as pd
+
+from app.core.config import get_settings
+from app.services.extractor_service import _normalize_frame
+
+
+def _frame(n):
+    return pd.DataFrame({
+        "title": [f"Markets rally {i} as investors cheer the earnings" for i in range(n)],
+        "content": [f"What's next? Analysts can't agree on rates (AP) #{i} women children" for i in range(n)],
+        "source": [{"id": None, "name": "Reuters"}] * n,
+        "pub_date": ["2024-10-20T10:00:00Z"] * n,
+    })
+
+
+def test_parallel_normalize_matches_in_process(monkeypatch):
+    settings = get_settings()
+    expected = _normalize_frame(_frame(40))
+
+    monkeypatch.setattr(settings, "normalize_parallel_min_rows", 10)
+    monkeypatch.setattr(settings, "normalize_chunk_size", 7)
+    monkeypatch.setattr(settings, "normalize_workers", 2)
+    result = _normalize_frame(_frame(40))
+
+    pd.testing.assert_frame_equal(result, expected)
+    assert result["lems"].iloc[0].startswith("market rally")
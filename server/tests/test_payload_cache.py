@@ -0,0 +1,113 @@
+import threading
+import time
+
+import pytest
+
+from app import create_app
+from app.routes import analyze_routes, visualize_routes
+from app.schemas.models import Article
+from app.services import keyword_service
+from app.services import payload_cache as pc
+from app.services import rollup_service as rs
+from app.services import visualizer_service as vs
+
+
+def test_concurrent_misses_compute_once():
+    cache = pc.PayloadCache()
+    calls = []
+    release = threading.Event()
+
+    def compute():
+        calls.append(1)
+        release.wait(5)
+        return b'{"x": 1}'
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_compute("k", 1, compute))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    time.sleep(0.1)
+    release.set()
+    for t in threads:
+        t.join(5)
+    assert len(calls) == 1
+    assert len({r.etag for r in results}) == 1 and len(results) == 8
+    assert cache.stats()["coalesced"] == 7
+
+
+def test_versions_invalidate_and_errors_are_not_cached():
+    cache = pc.PayloadCache(max_entries=1)
+    first = cache.get_or_compute("k", 1, lambda: b"a")
+    assert cache.get_or_compute("k", 1, lambda: b"b") is first
+    assert cache.get_or_compute("k", 2, lambda: b"b").body == b"b"
+
+    def boom():
+        raise RuntimeError("down")
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_compute("other", 1, boom)
+    assert cache.get_or_compute("other", 1, lambda: b"ok").body == b"ok"
+    # max_entries=1 evicted "k"
+    assert cache.get_or_compute("k", 2, lambda: b"c").body == b"c"
+
+
+def test_data_version_is_shared_and_bumped(sqlite_settings):
+    assert pc.get_data_version("PolarityData") == 0
+    pc.bump_data_version("PolarityData")
+    pc.bump_data_version("PolarityData")
+    assert pc.get_data_version("PolarityData") == 2
+
+
+def test_visualization_version_only_reads_shared_counters(sqlite_settings, monkeypatch):
+    monkeypatch.setattr(pc, "_versions", {})
+    monkeypatch.setattr(keyword_service, "_indexes_ready", False)
+    monkeypatch.setattr(vs, "get_keyword_index", None)  # per-process state must not matter
+    before = vs.visualization_version()
+    keyword_service.record_keywords([(["market", "rally"], "2024-05-01", "BBC")])
+    assert vs.visualization_version() == (before[0], before[1] + 1)
+
+
+@pytest.fixture
+def client(sqlite_settings, monkeypatch):
+    monkeypatch.setattr(sqlite_settings, "visualize_source", "rollup")
+    monkeypatch.setattr(rs, "_indexes_ready", False)
+    monkeypatch.setattr(vs, "_indexes_ready", False)
+    monkeypatch.setattr(pc, "_cache", None)
+    monkeypatch.setattr(pc, "_versions", {})
+    return create_app().test_client()
+
+
+def test_visualize_etags_and_write_invalidation(client, monkeypatch):
+    row = {"url": "a", "pub_date": "2024-05-01", "source": "BBC", "compound": 0.5, "label": 1}
+    rs.write_polarity([row], key="url")
+    first = client.get("/visualize?source=BBC")
+    assert first.status_code == 200 and first.json["summary"]["count"] == 1
+    etag = first.headers["ETag"]
+    assert not etag.startswith("W/")
+
+    calls = []
+    payload = visualize_routes.get_visualization_payload
+    monkeypatch.setattr(visualize_routes, "get_visualization_payload", lambda **kw: calls.append(kw) or payload(**kw))
+    again = client.get("/visualize?source=BBC", headers={"If-None-Match": etag})
+    assert again.status_code == 304 and again.data == b"" and calls == []
+
+    rs.write_polarity([dict(row, url="b")], key="url")
+    changed = client.get("/visualize?source=BBC", headers={"If-None-Match": etag})
+    assert changed.status_code == 200 and changed.headers["ETag"] != etag
+    assert changed.json["summary"]["count"] == 2 and len(calls) == 1
+
+
+def test_analyze_bumps_the_version_after_the_store_write(sqlite_settings, monkeypatch):
+    monkeypatch.setattr(pc, "_versions", {})
+    monkeypatch.setattr(analyze_routes, "_unseen_records", lambda articles, records: [])
+    seen = []
+
+    class Store:
+        def write(self, dataset, df):
+            seen.append(pc.get_data_version("PolarityData"))
+
+    monkeypatch.setattr(analyze_routes, "get_article_store", Store)
+    article = Article(title="Market rally", content="Stocks rally", url="https://example.com/a", source="CNN", pub_date="2024-05-01")
+    analyze_routes._persist_polarity([article], [{"text": "Market rally", "scores": {"compound": 0.5}, "label": 1}])
+    # A payload cached from the store while it lacked the rows is keyed on an older version
+    assert seen and pc.get_data_version("PolarityData") > seen[0]
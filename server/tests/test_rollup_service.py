@@ -0,0 +1,111 @@
+from datetime import datetime, timedelta
+
+import pytest
+from bson import ObjectId
+
+import analyzer
+from app.services import db, rollup_service as rs
+from app.services import visualizer_service as vs
+
+
+@pytest.fixture
+def store(sqlite_settings, monkeypatch):
+    monkeypatch.setattr(rs, "_indexes_ready", False)
+    monkeypatch.setattr(vs, "_indexes_ready", False)
+    return sqlite_settings
+
+
+def _cells():
+    return sorted(
+        (d["date"] or "", d["source"] or "", round(d["compound_sum"], 6), d["count"], d["pos"], d["neg"], d["neu"])
+        for d in db.get_collection(rs.ROLLUP_COLLECTION).find({}, {"_id": 0})
+        if d["count"]
+    )
+
+
+def _row(url, day, compound, label, source="BBC"):
+    return {"url": url, "pub_date": day, "source": source, "compound": compound, "label": label}
+
+
+def test_writes_keep_rollups_equal_to_a_rebuild(store):
+    rs.write_polarity([
+        _row("a", "2024-05-01T09:00:00Z", 0.5, 1),
+        _row("b", datetime(2024, 5, 1, 18), -0.5, -1),
+        _row("c", "2024-05-02", 0.1, 0, source="CNN"),
+        _row(None, None, 0.3, 1),
+    ], key="url")
+    # Rescoring moves a row to another day and label; a repeated key counts once
+    rs.write_polarity([
+        _row("b", "2024-05-02", 0.6, 1, source="CNN"),
+        _row("a", "2024-05-01T09:00:00Z", 0.4, 1),
+        _row("a", "2024-05-01T09:00:00Z", 0.5, 1),
+    ], key="url")
+    incremental = _cells()
+    assert incremental == [
+        ("", "BBC", 0.3, 1, 1, 0, 0),
+        ("2024-05-01", "BBC", 0.5, 1, 1, 0, 0),
+        ("2024-05-02", "CNN", 0.7, 2, 1, 0, 1),
+    ]
+    assert rs.rebuild_rollups(batch_size=2) == 3
+    assert _cells() == incremental
+
+
+def test_rebuild_drops_stale_cells(store):
+    rs.apply_polarity_delta([_row("x", "2020-01-01", 0.2, 1)])
+    db.get_collection("PolarityData").insert_one(_row("y", "2024-05-01", 0.2, 1))
+    rs.rebuild_rollups()
+    assert [c[:2] for c in _cells()] == [("2024-05-01", "BBC")]
+
+
+def test_visualize_reads_rollups_like_the_pandas_path(store, monkeypatch):
+    rows = [
+        _row(f"u{i}", datetime(2024, 5, 1) + timedelta(hours=7 * i), (i % 5 - 2) / 4, (i % 3) - 1, "BBC" if i % 2 else "CNN")
+        for i in range(30)
+    ]
+    rs.write_polarity(rows, key="url")
+    rs.rebuild_rollups()
+    for scope in ({}, {"source": "BBC"}, {"start": "2024-05-03", "end": "2024-05-06"}):
+        monkeypatch.setattr(store, "visualize_source", "rollup")
+        from_rollups = vs.get_visualization_payload(**scope)
+        monkeypatch.setattr(store, "visualize_source", "pandas")
+        from_rows = vs.get_visualization_payload(**scope)
+        assert from_rollups["summary"] == pytest.approx(from_rows["summary"])
+        assert [t["date"] for t in from_rollups["trends"]] == [t["date"] for t in from_rows["trends"]]
+        assert [t["avg_compound"] for t in from_rollups["trends"]] == pytest.approx(
+            [t["avg_compound"] for t in from_rows["trends"]]
+        )
+
+
+def test_visualize_without_rollups_uses_polarity_rows(store, monkeypatch):
+    monkeypatch.setattr(store, "visualize_source", "rollup")
+    db.get_collection("PolarityData").insert_one(_row("y", "2024-05-01", 0.2, 1))
+    assert vs.get_visualization_payload()["summary"]["count"] == 1
+
+
+def test_rollups_are_read_only_once_built(store, monkeypatch):
+    monkeypatch.setattr(store, "visualize_source", "rollup")
+    # History from before the upgrade, then a first write that creates cells
+    db.get_collection("PolarityData").insert_many([_row(f"old{i}", "2024-05-01", 0.2, 1) for i in range(3)])
+    rs.write_polarity([_row("new", "2024-05-02", 0.4, 1)], key="url")
+    assert not rs.rollups_available()
+    assert vs.get_visualization_payload()["summary"]["count"] == 4
+
+    rs.rebuild_rollups()
+    assert rs.rollups_available()
+    monkeypatch.setattr(vs, "_aggregate", None)  # any fallback would fail
+    assert vs.get_visualization_payload()["summary"]["count"] == 4
+
+
+def test_incremental_scoring_maintains_rollups(store):
+    start = datetime(2024, 5, 1)
+    db.get_collection("DailyNews").insert_many([
+        {"_id": ObjectId.from_datetime(start + timedelta(minutes=i)), "lems": "good news", "pub_date": start, "source": "BBC"}
+        for i in range(4)
+    ])
+    database = db.get_database()
+    analyzer.score_incrementally(database)
+    analyzer.score_incrementally(database, full=True)
+    incremental = _cells()
+    assert [c[3] for c in incremental] == [4]
+    rs.rebuild_rollups()
+    assert _cells() == incremental
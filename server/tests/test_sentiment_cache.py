@@ -0,0 +1,48 @@
+from app.services.analyzer_service import VaderAnalyzer
+from app.services.sentiment_cache import SentimentCache
+
+SCORES = {"neg": 0.0, "neu": 0.5, "pos": 0.5, "compound": 0.6}
+
+
+def test_memory_tier_is_bounded_lru():
+    cache = SentimentCache("vader:test", memory_size=2)
+    a, b, c = (cache.key(t) for t in ("a", "b", "c"))
+    cache.put_many({a: SCORES, b: SCORES})
+    assert set(cache.get_many([a])) == {a}
+    cache.put_many({c: SCORES})
+    assert set(cache.get_many([a, b, c])) == {a, c}
+    stats = cache.stats()
+    assert stats["memory_hits"] == 3 and stats["misses"] == 1
+    assert stats["hit_ratio"] == 0.75
+
+
+def test_keys_depend_on_namespace():
+    assert SentimentCache("vader:1").key("text") != SentimentCache("vader:2").key("text")
+
+
+def test_persistent_tier_is_shared(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    first = SentimentCache("vader:test", path=path)
+    key = first.key("shared headline")
+    first.put_many({key: SCORES})
+
+    second = SentimentCache("vader:test", path=path)
+    assert second.get_many([key]) == {key: SCORES}
+    assert second.stats()["persistent_hits"] == 1
+
+
+def test_analyzer_skips_scoring_on_hits():
+    analyzer = VaderAnalyzer(cache=SentimentCache("vader:test", memory_size=16))
+    scored = []
+    score_texts = analyzer._scorer.score_texts
+
+    def counting(texts):
+        scored.extend(texts)
+        return score_texts(texts)
+
+    analyzer._scorer = type("Spy", (), {"score_texts": staticmethod(counting)})()
+    first = analyzer.analyze_texts(["Great news", "Awful news", "Great news"])
+    second = analyzer.analyze_texts(["Great news", "Awful news"])
+    assert scored == ["Great news", "Awful news"]
+    assert [r["scores"] for r in second] == [r["scores"] for r in first[:2]]
+    assert analyzer.cache_stats()["hit_ratio"] > 0
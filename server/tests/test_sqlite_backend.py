@@ -0,0 +1,150 @@
+import sqlite3
+import threading
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+from bson import ObjectId
+from pymongo import InsertOne, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+import analyzer
+from app.services import db
+from app.services import visualizer_service as vs
+from app.services.sqlite_backend import SQLiteDatabase
+
+
+@pytest.fixture
+def database(tmp_path):
+    database = SQLiteDatabase(str(tmp_path / "news.sqlite3"))
+    yield database
+    database.close()
+
+
+def test_documents_round_trip_with_types(database):
+    coll = database["DailyNews"]
+    doc = {
+        "title": "a",
+        "pub_date": datetime(2024, 5, 1),
+        "source": {"name": "BBC News"},
+        "score": np.float64(0.5),
+        "missing": float("nan"),
+        "tags": [ObjectId(), date(2024, 5, 2)],
+    }
+    coll.insert_one(doc)
+    stored = coll.find_one({"title": "a"})
+    assert stored["_id"] == doc["_id"]
+    assert stored["pub_date"] == datetime(2024, 5, 1)
+    assert stored["tags"] == [doc["tags"][0], datetime(2024, 5, 2)]
+    assert stored["source"] == {"name": "BBC News"}
+    assert stored["score"] == 0.5 and stored["missing"] is None
+
+
+def test_filters_sort_limit_and_projection(database):
+    coll = database["PolarityData"]
+    coll.insert_many([
+        {"source": "BBC", "pub_date": datetime(2024, 5, 1, 9), "label": 1},
+        {"source": "BBC", "pub_date": "2024-05-02T08:00:00Z", "label": 0},
+        {"source": "CNN", "pub_date": datetime(2024, 5, 3), "label": -1, "duplicate_of": "x"},
+    ])
+    assert coll.count_documents(vs._match("BBC", "2024-05-01", "2024-05-02")) == 2
+    assert coll.count_documents({"duplicate_of": None}) == 2
+    assert coll.count_documents({"label": {"$in": [1, -1]}}) == 2
+    assert coll.count_documents({"duplicate_of": {"$exists": True}}) == 1
+    rows = list(coll.find({}, {"label": 1, "_id": 0}).sort("label", -1).limit(2))
+    assert rows == [{"label": 1}, {"label": 0}]
+    assert sorted(coll.distinct("source")) == ["BBC", "CNN"]
+
+
+def test_unique_index_and_unordered_writes(database):
+    coll = database["Fingerprints"]
+    coll.create_index([("fingerprint", 1)], unique=True)
+    coll.insert_one({"fingerprint": "a"})
+    with pytest.raises(DuplicateKeyError):
+        coll.insert_one({"fingerprint": "a"})
+    with pytest.raises(BulkWriteError) as caught:
+        coll.insert_many([{"fingerprint": "a"}, {"fingerprint": "b"}], ordered=False)
+    assert caught.value.details["nInserted"] == 1
+    assert [e["code"] for e in caught.value.details["writeErrors"]] == [11000]
+
+
+def test_upserts_and_increments(database):
+    coll = database["Rollups"]
+    ops = [UpdateOne({"day": "2024-05-01"}, {"$inc": {"count": 1, "sum": 0.5}}, upsert=True) for _ in range(3)]
+    result = coll.bulk_write(ops + [InsertOne({"day": "2024-05-02", "count": 1})], ordered=False)
+    assert (result.upserted_count, result.modified_count, result.inserted_count) == (1, 2, 1)
+    assert coll.find_one({"day": "2024-05-01"}, {"_id": 0}) == {"day": "2024-05-01", "count": 3, "sum": 1.5}
+    coll.update_one({"_id": "wm"}, {"$set": {"last_id": ObjectId("0" * 24)}}, upsert=True)
+    assert coll.find_one({"_id": "wm"})["last_id"] == ObjectId("0" * 24)
+
+
+def test_partial_unique_index_serves_equality_lookups(database):
+    coll = database["PolarityData"]
+    coll.create_index([("url", 1)], unique=True, partialFilterExpression={"url": {"$type": "string"}})
+    plan = database._connection().execute(
+        "EXPLAIN QUERY PLAN SELECT id FROM \"c_PolarityData\" WHERE json_extract(doc, '$.url') = ?", ("u",)
+    ).fetchall()
+    assert any("USING INDEX" in row[-1] for row in plan)
+
+
+def test_db_helpers_run_on_sqlite(sqlite_settings):
+    assert db.storage_stats()["backend"] == "sqlite"
+    db.ping_database()
+    records = [{"url": f"u{i}", "compound": 0.1 * i} for i in range(3)]
+    assert db.bulk_upsert("PolarityData", records, key="url").inserted == 3
+    again = db.bulk_upsert("PolarityData", records, key="url")
+    assert (again.inserted, again.skipped) == (0, 3)
+    assert db.find_values("PolarityData", "url", ["u0", "zz"]) == {"u0"}
+    assert len(db.fetch_collection("PolarityData")) == 3
+
+
+def test_visualize_falls_back_to_pandas_on_sqlite(sqlite_settings, monkeypatch):
+    monkeypatch.setattr(sqlite_settings, "visualize_source", "mongo")
+    monkeypatch.setattr(vs, "_indexes_ready", False)
+    db.get_collection("PolarityData").insert_many([
+        {"source": "BBC", "pub_date": datetime(2024, 5, 1, 9), "compound": 0.5, "label": 1},
+        {"source": "BBC", "pub_date": "2024-05-02T08:00:00Z", "compound": 0.1, "label": 0},
+    ])
+    payload = vs.get_visualization_payload(source="BBC")
+    assert [t["date"] for t in payload["trends"]] == ["2024-05-01", "2024-05-02"]
+    assert payload["summary"]["count"] == 2
+
+
+def test_incremental_scoring_on_sqlite(sqlite_settings):
+    start = datetime(2024, 5, 1)
+    db.get_collection("DailyNews").insert_many([
+        {"_id": ObjectId.from_datetime(start + timedelta(minutes=i)), "lems": "good news", "title": str(i)}
+        for i in range(5)
+    ])
+    database = db.get_database()
+    assert analyzer.score_incrementally(database) == 5
+    assert analyzer.score_incrementally(database) == 0
+    frame = pd.DataFrame(database["PolarityData"].find({}, {"_id": 0}))
+    assert len(frame) == 5 and (frame["label"] == 1).all()
+
+
+def test_close_closes_every_threads_connection(database):
+    connections = []
+
+    def use():
+        database["PolarityData"].count_documents({})
+        connections.append(database._local.conn)
+
+    worker = threading.Thread(target=use)
+    worker.start()
+    worker.join()
+    use()
+    database.close()
+    for conn in connections:
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+    # Threads reconnect transparently afterwards
+    assert database["PolarityData"].count_documents({}) == 0
+
+
+def test_backends_come_from_the_registry(sqlite_settings):
+    assert db.STORAGE_BACKENDS["sqlite"] is db.SQLiteBackend
+    assert isinstance(db.get_storage_backend(), db.SQLiteBackend)
+    with pytest.raises(TypeError):
+        db.StorageBackend()
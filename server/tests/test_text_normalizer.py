@@ -0,0 +1,63 @@
+import random
+import re
+
+import pytest
+
+from app.services.text_normalizer import normalize_text, normalize_texts
+
+
+def _legacy_clean_text(text):
+    """Original regex chain, kept verbatim as the parity reference."""
+    text = text.lower()
+    text = re.sub(r"what's", "what is ", text)
+    text = text.replace('(ap)', '')
+    text = re.sub(r"\'s", " is ", text)
+    text = re.sub(r"\'ve", " have ", text)
+    text = re.sub(r"can't", "cannot ", text)
+    text = re.sub(r"n't", " not ", text)
+    text = re.sub(r"i'm", "i am ", text)
+    text = re.sub(r"\'re", " are ", text)
+    text = re.sub(r"\'d", " would ", text)
+    text = re.sub(r"\'ll", " will ", text)
+    text = re.sub(r'\W+', ' ', text)
+    text = re.sub(r'\s+', ' ', text)
+    text = re.sub(r"\\", "", text)
+    text = re.sub(r"\'", "", text)
+    text = re.sub(r'\"', '', text)
+    text = re.sub('[^a-zA-Z ?!]+', '', text)
+    text = "".join(i for i in text if ord(i) < 128)
+    return text.strip()
+
+
+CORPUS = [
+    "",
+    "   ",
+    "What's NEW???   I'm happy!!!\n",
+    "WASHINGTON (AP) — The president can't say he wouldn't've known… [+2104 chars]",
+    "They're sure we'd go; you'll see it's Bob's car, isn't it?",
+    "Café owners in São Paulo said 2024 was the year_of the “comeback”.",
+    "wh(ap)at's ca(ap)n't i(ap)'m ((ap)ap) don(ap)'t",
+    "Tabs\tand\r\nnewlines\\ with \"quotes\" and 'single' quotes",
+    "Numbers 1 2 3 between words, a1b2c3 and ² ³ ½ fractions",
+    "Ünïcödé ﬁligature İstanbul ǅ ß ΣΑΣ",
+    "emoji 😀 mixed🔥with text",
+]
+
+
+@pytest.mark.parametrize("text", CORPUS)
+def test_normalizer_matches_legacy_on_corpus(text):
+    assert normalize_text(text) == _legacy_clean_text(text)
+
+
+def test_normalizer_matches_legacy_on_random_text():
+    rng = random.Random(1234)
+    alphabet = list("abcdinmstlvrewhAIT '\"\\!?.,-_0129\t\n()éü—’😀") + [
+        "what's", "can't", "n't", "i'm", "'s", "'ve", "'re", "'d", "'ll", "(ap)", "(AP)",
+    ]
+    for _ in range(3000):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 40)))
+        assert normalize_text(text) == _legacy_clean_text(text), text
+
+
+def test_normalize_texts_batch():
+    assert normalize_texts(CORPUS) == [_legacy_clean_text(t) for t in CORPUS]
@@ -0,0 +1,65 @@
+import random
+
+import pytest
+from nltk.sentiment.vader import SentimentIntensityAnalyzer as SIA
+
+from app.services.nltk_resources import get_vader_lexicon_path
+from app.services.vader_batch import TOLERANCE, get_vader_scorer, tokenize
+
+CASES = [
+    "I love this",
+    "This is terrible",
+    "",
+    "   ",
+    "The food was kind of good but the service was NOT great!!!",
+    "Markets are not bad at all, but investors remain wary??",
+    "never so good",
+    "at least it works",
+    "very least helpful",
+    "yeah right, the bomb",
+    "He is extremely HAPPY about the results :)",
+    "good good good bad",
+    "Stocks rally, shares soar! Analysts say it's great.",
+    "no growth, no jobs, no hope",
+]
+
+
+def _corpus(size=2000, seed=7):
+    sia = SIA(lexicon_file=get_vader_lexicon_path())
+    vocab = list(sia.lexicon)[::7] + [
+        "not", "never", "so", "this", "but", "kind", "of", "least", "at", "very",
+        "extremely", "barely", "the", "shit", "yeah", "right", "isn't", "market",
+    ] * 20
+    rng = random.Random(seed)
+    texts = []
+    for _ in range(size):
+        toks = [rng.choice(vocab) for _ in range(rng.randint(0, 20))]
+        toks = [t.upper() if rng.random() < 0.1 else t for t in toks]
+        toks = [t + rng.choice([",", "!", "?", "!!"]) if rng.random() < 0.1 else t for t in toks]
+        texts.append(" ".join(toks))
+    return sia, texts
+
+
+def test_tokenize_matches_sentitext():
+    from nltk.sentiment.vader import SentiText, VaderConstants
+
+    for text in CASES + ["!wow, such ...punctuation!! ?! a,b 'quoted' :-)"]:
+        expected = SentiText(text, VaderConstants.PUNC_LIST, VaderConstants.REGEX_REMOVE_PUNCTUATION)
+        assert tokenize(text) == expected.words_and_emoticons
+
+
+def test_batch_scores_match_nltk_within_tolerance():
+    sia, texts = _corpus()
+    texts = CASES + texts
+    got = get_vader_scorer().score_texts(texts)
+    assert len(got) == len(texts)
+    for text, scores in zip(texts, got):
+        reference = sia.polarity_scores(text)
+        for key, tol in TOLERANCE.items():
+            assert scores[key] == pytest.approx(reference[key], abs=tol), (text, key)
+
+
+def test_single_text_equals_batch():
+    scorer = get_vader_scorer()
+    assert [scorer.polarity_scores(t) for t in CASES] == scorer.score_texts(CASES)
+    assert scorer.score_texts([]) == []
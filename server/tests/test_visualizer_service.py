@@ -0,0 +1,115 @@
+from datetime import datetime
+
+import pandas as pd
+import pytest
+from werkzeug.datastructures import MultiDict
+
+from app.services import visualizer_service as vs
+from app.services.keyword_service import KeywordIndex
+
+ROWS = [
+    {"pub_date": datetime(2024, 5, 1, 9), "compound": 0.5, "label": 1, "source": "BBC News"},
+    {"pub_date": datetime(2024, 5, 1, 18), "compound": -0.5, "label": -1, "source": "BBC News"},
+    {"pub_date": "2024-05-02T08:00:00Z", "compound": 0.1, "label": 0, "source": "BBC News"},
+]
+
+
+class StandIn:
+    """Collection stand-in without aggregation support."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = []
+
+    def aggregate(self, pipeline):
+        raise NotImplementedError("$facet")
+
+    def find(self, query, projection):
+        self.queries.append((query, projection))
+        return [{k: r[k] for k in projection if k in r} for r in self.rows]
+
+
+def test_match_covers_date_and_string_pub_dates():
+    match = vs._match("BBC News", "2024-05-01", "2024-05-02")
+    assert match["source"] == "BBC News"
+    as_date, as_text = (clause["pub_date"] for clause in match["$or"])
+    assert as_date == {"$gte": datetime(2024, 5, 1), "$lt": datetime(2024, 5, 3)}
+    assert as_text == {"$gte": "2024-05-01", "$lt": "2024-05-03"}
+    assert vs._match(None, None, None) == {}
+
+
+def test_pipeline_groups_by_day_and_counts_labels():
+    pipeline = vs.build_polarity_pipeline(source="CNN")
+    assert pipeline[0] == {"$match": {"source": "CNN"}}
+    assert set(pipeline[1]["$project"]) == {"_id", "compound", "label", "day"}
+    summary = pipeline[2]["$facet"]["summary"][0]["$group"]
+    assert {"count", "avg_compound", "pos", "neg", "neu"} <= set(summary)
+
+
+def test_stand_in_without_aggregation_falls_back_to_pandas(monkeypatch):
+    stand_in = StandIn(ROWS)
+    monkeypatch.setattr(vs, "get_collection", lambda name: stand_in)
+    monkeypatch.setattr(vs, "ensure_visualize_indexes", lambda: None)
+    monkeypatch.setattr(vs, "get_keyword_index", KeywordIndex)
+    monkeypatch.setattr(vs.get_settings(), "visualize_source", "mongo")
+
+    payload = vs.get_visualization_payload(source="BBC News")
+    assert stand_in.queries[0] == ({"source": "BBC News"}, vs._FIELDS)
+    summary = payload["summary"]
+    assert summary["avg_compound"] == pytest.approx(0.1 / 3)
+    assert (summary["count"], summary["pos"], summary["neg"], summary["neu"]) == (3, 1, 1, 1)
+    assert [t["date"] for t in payload["trends"]] == ["2024-05-01", "2024-05-02"]
+
+
+def test_pipeline_splits_cells_by_source_on_request():
+    pipeline = vs.build_polarity_pipeline(source=["BBC News", "CNN"], by_source=True)
+    assert pipeline[0] == {"$match": {"source": {"$in": ["BBC News", "CNN"]}}}
+    assert "source" in pipeline[1]["$project"]
+    assert pipeline[2]["$facet"]["cells"][-1]["$group"]["_id"] == {"day": "$day", "source": "$source"}
+
+
+def test_series_resamples_and_downsamples_with_weighted_means():
+    cells = pd.DataFrame({
+        "date": ["2024-04-29", "2024-05-01", "2024-05-06", "2024-06-03", None],
+        "source": ["a", "b", "a", "a", "a"],
+        "compound_sum": [1.0, 2.0, -1.0, 0.5, 9.0],
+        "count": [1, 3, 1, 1, 9],
+    })
+    weeks, step = vs._series(cells, "week", 10)
+    assert step == 1
+    assert [p["date"] for p in weeks] == ["2024-04-29", "2024-05-06", "2024-06-03"]
+    assert weeks[0] == {"date": "2024-04-29", "avg_compound": pytest.approx(0.75), "count": 4}
+    months, _ = vs._series(cells, "month", 10)
+    assert [(p["date"], p["count"]) for p in months] == [("2024-04-01", 1), ("2024-05-01", 4), ("2024-06-01", 1)]
+    capped, step = vs._series(cells, "day", 2)
+    assert step == 2
+    assert [(p["date"], p["count"]) for p in capped] == [("2024-04-29", 4), ("2024-05-06", 2)]
+    assert capped[0]["avg_compound"] == pytest.approx(0.75)
+
+
+def test_payload_groups_by_source(monkeypatch):
+    rows = ROWS + [{"pub_date": datetime(2024, 5, 2, 9), "compound": 0.3, "label": 1, "source": "CNN"}]
+    keywords = KeywordIndex()
+    keywords.add(["election", "vote"], "2024-05-02", "CNN")
+    keywords.add(["football"], "2024-06-02", "BBC News")
+    monkeypatch.setattr(vs, "get_keyword_index", lambda: keywords)
+    monkeypatch.setattr(vs, "get_collection", lambda name: StandIn(rows))
+    monkeypatch.setattr(vs, "ensure_visualize_indexes", lambda: None)
+    monkeypatch.setattr(vs.get_settings(), "visualize_source", "mongo")
+
+    payload = vs.get_visualization_payload(source=["BBC News", "CNN"], group_by="source", granularity="month")
+    assert [(p["date"], len(p["keywords"])) for p in payload["keyword_trends"]] == [("2024-05-01", 2), ("2024-06-01", 1)]
+    assert payload["granularity"] == "month"
+    assert payload["trends"] == [{"date": "2024-05-01", "avg_compound": pytest.approx(0.4 / 4), "count": 4}]
+    assert sorted(payload["series"]) == ["BBC News", "CNN"]
+    assert payload["series"]["CNN"] == [{"date": "2024-05-01", "avg_compound": pytest.approx(0.3), "count": 1}]
+
+
+def test_visualize_params_validates_query_args():
+    args = MultiDict([("source", "BBC"), ("source", "CNN"), ("from", "2024-05-01"), ("granularity", "Week")])
+    params = vs.visualize_params(args)
+    assert params["source"] == ["BBC", "CNN"]
+    assert (params["start"], params["granularity"], params["group_by"]) == ("2024-05-01", "week", None)
+    for bad in ({"granularity": "hour"}, {"from": "May 1"}, {"group_by": "label"}, {"max_points": "0"}):
+        with pytest.raises(ValueError):
+            vs.visualize_params(MultiDict(bad))
@@ -1,6 +1,12 @@
 from app import create_app
+from app.core.config import get_settings
+from app.services.nltk_resources import prewarm
 
 app = create_app()
 
+# Load NLTK data and the analyzer once in the master so forked workers (gunicorn --preload) share them
+if get_settings().prewarm_resources:
+    prewarm()
+
 if __name__ == "__main__":  # pragma: no cover
     app.run(host="0.0.0.0", port=8000)